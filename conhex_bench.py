@@ -0,0 +1,255 @@
+import argparse
+import copy
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import constants as ct
+from conhex_bitboard import Conhex_bitboard
+from conhex_board import Conhex_game, littlegolem_record
+
+
+ENGINES = {
+    'Conhex_game': Conhex_game,
+    'Conhex_bitboard': Conhex_bitboard,
+}
+
+
+def random_games(count: int, seed: int) -> list:
+    """Plays seeded random games, as in conhex_board.main()
+
+    Args:
+        count (int): number of games
+        seed (int): random seed
+
+    Returns:
+        list: list of the moves of each game
+    """
+    rng = random.Random(seed)
+    games = []
+    for _ in range(count):
+        game = Conhex_bitboard()
+        while not game.game_won() and game.free_positions_view():
+            game.play_move(game.random_free_position(rng))
+        games.append(game.moves)
+    return games
+
+
+def measure(function: callable, operations: int, repeat: int) -> dict:
+    """Times a function that performs a number of operations
+
+    Args:
+        function (callable): function to time, without arguments
+        operations (int): number of operations one call performs
+        repeat (int): number of times to call function
+
+    Returns:
+        dict: minimum and median time per operation in microseconds
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - start) / operations * 1e6)
+    return {'min_us': min(timings),
+            'median_us': statistics.median(timings),
+            'operations': operations,
+            'repeat': repeat}
+
+
+def bench_engine(engine: type, games: list, seed: int, repeat: int,
+                 load_file: str) -> dict:
+    """Benchmarks the core operations of one game engine
+
+    Args:
+        engine (type): Conhex_game or a subclass
+        games (list): move lists of the games to use as input
+        seed (int): random seed for the playouts
+        repeat (int): number of repetitions per benchmark
+        load_file (str): LittleGolem file with the first game of games
+
+    Returns:
+        dict: benchmark name -> timings
+    """
+    move_count = sum(len(moves) for moves in games)
+
+    # Positions halfway the games, for the read-only operations
+    positions = []
+    for moves in games:
+        game = engine()
+        for move in moves[:len(moves) // 2]:
+            game.play_move(move)
+        positions.append(game)
+
+    def play_moves():
+        for moves in games:
+            game = engine()
+            for move in moves:
+                game.play_move(move)
+
+    def undo_moves():
+        for game in played:
+            while game.moves:
+                game.undo_move()
+
+    def game_won():
+        for game in positions:
+            game.game_won()
+
+    def free_positions():
+        for game in positions:
+            game.free_positions()
+
+    def random_free_position():
+        for game in positions:
+            if not game.game_won():
+                game.random_free_position(rng)
+
+    def to_str():
+        for game in positions:
+            str(game)
+
+    def load():
+        engine().load(load_file)
+
+    def deepcopy():
+        for game in positions:
+            copy.deepcopy(game)
+
+    def clone():
+        for game in positions:
+            game.clone()
+
+    def snapshot():
+        for game in positions:
+            game.snapshot()
+
+    snapshots = [game.snapshot() for game in positions]
+    target = engine()
+
+    def restore():
+        for game_snapshot in snapshots:
+            target.restore(game_snapshot)
+
+    rng = random.Random(seed)
+
+    def playouts():
+        for _ in range(len(games)):
+            game = engine()
+            while not game.game_won():
+                game.play_move(game.random_free_position(rng))
+
+    results = {'play_move': measure(play_moves, move_count, repeat)}
+
+    # undo_move needs freshly played games for every repetition
+    timings = []
+    for _ in range(repeat):
+        played = []
+        for moves in games:
+            game = engine()
+            for move in moves:
+                game.play_move(move)
+            played.append(game)
+        timings.append(measure(undo_moves, move_count, 1)['min_us'])
+    results['undo_move'] = {'min_us': min(timings),
+                            'median_us': statistics.median(timings),
+                            'operations': move_count,
+                            'repeat': repeat}
+
+    results['game_won'] = measure(game_won, len(positions), repeat)
+    results['free_positions'] = measure(free_positions, len(positions),
+                                        repeat)
+    results['random_free_position'] = measure(random_free_position,
+                                              len(positions), repeat)
+    results['__str__'] = measure(to_str, len(positions), repeat)
+    results['load'] = measure(load, 1, repeat)
+    results['deepcopy'] = measure(deepcopy, len(positions), repeat)
+    results['clone'] = measure(clone, len(positions), repeat)
+    results['snapshot'] = measure(snapshot, len(positions), repeat)
+    results['restore'] = measure(restore, len(positions), repeat)
+    results['random_playout'] = measure(playouts, len(games), repeat)
+    return results
+
+
+def git_revision() -> str:
+    """Gives the git commit of the source tree; None if it's unknown"""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(games: int = 50, seed: int = 0, repeat: int = 5,
+                   engines: list = None) -> dict:
+    """Runs the benchmarks for the given engines
+
+    Args:
+        games (int): number of seeded random games used as input
+        seed (int): random seed
+        repeat (int): number of repetitions per benchmark
+        engines (list): names (keys of ENGINES) of the engines to measure;
+                        None for all engines
+
+    Returns:
+        dict: machine-readable results, including the run's metadata
+    """
+    inputs = random_games(games, seed)
+    with tempfile.NamedTemporaryFile('w', suffix='.txt',
+                                     delete=False) as file:
+        file.write(littlegolem_record(tuple(ct.DEFAULT_PLAYER_NAMES.values()),
+                                      inputs[0]))
+    try:
+        results = {name: bench_engine(ENGINES[name], inputs, seed, repeat,
+                                      file.name)
+                   for name in (engines or ENGINES)}
+    finally:
+        os.remove(file.name)
+
+    return {
+        'revision': git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'games': games,
+        'seed': seed,
+        'repeat': repeat,
+        'results': results,
+    }
+
+
+def main():
+    """Benchmarks the core game operations and writes the results as JSON
+    """
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('--output', help='JSON file to write '
+                                         '(default: standard output)')
+    parser.add_argument('--games', type=int, default=50,
+                        help='number of seeded random games used as input')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--engine', action='append', choices=ENGINES,
+                        help='engine to measure (default: all)')
+    args = parser.parse_args()
+
+    report = run_benchmarks(args.games, args.seed, args.repeat, args.engine)
+    for engine, results in report['results'].items():
+        for name, timing in results.items():
+            print(f'{engine:16s} {name:16s} {timing["min_us"]:12.2f} us',
+                  file=sys.stderr)
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,338 @@
+import constants as ct
+import conhex_geometry
+import conhex_hash
+from conhex_board import (Conhex_game, Game_snapshot, bytes_to_moves,
+                          moves_to_bytes)
+
+
+#
+# Bit masks, generated from ct.CELLS and ct.POSITIONS into conhex_geometry
+#
+CELL_LIST = list(ct.CELLS)
+
+# Bit of every position and of every cell
+POSITION_BITS = {pos: 1 << idx for idx, pos in enumerate(ct.POSITIONS)}
+CELL_BITS = {cell: 1 << idx for idx, cell in enumerate(CELL_LIST)}
+
+# Mask of the positions of each cell, indexed like CELL_LIST
+CELL_MASKS = conhex_geometry.CELL_MASKS
+
+# Number of positions needed to conquer a cell, indexed like CELL_LIST
+CELL_QUOTA = conhex_geometry.CELL_QUOTA
+
+# Indices (into CELL_LIST) of the cells each position is part of
+POSITION_CELL_IDX = conhex_geometry.POSITION_CELL_IDX
+
+# Mask of the cells adjacent (sharing a position) to each cell
+CELL_NEIGHBOURS = conhex_geometry.CELL_NEIGHBOUR_MASKS
+
+# Zobrist key of each player and cell, indexed like CELL_LIST
+CELL_ZOBRIST_KEYS = {player: [keys[cell] for cell in CELL_LIST]
+                     for player, keys in conhex_hash.ZOBRIST_CELL_KEYS.items()}
+
+# Masks of the cells at the low and high border for each player
+BORDER_MASKS = {player: conhex_geometry.BORDER_CELL_MASKS[cell_dim]
+                for player, cell_dim in ct.CELL_DIMS.items()}
+
+
+class Conhex_bitboard(Conhex_game):
+    """Representation of a Conhex Game using integer bit masks
+
+    Each player's positions and conquered cells are stored as an int, with
+    one bit per position (ordered like ct.POSITIONS) or cell (ordered like
+    CELL_LIST). This makes moves, undos and win checks a few int operations.
+    The public API is the same as Conhex_game.
+    """
+
+    def __init__(self) -> None:
+        """Initializes an empty Conhex board
+
+        Returns: None
+        """
+        self._init_logging()
+        self.current_player = ct.BoardPosValue.PLAYER1
+        self._positions = {
+            ct.BoardPosValue.PLAYER1: 0,
+            ct.BoardPosValue.PLAYER2: 0,
+        }
+        self._cells = {
+            ct.BoardPosValue.PLAYER1: 0,
+            ct.BoardPosValue.PLAYER2: 0,
+        }
+        self._undo_stack = []
+        self.winner = ct.BoardPosValue.EMPTY
+        self.moves = []
+        self.hash = 0  # Zobrist hash of positions, cells and side to move
+        self.player_names = dict(ct.DEFAULT_PLAYER_NAMES)
+        self._init_free()
+        self._init_distances()
+
+    def _init_free(self) -> None:
+        """Initializes the free positions from the position masks, like
+        Conhex_game._init_free
+        """
+        taken = (self._positions[ct.BoardPosValue.PLAYER1] |
+                 self._positions[ct.BoardPosValue.PLAYER2])
+        self._free = [pos for pos, bit in POSITION_BITS.items()
+                      if not bit & taken]
+        self._free_index = dict(zip(self._free, range(len(self._free))))
+
+    @property
+    def _board(self) -> dict:
+        """Dict of position -> BoardPosValue, like Conhex_game._board"""
+        board = {}
+        for pos, bit in POSITION_BITS.items():
+            if bit & self._positions[ct.BoardPosValue.PLAYER1]:
+                board[pos] = ct.BoardPosValue.PLAYER1
+            elif bit & self._positions[ct.BoardPosValue.PLAYER2]:
+                board[pos] = ct.BoardPosValue.PLAYER2
+            else:
+                board[pos] = ct.BoardPosValue.EMPTY
+        return board
+
+    @property
+    def cells_conquered(self) -> dict:
+        """Dict of owner -> set of cells, like Conhex_game.cells_conquered"""
+        result = {player: {cell for cell in CELL_LIST
+                           if CELL_BITS[cell] & cells}
+                  for player, cells in self._cells.items()}
+        result[ct.BoardPosValue.EMPTY] = (set(CELL_LIST)
+                                          - result[ct.BoardPosValue.PLAYER1]
+                                          - result[ct.BoardPosValue.PLAYER2])
+        return result
+
+    def play_move(self, position: str) -> bool:
+        """Play the given move on the board
+
+        Args:
+            position (str): position - capital letter + numer
+                            MUST be one of ct.POSITIONS
+                            the position on the board MUST be empty
+
+        Returns:
+            bool: True if the game is won; False if it isn't
+
+        Raises:
+            ValueError: if position is not one of ct.POSITIONS
+            ValueError: if a move is placed at an empty spot
+        """
+        if self._log_debug:
+            self.logger.debug(f'Playing move: {position=}')
+        bit = POSITION_BITS.get(position)
+        if bit is None:
+            raise ValueError(f'{position} is not a valid position.')
+
+        player = self.current_player
+        if bit & (self._positions[ct.BoardPosValue.PLAYER1] |
+                  self._positions[ct.BoardPosValue.PLAYER2]):
+            raise ValueError(f"Can't play {position}; this position is already"
+                             f" taken by {str(self._board[position])}")
+        if self.trace is not None:
+            self.trace('move', {'position': position, 'player': player})
+
+        self._take_free(position)
+        mine = self._positions[player] | bit
+        self._positions[player] = mine
+        self.moves.append(position)
+        previous_hash = self.hash
+        self.hash ^= (conhex_hash.ZOBRIST_KEYS[player][position]
+                      ^ conhex_hash.ZOBRIST_SIDE)
+
+        # Conquer the free cells of position where player now has the quota
+        taken = (self._cells[ct.BoardPosValue.PLAYER1] |
+                 self._cells[ct.BoardPosValue.PLAYER2])
+        conquered = 0
+        for idx in POSITION_CELL_IDX[position]:
+            cell_bit = 1 << idx
+            if (not cell_bit & taken and
+                    bin(CELL_MASKS[idx] & mine).count('1') >= CELL_QUOTA[idx]):
+                conquered |= cell_bit
+                self.hash ^= CELL_ZOBRIST_KEYS[player][idx]
+
+        self._undo_stack.append((conquered, self.winner, previous_hash))
+        if conquered:
+            self._cells[player] |= conquered
+            if self._log_info:
+                self.logger.info(f'After {position=}, cells {conquered:#x} '
+                                 f'are added for {player}')
+            if self.trace is not None:
+                for cell, cell_bit in CELL_BITS.items():
+                    if cell_bit & conquered:
+                        self.trace('cell', {'cell': cell, 'player': player,
+                                            'position': position})
+            if (self.winner is ct.BoardPosValue.EMPTY and
+                    self._connects(player)):
+                if self._log_info:
+                    self.logger.info(f'{player} has won!')
+                if self.trace is not None:
+                    self.trace('win', {'player': player})
+                self.winner = player
+
+        self._distance_history.append(self._distances)
+        if self._distances:
+            self._update_distances(
+                player,
+                [CELL_LIST[idx] for idx in POSITION_CELL_IDX[position]
+                 if not (1 << idx) & taken],
+                [cell for cell, cell_bit in CELL_BITS.items()
+                 if cell_bit & conquered])
+        self.next_player()
+        return self.game_won()
+
+    def undo_move(self) -> None:
+        """Undoes one move
+        """
+        if not self.moves:
+            return
+
+        position = self.moves.pop()
+        if self._log_debug:
+            self.logger.debug(f'Undoing move: {position}')
+        if self.trace is not None:
+            self.trace('undo', {'position': position})
+        self.next_player()
+        conquered, self.winner, self.hash = self._undo_stack.pop()
+        self._distances = (self._distance_history.pop()
+                           if self._distance_history else {})
+        self._positions[self.current_player] &= ~POSITION_BITS[position]
+        self._cells[self.current_player] &= ~conquered
+        self._release_free(position)
+
+    def clone(self) -> 'Conhex_bitboard':
+        """Gives an independent copy of the game
+
+        Returns:
+            Conhex_bitboard: the copy
+        """
+        result = self.__class__.__new__(self.__class__)
+        result.__dict__.update(self.__dict__)
+        result._positions = dict(self._positions)
+        result._cells = dict(self._cells)
+        result._undo_stack = list(self._undo_stack)
+        result._distance_history = list(self._distance_history)
+        result._free = list(self._free)
+        result._free_index = dict(self._free_index)
+        result.moves = list(self.moves)
+        result.player_names = dict(self.player_names)
+        return result
+
+    def snapshot(self) -> Game_snapshot:
+        """Gives an immutable, compact copy of the state of the game
+
+        Returns:
+            Game_snapshot: the snapshot; state holds the position and cell
+                           masks of PLAYER1 and PLAYER2, the undo stack and
+                           the free positions
+        """
+        return Game_snapshot(
+            moves_to_bytes(self.moves),
+            (self.player_names[ct.BoardPosValue.PLAYER1],
+             self.player_names[ct.BoardPosValue.PLAYER2]),
+            self.current_player,
+            self.winner,
+            self.hash,
+            (self._positions[ct.BoardPosValue.PLAYER1],
+             self._positions[ct.BoardPosValue.PLAYER2],
+             self._cells[ct.BoardPosValue.PLAYER1],
+             self._cells[ct.BoardPosValue.PLAYER2],
+             tuple(self._undo_stack),
+             tuple(self._free)))
+
+    def restore(self, snapshot: Game_snapshot) -> None:
+        """Sets the state of the game to a snapshot
+
+        Args:
+            snapshot (Game_snapshot): snapshot made by snapshot() of a game
+                                      of the same class
+        """
+        (positions_player1, positions_player2, cells_player1, cells_player2,
+         undo_stack, free) = snapshot.state
+        self.moves = bytes_to_moves(snapshot.moves)
+        self.set_player_names(*snapshot.player_names)
+        self.current_player = snapshot.current_player
+        self.winner = snapshot.winner
+        self.hash = snapshot.hash
+        self._positions = {ct.BoardPosValue.PLAYER1: positions_player1,
+                           ct.BoardPosValue.PLAYER2: positions_player2}
+        self._cells = {ct.BoardPosValue.PLAYER1: cells_player1,
+                       ct.BoardPosValue.PLAYER2: cells_player2}
+        self._undo_stack = list(undo_stack)
+        # Copying the free positions is faster than finding them again
+        self._free = list(free)
+        self._free_index = dict(zip(free, range(len(free))))
+        self._init_distances()
+
+    def _connects(self, player: ct.BoardPosValue) -> bool:
+        """Checks if the cells of player connect the player's borders
+
+        Args:
+            player (ct.BoardPosValue): player to check
+
+        Returns:
+            bool: True if the player's cells connect both borders
+        """
+        cells = self._cells[player]
+        low, high = BORDER_MASKS[player]
+        if not (cells & low and cells & high):
+            return False
+
+        # Flood fill the player's cells, starting at the low border
+        reached = frontier = cells & low
+        while frontier:
+            bit = frontier & -frontier
+            frontier ^= bit
+            new = CELL_NEIGHBOURS[bit.bit_length() - 1] & cells & ~reached
+            reached |= new
+            frontier |= new
+
+        return bool(reached & high)
+
+    def game_won(self) -> bool:
+        """ Checks if the game is won by one of the players
+            Winning player is stored in self.winner
+
+        Returns:
+            bool: True if the game is won; False if it isn't
+        """
+        return self.winner is not ct.BoardPosValue.EMPTY
+
+    def _cell_costs(self, player: ct.BoardPosValue) -> dict:
+        """Gives the number of positions player still needs in each cell
+
+        Args:
+            player (ct.BoardPosValue): player to give the costs for
+
+        Returns:
+            dict: cell -> number of positions; 0 for the player's cells and
+                  None for the opponent's cells
+        """
+        mine = self._positions[player]
+        own_cells = self._cells[player]
+        taken = (self._cells[ct.BoardPosValue.PLAYER1] |
+                 self._cells[ct.BoardPosValue.PLAYER2])
+        costs = {}
+        for idx, cell in enumerate(CELL_LIST):
+            if CELL_BITS[cell] & own_cells:
+                costs[cell] = 0
+            elif CELL_BITS[cell] & taken:
+                costs[cell] = None
+            else:
+                costs[cell] = (CELL_QUOTA[idx] -
+                               bin(CELL_MASKS[idx] & mine).count('1'))
+        return costs
+
+
+def main():
+    ct.configure_logging()
+    b = Conhex_bitboard()
+    while not b.game_won():
+        pos = b.random_free_position()
+        print(f'Playing {pos=} for {str(b.current_player)}')
+        b.play_move(pos)
+
+    print(f'The game is won by {b.winner}')
+    print(b)
+
+
+if __name__ == "__main__":
+    main()
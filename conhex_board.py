@@ -1,18 +1,112 @@
 import constants as ct
+import conhex_hash
+import heapq
 import logging
+import random
+import re
+import types
+import typing
+
+
+class Rollback_union_find:
+    """Disjoint-set forest whose unions can be undone in LIFO order
+
+    Uses union by size without path compression, so find() is O(log n) and
+    each union is undone by restoring a single parent pointer.
+    """
+
+    def __init__(self, nodes: list) -> None:
+        """Initializes the forest with every node in its own set
+
+        Args:
+            nodes (list): hashable nodes of the forest
+        """
+        self.parent = {node: node for node in nodes}
+        self.size = dict.fromkeys(self.parent, 1)
+        self.history = []
+
+    def find(self, node) -> object:
+        """Finds the representative of the set of node
+
+        Args:
+            node: node of the forest
+
+        Returns:
+            the root node of the set that node is in
+        """
+        parent = self.parent
+        while parent[node] != node:
+            node = parent[node]
+        return node
+
+    def union(self, node1, node2) -> None:
+        """Merges the sets of node1 and node2
+
+        Args:
+            node1: node of the forest
+            node2: node of the forest
+        """
+        root1, root2 = self.find(node1), self.find(node2)
+        if root1 == root2:
+            return
+
+        if self.size[root1] < self.size[root2]:
+            root1, root2 = root2, root1
+        self.parent[root2] = root1
+        self.size[root1] += self.size[root2]
+        self.history.append(root2)
+
+    def copy(self) -> 'Rollback_union_find':
+        """Gives an independent copy of the forest, including its history"""
+        result = self.__class__.__new__(self.__class__)
+        result.parent = dict(self.parent)
+        result.size = dict(self.size)
+        result.history = list(self.history)
+        return result
+
+    def rollback(self, mark: int) -> None:
+        """Undoes all unions made since len(self.history) was mark
+
+        Args:
+            mark (int): length of self.history to roll back to
+        """
+        while len(self.history) > mark:
+            root2 = self.history.pop()
+            root1 = self.parent[root2]
+            self.size[root1] -= self.size[root2]
+            self.parent[root2] = root2
+
+
+class Game_snapshot(typing.NamedTuple):
+    """Immutable, compact copy of the state of a game; made by
+    Conhex_game.snapshot() and applied by Conhex_game.restore()
+    """
+    moves: bytes            # encoded by moves_to_bytes
+    player_names: tuple     # names of PLAYER1 and PLAYER2
+    current_player: ct.BoardPosValue
+    winner: ct.BoardPosValue
+    hash: int
+    state: tuple            # engine specific state, see snapshot()
 
 
 class Conhex_game:
     """Representation of a Conhex Game and its state during a game
+
+    Log messages on the move path are only formatted if their level is
+    enabled at the time the game is initialized or reset. For structured
+    tracing, set the trace attribute to a callable; it is called as
+    trace(event, data) with event one of 'move', 'undo', 'cell' or 'win'
+    and data a dict describing the event.
     """
 
+    trace = None
+
     def __init__(self) -> None:
         """Initializes an empty Conhex board
 
         Returns: None
         """
-        self.logger = logging.getLogger(ct.LOGGER)
-        self.logger.info(f'Started logger for {self.__class__.__name__}')
+        self._init_logging()
         self.current_player = ct.BoardPosValue.PLAYER1
         self._board = {pos: ct.BoardPosValue.EMPTY
                        for pos in ct.POSITIONS}
@@ -21,9 +115,99 @@ class Conhex_game:
             ct.BoardPosValue.PLAYER2: set(),
             ct.BoardPosValue.EMPTY: set(ct.CELLS)
         }
+        self._cell_occupancy = {
+            ct.BoardPosValue.PLAYER1: dict.fromkeys(ct.CELLS, 0),
+            ct.BoardPosValue.PLAYER2: dict.fromkeys(ct.CELLS, 0),
+        }
+        # Connectivity of the conquered cells, including a virtual node for
+        # the low and high border of each player
+        self._connections = Rollback_union_find(
+            list(ct.CELLS) + [(player, border) for player in ct.CELL_DIMS
+                              for border in (ct.CELL_LOW_DIM,
+                                             ct.CELL_HIGH_DIM)])
         self.winner = ct.BoardPosValue.EMPTY
         self.moves = []
+        self._undo_stack = []
+        self.hash = 0  # Zobrist hash of positions, cells and side to move
         self.player_names = dict(ct.DEFAULT_PLAYER_NAMES)
+        self._init_free()
+        self._init_distances()
+
+    def _init_free(self) -> None:
+        """Initializes the free positions from the board. They are kept as
+        a list, in no particular order, and a dict of position -> index in
+        that list, so a position is added or removed in O(1).
+        """
+        if not self.moves:
+            self._free = list(ct.POSITIONS)
+            self._free_index = dict(ct.POSITION_INDEX)
+            return
+
+        board = self._board
+        self._free = [pos for pos in ct.POSITIONS
+                      if board[pos] is ct.BoardPosValue.EMPTY]
+        self._free_index = {pos: idx for idx, pos in enumerate(self._free)}
+
+    def _take_free(self, position: str) -> None:
+        """Removes a free position, moving the last one into its place"""
+        idx = self._free_index.pop(position)
+        last = self._free.pop()
+        if last != position:
+            self._free[idx] = last
+            self._free_index[last] = idx
+
+    def _release_free(self, position: str) -> None:
+        """Adds a free position"""
+        self._free_index[position] = len(self._free)
+        self._free.append(position)
+
+    def _init_distances(self) -> None:
+        """Forgets the connection distances. They are kept as a dict of
+        player -> (distance, cells of a shortest connection), for the
+        players whose distance is known, and updated by play_move (see
+        _update_distances). The dict of every earlier move is kept, so
+        undo_move only takes it back.
+        """
+        self._distances = {}
+        self._distance_history = []
+
+    def _update_distances(self, player: ct.BoardPosValue, decreased: list,
+                          conquered: list) -> None:
+        """Keeps the connection distances that a move of player can't have
+        changed, so they don't need to be searched again
+
+        The move lowers the cost of player in the free cells of its
+        position by one, so no connection of player gets cheaper by more
+        than the number of those cells. If the shortest connection has them
+        all, it stays the shortest. For the opponent, the move only blocks
+        the cells it conquered; a shortest connection without them stays
+        the shortest.
+
+        Args:
+            player (ct.BoardPosValue): player that moved
+            decreased (list): cells of the position that were free
+            conquered (list): cells conquered by the move
+        """
+        distances = {}
+        for other, (distance, path) in self._distances.items():
+            if other is player:
+                if distance is None:
+                    distances[other] = (distance, path)
+                elif path.issuperset(decreased):
+                    distances[other] = (distance - len(decreased), path)
+            elif distance is None or path.isdisjoint(conquered):
+                distances[other] = (distance, path)
+        self._distances = distances
+
+    def _init_logging(self) -> None:
+        """Gets the logger and caches which log levels are enabled, so
+        disabled messages cost a single attribute check
+        """
+        self.logger = logging.getLogger(ct.LOGGER)
+        self._log_debug = self.logger.isEnabledFor(logging.DEBUG)
+        self._log_info = self.logger.isEnabledFor(logging.INFO)
+        if self._log_info:
+            self.logger.info(f'Started logger for {self.__class__.__name__}')
 
     def set_player_names(self, player1_name: str, player2_name: str) -> None:
         self.player_names[ct.BoardPosValue.PLAYER1] = player1_name
@@ -39,7 +223,8 @@ class Conhex_game:
         else:
             self.current_player = ct.BoardPosValue.PLAYER1
 
-        self.logger.debug(f'Switched player: {self.current_player=}')
+        if self._log_debug:
+            self.logger.debug(f'Switched player: {self.current_player=}')
         return self.current_player
 
     def play_move(self, position: str) -> bool:
@@ -57,17 +242,39 @@ class Conhex_game:
             ValueError: if position is not one of ct.POSITIONS
             ValueError: if a move is placed at an empty spot
         """
-        self.logger.debug(f'Playing move: {position=}')
-        if position not in ct.POSITIONS:
-            raise ValueError(f'{position} is not a valid position.')
-
-        if self._board[position] != ct.BoardPosValue.EMPTY:
+        if self._log_debug:
+            self.logger.debug(f'Playing move: {position=}')
+        if position not in self._free_index:
+            if position not in ct.POSITION_INDEX:
+                raise ValueError(f'{position} is not a valid position.')
             raise ValueError(f"Can't play {position}; this position is already"
-                             f" taken by {str(self.board[position])}")
+                             f" taken by {str(self._board[position])}")
+        if self.trace is not None:
+            self.trace('move', {'position': position,
+                                'player': self.current_player})
 
+        self._take_free(position)
         self._board[position] = self.current_player
         self.moves.append(position)
-        self._update_cells_conquered(position)
+        conquered = self._update_cells_conquered(position)
+        self._undo_stack.append((conquered, self.winner,
+                                 len(self._connections.history),
+                                 self.hash))
+        self.hash ^= (conhex_hash.ZOBRIST_KEYS[self.current_player][position]
+                      ^ conhex_hash.ZOBRIST_SIDE)
+        cell_keys = conhex_hash.ZOBRIST_CELL_KEYS[self.current_player]
+        for cell in conquered:
+            self.hash ^= cell_keys[cell]
+        self._connect_cells(conquered)
+
+        self._distance_history.append(self._distances)
+        if self._distances:
+            free_cells = self.cells_conquered[ct.BoardPosValue.EMPTY]
+            self._update_distances(
+                self.current_player,
+                [cell for cell in ct.POSITION_CELLS[position]
+                 if cell in free_cells or cell in conquered],
+                conquered)
         self.next_player()
         return self.game_won()
 
@@ -78,11 +285,26 @@ class Conhex_game:
             return
 
         position = self.moves.pop()
-        self.logger.debug(f'Undoing move: {position}')
+        if self._log_debug:
+            self.logger.debug(f'Undoing move: {position}')
+        if self.trace is not None:
+            self.trace('undo', {'position': position})
+        conquered, self.winner, mark, self.hash = self._undo_stack.pop()
+        self._distances = (self._distance_history.pop()
+                           if self._distance_history else {})
+        self._connections.rollback(mark)
+        player = self._board[position]
         self._board[position] = ct.BoardPosValue.EMPTY
-        self.winner = ct.BoardPosValue.EMPTY
+        self._release_free(position)
         self.next_player()
-        self._full_update_cells_conquered()
+
+        # Give back the cells conquered by the move and release its positions
+        occupancy = self._cell_occupancy[player]
+        for cell in ct.POSITION_CELLS[position]:
+            occupancy[cell] -= 1
+        for cell in conquered:
+            self.cells_conquered[player].remove(cell)
+            self.cells_conquered[ct.BoardPosValue.EMPTY].add(cell)
 
     def reset(self) -> None:
         """Resets the board to its initial (empty) position
@@ -90,45 +312,158 @@ class Conhex_game:
         self.logger.debug('Resetting board')
         self.__init__()
 
-    def _update_cells_conquered(self, position: str) -> None:
-        """Updates the conquered cells after position is played
+    def clone(self) -> 'Conhex_game':
+        """Gives an independent copy of the game, without re-initializing
+        the logger or deep-copying shared constants
 
-        Args:
-            position (str): last played position
+        Returns:
+            Conhex_game: the copy
         """
-        self.logger.debug(f'Updating conquered cells after playing {position}')
-        # Check all cells
-        for cell, cell_poss in ct.CELLS.items():
+        result = self.__class__.__new__(self.__class__)
+        result.__dict__.update(self.__dict__)
+        result._board = dict(self._board)
+        result._free = list(self._free)
+        result._free_index = dict(self._free_index)
+        result.cells_conquered = {owner: set(cells) for owner, cells
+                                  in self.cells_conquered.items()}
+        result._cell_occupancy = {player: dict(occupancy) for player, occupancy
+                                  in self._cell_occupancy.items()}
+        result._connections = self._connections.copy()
+        result.moves = list(self.moves)
+        result._undo_stack = list(self._undo_stack)
+        result._distance_history = list(self._distance_history)
+        result.player_names = dict(self.player_names)
+        return result
+
+    def snapshot(self) -> Game_snapshot:
+        """Gives an immutable, compact copy of the state of the game
 
-            # If the move is in the cell and the cell is not taken yet...
-            if (position in cell_poss and
-                cell not in (self.cells_conquered[ct.BoardPosValue.PLAYER1] |
-                             self.cells_conquered[ct.BoardPosValue.PLAYER2])):
+        Returns:
+            Game_snapshot: the snapshot; state holds the cells of PLAYER1
+                           and PLAYER2, the undo stack and the parents,
+                           sizes and history of the cell connections
+        """
+        connections = self._connections
+        return Game_snapshot(
+            moves_to_bytes(self.moves),
+            (self.player_names[ct.BoardPosValue.PLAYER1],
+             self.player_names[ct.BoardPosValue.PLAYER2]),
+            self.current_player,
+            self.winner,
+            self.hash,
+            (tuple(self.cells_conquered[ct.BoardPosValue.PLAYER1]),
+             tuple(self.cells_conquered[ct.BoardPosValue.PLAYER2]),
+             tuple((tuple(conquered), *rest)
+                   for conquered, *rest in self._undo_stack),
+             tuple(connections.parent.values()),
+             tuple(connections.size.values()),
+             tuple(connections.history)))
+
+    def restore(self, snapshot: Game_snapshot) -> None:
+        """Sets the state of the game to a snapshot
+
+        Args:
+            snapshot (Game_snapshot): snapshot made by snapshot() of a game
+                                      of the same class
+        """
+        (cells_player1, cells_player2, undo_stack,
+         parents, sizes, history) = snapshot.state
+        self.moves = bytes_to_moves(snapshot.moves)
+        self.set_player_names(*snapshot.player_names)
+        self.current_player = snapshot.current_player
+        self.winner = snapshot.winner
+        self.hash = snapshot.hash
+
+        # Positions and occupancy follow from the moves; PLAYER1 starts
+        self._board = dict.fromkeys(ct.POSITIONS, ct.BoardPosValue.EMPTY)
+        self._cell_occupancy = {
+            ct.BoardPosValue.PLAYER1: dict.fromkeys(ct.CELLS, 0),
+            ct.BoardPosValue.PLAYER2: dict.fromkeys(ct.CELLS, 0),
+        }
+        players = (ct.BoardPosValue.PLAYER1, ct.BoardPosValue.PLAYER2)
+        for idx, move in enumerate(self.moves):
+            player = players[idx % 2]
+            self._board[move] = player
+            occupancy = self._cell_occupancy[player]
+            for cell in ct.POSITION_CELLS[move]:
+                occupancy[cell] += 1
 
-                # Count the number of positions for current player
-                positions = sum(self._board[pos] == self._board[position]
-                                for pos in cell_poss)
+        self.cells_conquered = {
+            ct.BoardPosValue.PLAYER1: set(cells_player1),
+            ct.BoardPosValue.PLAYER2: set(cells_player2),
+            ct.BoardPosValue.EMPTY: (set(ct.CELLS) - set(cells_player1)
+                                     - set(cells_player2)),
+        }
+        self._undo_stack = [(list(conquered), *rest)
+                            for conquered, *rest in undo_stack]
+        self._connections.parent = dict(zip(self._connections.parent,
+                                            parents))
+        self._connections.size = dict(zip(self._connections.size, sizes))
+        self._connections.history = list(history)
+        self._init_free()
+        self._init_distances()
+
+    def _update_cells_conquered(self, position: str) -> list:
+        """Updates the conquered cells after position is played
 
-                # If this is more than half of the positions, claim it!
-                if positions * 2 >= len(cell_poss):
-                    self.cells_conquered[self._board[position]].add(cell)
-                    self.cells_conquered[ct.BoardPosValue.EMPTY].remove(cell)
+        Args:
+            position (str): last played position
 
+        Returns:
+            list: the cells conquered by playing position
+        """
+        if self._log_debug:
+            self.logger.debug(
+                f'Updating conquered cells after playing {position}')
+        player = self._board[position]
+        occupancy = self._cell_occupancy[player]
+        free_cells = self.cells_conquered[ct.BoardPosValue.EMPTY]
+        conquered = []
+
+        # Only check the (at most 3) cells the move is part of
+        for cell in ct.POSITION_CELLS[position]:
+            occupancy[cell] += 1
+
+            # If the cell is not taken yet and the player now has at least
+            # half of the positions, claim it!
+            if (cell in free_cells and
+                    occupancy[cell] * 2 >= len(ct.CELLS[cell])):
+                self.cells_conquered[player].add(cell)
+                free_cells.remove(cell)
+                conquered.append(cell)
+
+                if self._log_info:
                     self.logger.info(
                         f'After {position=}, {cell=} with points '
-                        f'{cell_poss} is added for {self.current_player}; '
-                        f'player controls {positions=} points of that cell.'
-                        f' Conquered cells are now: {self.cells_conquered=}')
+                        f'{ct.CELLS[cell]} is added for {self.current_player};'
+                        f' player controls positions={occupancy[cell]} points'
+                        f' of that cell. Conquered cells are now: '
+                        f'{self.cells_conquered=}')
+                if self.trace is not None:
+                    self.trace('cell', {'cell': cell, 'player': player,
+                                        'position': position})
 
-    def _full_update_cells_conquered(self) -> None:
-        """Makes a full update of the conquered cells by replaying the game
-        """
-        self.logger.debug('Replaying game to update conquered cells...')
+        return conquered
 
-        stored_moves = list(self.moves)
-        self.reset()
-        for move in stored_moves:
-            self.play_move(move)
+    def _connect_cells(self, cells: list) -> None:
+        """Joins newly conquered cells with the owner's adjacent cells and
+        with the owner's borders they lie at
+
+        Args:
+            cells (list): cells that were just conquered by the current player
+        """
+        player = self.current_player
+        player_cells = self.cells_conquered[player]
+        cell_dim = ct.CELL_DIMS[player]
+        for cell in cells:
+            for other_cell in ct.CELL_NEIGHBOURS[cell]:
+                if other_cell in player_cells:
+                    self._connections.union(cell, other_cell)
+
+            if cell[cell_dim] <= ct.CELL_LOW_DIM:
+                self._connections.union(cell, (player, ct.CELL_LOW_DIM))
+            elif cell[cell_dim] >= ct.CELL_HIGH_DIM:
+                self._connections.union(cell, (player, ct.CELL_HIGH_DIM))
 
     def game_won(self) -> bool:
         """ Checks if the game is won by one of the players
@@ -140,70 +475,123 @@ class Conhex_game:
         if self.winner is not ct.BoardPosValue.EMPTY:
             return True
 
-        for player, cell_dim in [(ct.BoardPosValue.PLAYER1, 1),
-                                 (ct.BoardPosValue.PLAYER2, 0)]:
-            self.logger.debug(f'Checking if {player=} has won...')
-            player_cells = self.cells_conquered[player]
-
-            # Do a quick check to see if player has a cell in exactly 2 sides
-            if len({cell[cell_dim] for cell in player_cells
-                   if (cell[cell_dim] <= ct.CELL_LOW_DIM
-                       or cell[cell_dim] >= ct.CELL_HIGH_DIM)}) == 2:
-                self.logger.debug(f'{player} had no cells at both borders')
-                continue  # go to the next player in the for loop
-
-            # Loop over each of the player's cell in the top or left row
-            for cell in (cell for cell in player_cells
-                         if cell[cell_dim] <= ct.CELL_LOW_DIM):
-                # Keep adding points to the set of positions that are adjacent
-                # to the cell until no more cells can be added. Also keep
-                # track of the connected cells.
-                connected_cells = set()
-                pos_cloud = set(ct.CELLS[cell])
-                cell_count = -1
-
-                # Loop while cells are added in the loop
-                while len(connected_cells) > cell_count:
-                    cell_count = len(connected_cells)
-
-                    # Loop over all the player's cells
-                    for other_cell in player_cells:
-                        # Loop over all positions of that player's cell
-                        for pos in ct.CELLS[other_cell]:
-                            # check if other_cell is adjacent to the cells
-                            # connected to cell - we check this by matching
-                            # positions iteratively between cell and other_cell
-                            if pos in pos_cloud:
-                                # Add position
-                                pos_cloud |= set(ct.CELLS[other_cell])
-
-                                # Add cell
-                                connected_cells.add(other_cell)
-
-                                # Break the loop; cell and pos's already added
-                                break
-
-                self.logger.debug(f'For {player=}, all points connected to '
-                                  f'{cell} are: {connected_cells}')
-
-                # Check if we can reach the other side
-                if any(True for cell in connected_cells
-                       if cell[cell_dim] == ct.CELL_HIGH_DIM):
+        for player in ct.CELL_DIMS:
+            if self._log_debug:
+                self.logger.debug(f'Checking if {player=} has won...')
+
+            # The player has won if both its borders are in the same set
+            if (self._connections.find((player, ct.CELL_LOW_DIM)) ==
+                    self._connections.find((player, ct.CELL_HIGH_DIM))):
+                if self._log_info:
                     self.logger.info(f'{player} has won!')
-                    self.winner = player
-                    return True
+                if self.trace is not None:
+                    self.trace('win', {'player': player})
+                self.winner = player
+                return True
 
-        self.logger.info('None of the players has won yet...')
+        if self._log_info:
+            self.logger.info('None of the players has won yet...')
         return False
 
     def free_positions(self) -> list:
-        """Gives a list of free (non-empty) positions
+        """Gives a list of free (non-empty) positions, in no particular
+        order. The list is a copy; see free_positions_view to iterate
+        without copying.
 
         Returns:
             list: list of positions (capital letter + number)
         """
-        return [pos for pos in ct.POSITIONS
-                if self._board[pos] == ct.BoardPosValue.EMPTY]
+        return list(self._free)
+
+    def free_positions_view(self) -> types.MappingProxyType:
+        """Gives a read-only view of the free positions, without copying.
+        Iterating it gives the positions; len() and 'in' are O(1). The view
+        follows the game, so don't play or undo moves while iterating it.
+
+        Returns:
+            types.MappingProxyType: the free positions (as keys)
+        """
+        return types.MappingProxyType(self._free_index)
+
+    def random_free_position(self, rng: random.Random = random) -> str:
+        """Picks a free position uniformly at random in O(1)
+
+        Args:
+            rng (random.Random): random number generator; the random module
+                                 by default
+
+        Returns:
+            str: the position
+
+        Raises:
+            IndexError: if there are no free positions
+        """
+        return rng.choice(self._free)
+
+    def _cell_costs(self, player: ct.BoardPosValue) -> dict:
+        """Gives the number of positions player still needs in each cell
+
+        Args:
+            player (ct.BoardPosValue): player to give the costs for
+
+        Returns:
+            dict: cell -> number of positions; 0 for the player's cells and
+                  None for the opponent's cells
+        """
+        occupancy = self._cell_occupancy[player]
+        own_cells = self.cells_conquered[player]
+        free_cells = self.cells_conquered[ct.BoardPosValue.EMPTY]
+        return {cell: (0 if cell in own_cells else
+                       ct.CELL_QUOTAS[cell] - occupancy[cell]
+                       if cell in free_cells else None)
+                for cell in ct.CELLS}
+
+    def connection_distances(self) -> dict:
+        """Gives the connection distance of both players: the fewest
+        positions each player still needs to connect its borders (see
+        shortest_connection). Moves keep a distance when they can't have
+        changed it, so a player's distance is only searched again when its
+        shortest connection may have changed.
+
+        Returns:
+            dict: player -> distance; None if the player can't connect
+        """
+        distances = self._distances
+        if len(distances) < len(ct.CELL_DIMS):
+            distances = dict(distances)
+            for player in ct.CELL_DIMS:
+                if player not in distances:
+                    distances[player] = shortest_connection(
+                        self._cell_costs(player), player)
+            self._distances = distances
+        return {player: distance
+                for player, (distance, _) in distances.items()}
+
+    def evaluate(self, player: ct.BoardPosValue = None) -> int:
+        """Scores the position for a player without searching: the
+        opponent's connection distance minus the player's. Higher is better
+        for player; a won game scores +/- the number of positions.
+
+        Args:
+            player (ct.BoardPosValue): player to score for; None for the
+                                       current player
+
+        Returns:
+            int: the score
+        """
+        if player is None:
+            player = self.current_player
+        if self.game_won():
+            return (len(ct.POSITIONS) if self.winner is player
+                    else -len(ct.POSITIONS))
+
+        distances = {other: len(ct.POSITIONS) if distance is None
+                     else distance for other, distance
+                     in self.connection_distances().items()}
+        opponent = (ct.BoardPosValue.PLAYER2
+                    if player is ct.BoardPosValue.PLAYER1
+                    else ct.BoardPosValue.PLAYER1)
+        return distances[opponent] - distances[player]
 
     def __str__(self) -> str:
         """Returns a string representation of the board
@@ -212,20 +600,22 @@ class Conhex_game:
             str: string representation of the board
         """
         result = ''
+        board = self._board
+        cells_conquered = self.cells_conquered
 
         # Generate board and plot positions
         for segment, pos in zip(ct.BOARD_ASCII_SEGMENTS, ct.POSITIONS):
             result += segment
-            if self._board[pos] == ct.BoardPosValue.EMPTY:
+            if board[pos] == ct.BoardPosValue.EMPTY:
                 pos_char = 'O'
             else:
-                pos_char = str(self._board[pos])[-1]
+                pos_char = str(board[pos])[-1]
             result += pos_char
 
         # Replace cell coordinates with correct string values
         for x, y in ct.CELLS:
             for owner in ct.BoardPosValue:
-                if (x, y) in self.cells_conquered[owner]:
+                if (x, y) in cells_conquered[owner]:
                     result = result.replace(f'{x},{y}', ct.ASCII_CELL[owner])
                     break  # break out of inner for loop
 
@@ -248,38 +638,8 @@ class Conhex_game:
             content = file.readline()
             self.logger.debug(f'Read file {filename}: {content}')
 
-        if not content:
-            raise ValueError(f'Could not read file {filename}; no content.')
-
-        if ct.READ_MARKERS['SIGNATURE'] not in content:
-            raise ValueError(f"Signature '{ct.READ_MARKERS['SIGNATURE']}' not "
-                             f"found in file {filename}")
-
-        # Parse player names
-        try:
-            # Find indices where player names start
-            player_idx = [content.find(key)
-                          for key in ct.READ_MARKERS['PLAYERS'].values()]
-
-            # Extract player names
-            player_names = [content[idx + 3:content.find(']', idx)]
-                            for idx in player_idx]
-
-            self.logger.debug(f'Read player names: {player_names}')
-
-        except Exception:
-            raise ValueError(f'Could not read player names from {filename}')
-
-        # Parse moves
-        try:
-            # Split the content in fields; then check if the turn markers
-            # are in a field. If so, extract the move and put it in the list.
-            # This gives a list of moves like ['H5', 'I7', 'H7']
-            fields = content.split(ct.READ_MARKERS['FIELD_SEPARATOR'])
-            moves = [field[2:field.find(']')] for field in fields
-                     if field[:2] in ct.READ_MARKERS['TURNS']]
-        except Exception:
-            raise ValueError(f'Could not read moves from {filename}')
+        player_names, moves = parse_littlegolem(content, f'file {filename}')
+        self.logger.debug(f'Read player names: {player_names}')
 
         # File is read. Now set the player names and replay the game
         self.reset()
@@ -290,22 +650,201 @@ class Conhex_game:
         self.logger.info(f'Successfully read file {filename}')
 
     def save(self, filename: str) -> None:
-        raise NotImplementedError
+        """Saves the game to a txt file in LittleGolem format, as read by
+        load
+
+        Args:
+            filename (str): file name of the file to be written
+        """
+        with open(filename, 'w') as file:
+            file.write(littlegolem_record(
+                (self.player_names[ct.BoardPosValue.PLAYER1],
+                 self.player_names[ct.BoardPosValue.PLAYER2]),
+                self.moves))
+
+        self.logger.info(f'Successfully saved file {filename}')
+
+
+def shortest_connection(costs: dict, player: ct.BoardPosValue) -> tuple:
+    """Gives the connection distance of a player, the fewest positions it
+    needs to connect its borders, and the cells of a cheapest connection:
+    the cheapest path of adjacent cells from a low to a high border cell
+    (Dijkstra over the cell adjacency graph), where a cell costs the
+    positions the player still needs to conquer it
+
+    Positions shared by two cells on the path are counted for both cells,
+    so the distance is an estimate, not a lower bound.
+
+    Args:
+        costs (dict): cell -> positions the player still needs; None for
+                      cells the player can't get anymore
+        player (ct.BoardPosValue): player to give the distance for
+
+    Returns:
+        tuple: the distance, 0 if the player is connected and None if the
+               player can't connect anymore, and a frozenset of the cells
+               of the path, empty if there is none
+    """
+    low_cells, high_cells = ct.BORDER_CELLS[ct.CELL_DIMS[player]]
+    best = {cell: costs[cell] for cell in low_cells
+            if costs[cell] is not None}
+    previous = {cell: cell for cell in best}  # itself at the low border
+    queue = [(distance, cell) for cell, distance in best.items()]
+    heapq.heapify(queue)
+    done = set()
+    while queue:
+        distance, cell = heapq.heappop(queue)
+        if cell in done:
+            continue
+        if cell in high_cells:
+            path = [cell]
+            while previous[cell] != cell:
+                cell = previous[cell]
+                path.append(cell)
+            return distance, frozenset(path)
+
+        done.add(cell)
+        for other in ct.CELL_NEIGHBOURS[cell]:
+            cost = costs[other]
+            if cost is None or other in done:
+                continue
+            # Only queue a cell again for a cheaper path
+            other_distance = distance + cost
+            if other not in best or other_distance < best[other]:
+                best[other] = other_distance
+                previous[other] = cell
+                heapq.heappush(queue, (other_distance, other))
+    return None, frozenset()
+
+
+#
+# Properties of a LittleGolem record: an identifier and a value in
+# brackets, in which ']' and '\' are escaped with a '\' (as in SGF)
+#
+RECORD_PROPERTY = re.compile(r'([A-Z]*)\[([^\\\]]*(?:\\.[^\\\]]*)*)\]',
+                             re.DOTALL)
+RECORD_ESCAPE = re.compile(r'\\(.)', re.DOTALL)
+RECORD_SPECIAL = re.compile(r'[\\\]]')
+
+
+def escape_record_value(value: str) -> str:
+    """Escapes ']' and '\\' in a property value of a LittleGolem record
+
+    Args:
+        value (str): the value, e.g. a player name
+
+    Returns:
+        str: the escaped value
+    """
+    return RECORD_SPECIAL.sub(r'\\\g<0>', value)
+
+
+def parse_littlegolem(content: str, source: str = 'record') -> tuple:
+    """Parses a game record in LittleGolem format
+
+    Args:
+        content (str): the game record
+        source (str): name of the record's source, for error messages
+
+    Returns:
+        tuple: list of the names of PLAYER1 and PLAYER2 and list of moves
+
+    Raises:
+        ValueError: if content is empty
+        ValueError: if the signature is not found in content
+        ValueError: if the player names or moves could not be read
+    """
+    if not content:
+        raise ValueError(f'Could not read {source}; no content.')
+
+    if ct.READ_MARKERS['SIGNATURE'] not in content:
+        raise ValueError(f"Signature '{ct.READ_MARKERS['SIGNATURE']}' not "
+                         f"found in {source}")
+
+    # Read the properties, like PW[name] or B[F6]; a '[' that doesn't
+    # start one or lie in a value means the record is cut off
+    properties = RECORD_PROPERTY.findall(content)
+    if content.count('[') != len(properties) + sum(
+            value.count('[') for _, value in properties):
+        raise ValueError(f'Could not read moves from {source}')
+    properties = [(name, RECORD_ESCAPE.sub(r'\1', value) if '\\' in value
+                   else value) for name, value in properties]
+
+    # Parse player names
+    player_names = []
+    for key in ct.READ_MARKERS['PLAYERS'].values():
+        names = [value for name, value in properties if name == key]
+        if not names:
+            raise ValueError(f'Could not read player names from {source}')
+        player_names.append(names[0])
+
+    # Parse moves; this gives a list of moves like ['H5', 'I7', 'H7']
+    turns = [turn.rstrip('[') for turn in ct.READ_MARKERS['TURNS']]
+    moves = [value for name, value in properties if name in turns]
+
+    return player_names, moves
+
+
+def littlegolem_record(player_names: tuple, moves: list) -> str:
+    """Gives a game record in LittleGolem format, as read by
+    parse_littlegolem
+
+    Args:
+        player_names (tuple): names of PLAYER1 and PLAYER2
+        moves (list): moves of the game
+
+    Returns:
+        str: the record on one line, ending with a newline
+    """
+    players = ct.READ_MARKERS['PLAYERS'].values()
+    fields = ['(', ct.READ_MARKERS['SIGNATURE'] +
+              ''.join(f'{key}[{escape_record_value(name)}]'
+                      for key, name in zip(players, player_names))]
+    fields += [f'{ct.READ_MARKERS["TURNS"][idx % 2]}{move}]'
+               for idx, move in enumerate(moves)]
+    return ct.READ_MARKERS['FIELD_SEPARATOR'].join(fields) + ')\n'
+
+
+def moves_to_bytes(moves: list) -> bytes:
+    """Encodes a list of moves compactly as one byte per move
+
+    Args:
+        moves (list): moves (capital letter + number)
+
+    Returns:
+        bytes: index in ct.POSITIONS of each move
+    """
+    return bytes(ct.POSITION_INDEX[move] for move in moves)
+
+
+def bytes_to_moves(data: bytes) -> list:
+    """Decodes moves encoded by moves_to_bytes
+
+    Args:
+        data (bytes): index in ct.POSITIONS of each move
+
+    Returns:
+        list: moves (capital letter + number)
+    """
+    return [ct.POSITIONS[idx] for idx in data]
 
 
 def main():
-    import random
+    import sys
+    ct.configure_logging()
     b = Conhex_game()
     while not b.game_won():
-        pos = random.choice(b.free_positions())
+        pos = b.random_free_position()
         print(f'Playing {pos=} for {str(b.current_player)}')
         b.play_move(pos)
 
     print(f'The game is won by {b.winner}')
     print(b)
 
-    b.load('/Users/agtoever/Downloads/game2312755.txt')
-    print(b)
+    # Optionally load and print a game in LittleGolem format
+    if len(sys.argv) > 1:
+        b.load(sys.argv[1])
+        print(b)
 
 
 if __name__ == "__main__":
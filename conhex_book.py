@@ -0,0 +1,239 @@
+import argparse
+import collections
+import constants as ct
+import hashlib
+import logging
+import mmap
+import struct
+import sys
+import typing
+from conhex_bitboard import Conhex_bitboard
+from conhex_board import Conhex_game
+from conhex_symmetry import canonical_form
+
+
+#
+# Opening book file: BOOK_HEADER (magic, number of slots, number of
+# entries) followed by an open addressing hash table of BOOK_ENTRY slots,
+# keyed by the canonical key of a position (see conhex_symmetry). A slot
+# holds the canonical key, the book move (index in ct.POSITIONS, of the
+# canonical representative) and how often it was played and won. Empty
+# slots have 0 games. The number of slots is a power of two, at least twice
+# the number of entries, so a lookup probes a few slots on average.
+#
+BOOK_MAGIC = b'CHXBOOK1'
+BOOK_HEADER = struct.Struct('<8sII')
+KEY_BYTES = (2 * len(ct.POSITIONS) + 2 * len(ct.CELLS) + 1 + 7) // 8
+BOOK_ENTRY = struct.Struct(f'<{KEY_BYTES}sBII')
+
+
+class Book_move(typing.NamedTuple):
+    """Move of the opening book for a position"""
+    move: str
+    games: int      # number of games in which the move was played
+    wins: int       # number of those won by the player that moved
+
+
+def book_slot(key_bytes: bytes, slots: int) -> int:
+    """Gives the first slot to probe for a canonical key
+
+    Args:
+        key_bytes (bytes): canonical key, KEY_BYTES little endian bytes
+        slots (int): number of slots of the table (a power of two)
+
+    Returns:
+        int: slot index
+    """
+    digest = hashlib.blake2b(key_bytes, digest_size=8).digest()
+    return int.from_bytes(digest, 'little') & (slots - 1)
+
+
+def collect_statistics(games: typing.Iterable, depth: int = 12) -> dict:
+    """Aggregates how often every move was played and won in the first
+    moves of games, per symmetry-reduced position
+
+    Args:
+        games (typing.Iterable): tuples of winner (ct.BoardPosValue) and
+                                 list of moves
+        depth (int): number of moves of each game to aggregate
+
+    Returns:
+        dict: canonical key -> canonical move index -> [games, wins], where
+              wins counts the games won by the player that moved
+    """
+    statistics = collections.defaultdict(
+        lambda: collections.defaultdict(lambda: [0, 0]))
+    for winner, moves in games:
+        game = Conhex_bitboard()
+        for move in moves[:depth]:
+            key, symmetry = canonical_form(game)
+            counts = statistics[key][
+                ct.POSITION_INDEX[symmetry.positions[move]]]
+            counts[0] += 1
+            counts[1] += winner is game.current_player
+            game.play_move(move)
+    return statistics
+
+
+def write_book(filename: str, statistics: dict, min_games: int = 5) -> int:
+    """Writes an opening book with the best move of every position
+
+    The book move of a position is the move with the highest win rate of
+    the moves played in at least min_games games; positions without such
+    a move are left out.
+
+    Args:
+        filename (str): name of the book file to write
+        statistics (dict): move statistics, as given by collect_statistics
+        min_games (int): number of games a move needs to be in the book
+
+    Returns:
+        int: number of positions in the book
+    """
+    entries = []
+    for key, moves in statistics.items():
+        candidates = [(wins / games, games, wins, move)
+                      for move, (games, wins) in moves.items()
+                      if games >= min_games]
+        if candidates:
+            _, games, wins, move = max(candidates)
+            entries.append((key.to_bytes(KEY_BYTES, 'little'), move, games,
+                            wins))
+
+    slots = 1
+    while slots < 2 * len(entries):
+        slots *= 2
+    table = bytearray(slots * BOOK_ENTRY.size)
+    for key_bytes, move, games, wins in entries:
+        slot = book_slot(key_bytes, slots)
+        while BOOK_ENTRY.unpack_from(table, slot * BOOK_ENTRY.size)[2]:
+            slot = (slot + 1) & (slots - 1)
+        BOOK_ENTRY.pack_into(table, slot * BOOK_ENTRY.size, key_bytes, move,
+                             games, wins)
+
+    with open(filename, 'wb') as file:
+        file.write(BOOK_HEADER.pack(BOOK_MAGIC, slots, len(entries)))
+        file.write(table)
+    return len(entries)
+
+
+class Opening_book:
+    """Read-only opening book, memory-mapped from a book file
+
+    Opening a book doesn't read the table; a lookup reads a few slots of
+    the mapped file.
+    """
+
+    def __init__(self, filename: str) -> None:
+        """Maps a book file written by write_book
+
+        Args:
+            filename (str): name of the book file
+
+        Raises:
+            ValueError: if the file is not an opening book
+        """
+        self.logger = logging.getLogger(ct.LOGGER)
+        with open(filename, 'rb') as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, self.slots, self.entries = (
+            BOOK_HEADER.unpack_from(self._map)
+            if len(self._map) >= BOOK_HEADER.size else (None, 0, 0))
+        if (magic != BOOK_MAGIC or len(self._map) !=
+                BOOK_HEADER.size + self.slots * BOOK_ENTRY.size):
+            self._map.close()
+            raise ValueError(f'{filename} is not an opening book')
+        self.logger.info(f'Opened book {filename} with {self.entries} '
+                         f'positions')
+
+    def lookup(self, game: Conhex_game) -> Book_move:
+        """Gives the book move for the position of game
+
+        Args:
+            game (Conhex_game): position to look up
+
+        Returns:
+            Book_move: the book move; None if the position isn't in the book
+        """
+        if not self.entries:
+            return None
+
+        key, symmetry = canonical_form(game)
+        key_bytes = key.to_bytes(KEY_BYTES, 'little')
+        slot = book_slot(key_bytes, self.slots)
+        while True:
+            slot_key, move, games, wins = BOOK_ENTRY.unpack_from(
+                self._map, BOOK_HEADER.size + slot * BOOK_ENTRY.size)
+            if not games:
+                return None
+            if slot_key == key_bytes:
+                return Book_move(
+                    symmetry.inverse_positions[ct.POSITIONS[move]], games,
+                    wins)
+            slot = (slot + 1) & (self.slots - 1)
+
+    def __len__(self) -> int:
+        return self.entries
+
+    def close(self) -> None:
+        """Unmaps the book file
+        """
+        self._map.close()
+
+    def __enter__(self) -> 'Opening_book':
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+
+def iter_sources(stores: list, selfplay: list) -> tuple:
+    """Gives the games of game stores and self-play results files
+
+    Args:
+        stores (list): names of game stores (see conhex_store)
+        selfplay (list): names of results files of conhex_selfplay
+
+    Yields:
+        tuple: winner (ct.BoardPosValue) and list of moves of each game
+    """
+    # Only imported here: reading game stores needs NumPy
+    from conhex_selfplay import read_results
+    from conhex_store import read_game_store
+    for filename in stores:
+        for _, winner, moves in read_game_store(filename):
+            yield winner, moves
+    for filename in selfplay:
+        for _, winner, moves in read_results(filename):
+            yield winner, moves
+
+
+def main():
+    """Builds an opening book from game stores and self-play results
+    """
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('book', help='opening book file to write')
+    parser.add_argument('--store', nargs='+', default=[],
+                        help='game stores of imported games')
+    parser.add_argument('--selfplay', nargs='+', default=[],
+                        help='results files of conhex_selfplay.py')
+    parser.add_argument('--depth', type=int, default=12,
+                        help='number of moves per game to put in the book')
+    parser.add_argument('--min-games', type=int, default=5,
+                        help='number of games a book move needs')
+    args = parser.parse_args()
+    ct.configure_logging()
+
+    statistics = collect_statistics(iter_sources(args.store, args.selfplay),
+                                    args.depth)
+    entries = write_book(args.book, statistics, args.min_games)
+    print(f'Wrote {entries} of {len(statistics)} positions to {args.book}',
+          file=sys.stderr)
+
+    with Opening_book(args.book) as book:
+        print(f'Book move of the empty board: {book.lookup(Conhex_game())}')
+
+
+if __name__ == "__main__":
+    main()
@@ -1,2 +1,454 @@
+import concurrent.futures
+import constants as ct
+import logging
+import math
+import os
+import random
+import time
+from conhex_bitboard import Conhex_bitboard
+from conhex_board import Conhex_game, bytes_to_moves, moves_to_bytes
+from conhex_solver import Proof_number_solver
+
+
+class Search_node:
+    """Node of the Monte Carlo search tree
+    """
+    __slots__ = ('move', 'player', 'parent', 'children', 'untried',
+                 'visits', 'wins')
+
+    def __init__(self, move: str, player: ct.BoardPosValue,
+                 parent: 'Search_node', untried: list) -> None:
+        """Initializes a node without statistics
+
+        Args:
+            move (str): move leading to this node (None for the root)
+            player (ct.BoardPosValue): player that played move
+            parent (Search_node): parent node (None for the root)
+            untried (list): moves that are not expanded yet
+        """
+        self.move = move
+        self.player = player
+        self.parent = parent
+        self.children = {}
+        self.untried = untried
+        self.visits = 0
+        self.wins = 0.0
+
+    def select_child(self, exploration: float) -> 'Search_node':
+        """Selects the child with the highest UCT value
+
+        Args:
+            exploration (float): UCT exploration constant
+
+        Returns:
+            Search_node: the selected child
+        """
+        log_visits = math.log(self.visits)
+        return max(self.children.values(),
+                   key=lambda child: (child.wins / child.visits +
+                                      exploration *
+                                      math.sqrt(log_visits / child.visits)))
+
+    def best_child(self) -> 'Search_node':
+        """Gives the most visited child; None if there are no children"""
+        if not self.children:
+            return None
+        return max(self.children.values(), key=lambda child: child.visits)
+
+    def subtree_size(self) -> int:
+        """Counts the nodes in the subtree rooted at this node"""
+        size, stack = 0, [self]
+        while stack:
+            node = stack.pop()
+            size += 1
+            stack.extend(node.children.values())
+        return size
+
+
 class ConHex_Bot:
-    raise NotImplementedError
+    """Monte Carlo Tree Search (UCT) player for ConHex
+
+    The bot searches from the position of a Conhex_game within a time and/or
+    playout budget and returns a move string accepted by play_move. The
+    search tree is kept between moves: when called again on the same game,
+    the subtree of the moves played in between is reused.
+
+    With more than one worker, the bot uses root parallelisation: every
+    worker process searches its own tree from the same position and the
+    visit counts of the root moves are merged. Worker trees are not reused.
+    """
+
+    def __init__(self, time_limit: float = 1.0, playouts: int = None,
+                 exploration: float = 1.4, seed: int = None,
+                 workers: int = 1, book: object = None,
+                 solve_below: int = 20) -> None:
+        """Initializes the bot
+
+        Args:
+            time_limit (float): maximum search time per move in seconds;
+                                None for no time limit
+            playouts (int): maximum number of playouts per move;
+                            None for no playout limit
+            exploration (float): UCT exploration constant
+            seed (int): seed for the random playouts
+            workers (int): number of worker processes to search with
+            book (object): conhex_book.Opening_book to play book moves
+                           from without searching; None for no book
+            solve_below (int): number of free positions from which the bot
+                               first tries to solve the position exactly,
+                               with half the time and the playout budget as
+                               node budget; 0 to never solve
+
+        Raises:
+            ValueError: if neither time_limit nor playouts is given
+        """
+        if time_limit is None and playouts is None:
+            raise ValueError('Give a time_limit and/or a playouts budget.')
+
+        self.logger = logging.getLogger(ct.LOGGER)
+        self.logger.info(f'Started logger for {self.__class__.__name__}')
+        self.time_limit = time_limit
+        self.playouts = playouts
+        self.exploration = exploration
+        self.random = random.Random(seed)
+        self.workers = workers
+        self.book = book
+        self.solve_below = solve_below
+        self.solver = (Proof_number_solver(1 << 18) if solve_below
+                       else None)
+        self.statistics = {}
+        self._root = None
+        self._root_moves = []
+        self._executor = None
+
+    def get_move(self, game: Conhex_game) -> str:
+        """Searches the best move for the current player of game
+
+        Args:
+            game (Conhex_game): game to find a move for; it is not changed
+
+        Returns:
+            str: the best move found
+
+        Raises:
+            ValueError: if the game is already won or the board is full
+        """
+        # The book, solver and search share the time budget of the move
+        deadline = (None if self.time_limit is None
+                    else time.perf_counter() + self.time_limit)
+        board = Conhex_bitboard()
+        for move in game.moves:
+            board.play_move(move)
+
+        if board.game_won() or not board.free_positions_view():
+            raise ValueError('There are no moves to play in this game.')
+
+        book_move = self.book.lookup(board) if self.book else None
+        if book_move:
+            self.statistics = {
+                'book_move': book_move.move,
+                'book_games': book_move.games,
+                'book_win_rate': book_move.wins / book_move.games,
+            }
+            self.logger.info(f'Book move: {self.statistics}')
+            return book_move.move
+
+        if len(board.free_positions_view()) <= self.solve_below:
+            # The solver gets half of the time that is left
+            result = self.solver.solve(
+                board, self.playouts,
+                None if deadline is None
+                else max(deadline - time.perf_counter(), 0.0) / 2)
+            if result.move is not None:
+                self.statistics = {
+                    'solved_winner': str(result.winner),
+                    'proof_size': result.proof_size,
+                    'solver_nodes': result.nodes,
+                }
+                self.logger.info(f'Solved: {self.statistics}')
+                return result.move
+
+        if self.workers > 1:
+            return self._get_move_parallel(board, deadline)
+
+        root = self._reuse_root(board)
+        start = time.perf_counter()
+        playouts = 0
+        # At least one playout, so there is a move if the solver used up
+        # the time
+        while not playouts or (
+                (self.playouts is None or playouts < self.playouts) and
+                (deadline is None or time.perf_counter() < deadline)):
+            self._search(root, board)
+            playouts += 1
+
+        elapsed = time.perf_counter() - start
+        self.statistics = {
+            'playouts': playouts,
+            'playouts_per_second': playouts / elapsed if elapsed else 0.0,
+            'root_visits': root.visits,
+            'tree_size': root.subtree_size(),
+            'principal_variation': self.principal_variation(),
+        }
+        self.logger.info(f'Search statistics: {self.statistics}')
+        return root.best_child().move
+
+    def _get_move_parallel(self, board: Conhex_bitboard,
+                           deadline: float) -> str:
+        """Searches the best move with one tree per worker process and
+        merges the statistics of the root moves
+
+        Args:
+            board (Conhex_bitboard): position to search
+            deadline (float): time.perf_counter() time at which the search
+                              ends; None for no time limit
+
+        Returns:
+            str: the move with the most merged visits
+        """
+        if self._executor is None:
+            self._executor = concurrent.futures.ProcessPoolExecutor(
+                self.workers)
+
+        # Workers get the moves as bytes instead of a pickled game
+        data = moves_to_bytes(board.moves)
+        playouts = (None if self.playouts is None
+                    else -(-self.playouts // self.workers))
+        start = time.perf_counter()
+        time_limit = (None if deadline is None
+                      else max(deadline - start, 0.0))
+        futures = [self._executor.submit(_search_worker, data,
+                                         time_limit, playouts,
+                                         self.exploration,
+                                         self.random.getrandbits(32))
+                   for _ in range(self.workers)]
+        results = [future.result() for future in futures]
+        elapsed = time.perf_counter() - start
+
+        visits = {}
+        for children, _, _ in results:
+            for move, (move_visits, _) in children.items():
+                visits[move] = visits.get(move, 0) + move_visits
+        best_move = max(visits, key=visits.get)
+
+        # Take the rest of the line from the worker that searched it most
+        _, _, variation = max(
+            results, key=lambda result: result[0].get(best_move, (0, 0))[0])
+        playouts = sum(result[1]['playouts'] for result in results)
+        self._root = None
+        self.statistics = {
+            'playouts': playouts,
+            'playouts_per_second': playouts / elapsed if elapsed else 0.0,
+            'root_visits': sum(result[1]['root_visits']
+                               for result in results),
+            'tree_size': sum(result[1]['tree_size'] for result in results),
+            'principal_variation': ([best_move] + variation[1:]
+                                    if variation[:1] == [best_move]
+                                    else [best_move]),
+            'workers': self.workers,
+        }
+        self.logger.info(f'Search statistics: {self.statistics}')
+        return best_move
+
+    def close(self) -> None:
+        """Shuts down the worker processes, if any
+        """
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def principal_variation(self) -> list:
+        """Gives the most visited line of play of the current search tree
+
+        Returns:
+            list: moves of the principal variation
+        """
+        result = []
+        node = self._root.best_child() if self._root else None
+        while node is not None:
+            result.append(node.move)
+            node = node.best_child()
+        return result
+
+    def _reuse_root(self, board: Conhex_bitboard) -> Search_node:
+        """Makes the node of the board's position the root of the tree,
+        keeping its subtree if it was searched before
+
+        Args:
+            board (Conhex_bitboard): position to search
+
+        Returns:
+            Search_node: the new root
+        """
+        node = None
+        if (self._root is not None and
+                board.moves[:len(self._root_moves)] == self._root_moves):
+            node = self._root
+            for move in board.moves[len(self._root_moves):]:
+                node = node.children.get(move)
+                if node is None:
+                    break
+
+        if node is None:
+            self.logger.debug('Starting a new search tree')
+            # The root's player is the one that played the last move
+            board.next_player()
+            node = Search_node(None, board.current_player, None,
+                               board.free_positions())
+            board.next_player()
+        else:
+            self.logger.debug(f'Reusing search tree of {node.visits} visits')
+            node.parent = None
+            node.move = None
+
+        self._root = node
+        self._root_moves = list(board.moves)
+        return node
+
+    def _search(self, root: Search_node, board: Conhex_bitboard) -> None:
+        """Runs one selection, expansion, playout and backpropagation step
+        and restores board afterwards
+
+        Args:
+            root (Search_node): root of the search tree
+            board (Conhex_bitboard): position of the root
+        """
+        node = root
+        depth = 0
+
+        # Selection
+        while not node.untried and node.children:
+            node = node.select_child(self.exploration)
+            board.play_move(node.move)
+            depth += 1
+
+        # Expansion
+        if node.untried:
+            move = node.untried.pop(self.random.randrange(len(node.untried)))
+            player = board.current_player
+            board.play_move(move)
+            depth += 1
+            child = Search_node(move, player, node,
+                                [] if board.game_won()
+                                else board.free_positions())
+            node.children[move] = child
+            node = child
+
+        # Playout: playing the free positions in random order is the same
+        # as picking a random free position each move
+        moves = board.free_positions()
+        self.random.shuffle(moves)
+        for move in moves:
+            if board.game_won():
+                break
+            board.play_move(move)
+            depth += 1
+        winner = board.winner
+
+        for _ in range(depth):
+            board.undo_move()
+
+        # Backpropagation; a full board without a winner counts as a draw
+        while node is not None:
+            node.visits += 1
+            if winner is node.player:
+                node.wins += 1
+            elif winner is ct.BoardPosValue.EMPTY:
+                node.wins += 0.5
+            node = node.parent
+
+
+def _search_worker(data: bytes, time_limit: float, playouts: int,
+                   exploration: float, seed: int) -> tuple:
+    """Searches a position in a worker process
+
+    Args:
+        data (bytes): moves of the game, encoded by moves_to_bytes
+        time_limit (float): maximum search time in seconds
+        playouts (int): maximum number of playouts
+        exploration (float): UCT exploration constant
+        seed (int): seed for the random playouts
+
+    Returns:
+        tuple: dict of root move -> (visits, wins), the search statistics
+               and the principal variation
+    """
+    board = Conhex_bitboard()
+    for move in bytes_to_moves(data):
+        board.play_move(move)
+
+    # The parent already tried to solve the position
+    bot = ConHex_Bot(time_limit, playouts, exploration, seed, solve_below=0)
+    bot.get_move(board)
+    children = {move: (child.visits, child.wins)
+                for move, child in bot._root.children.items()}
+    return children, bot.statistics, bot.statistics['principal_variation']
+
+
+def benchmark_parallel(worker_counts: list, time_limit: float) -> dict:
+    """Measures the playouts per second from the empty board for several
+    numbers of worker processes
+
+    Args:
+        worker_counts (list): numbers of workers to measure
+        time_limit (float): search time per measurement in seconds
+
+    Returns:
+        dict: number of workers -> playouts per second
+    """
+    results = {}
+    for workers in worker_counts:
+        bot = ConHex_Bot(time_limit=time_limit, seed=0, workers=workers)
+        bot.get_move(Conhex_game())  # warm up the worker processes
+        bot.get_move(Conhex_game())
+        results[workers] = bot.statistics['playouts_per_second']
+        bot.close()
+        print(f'{workers=:3d}: {results[workers]:10.0f} playouts/s '
+              f'({results[workers] / results[worker_counts[0]]:.2f}x)')
+    return results
+
+
+def main():
+    """Plays the bot against itself and prints the search statistics, or
+    benchmarks the parallel search with --benchmark
+    """
+    import argparse
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('--time', type=float, default=1.0,
+                        help='search time per move in seconds')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='number of worker processes')
+    parser.add_argument('--benchmark', action='store_true',
+                        help='measure playouts/s for 1, 2, 4, ... workers '
+                             'up to --workers (default: all cores)')
+    parser.add_argument('--book', help='opening book file to play from')
+    args = parser.parse_args()
+    ct.configure_logging()
+
+    if args.benchmark:
+        max_workers = (args.workers if args.workers > 1
+                       else os.cpu_count() or 1)
+        counts = [2 ** i for i in range(max_workers.bit_length())]
+        if counts[-1] != max_workers:
+            counts.append(max_workers)
+        benchmark_parallel(counts, args.time)
+        return
+
+    game = Conhex_game()
+    book = None
+    if args.book:
+        from conhex_book import Opening_book
+        book = Opening_book(args.book)
+    bot = ConHex_Bot(time_limit=args.time, workers=args.workers, book=book)
+    while not game.game_won() and game.free_positions_view():
+        move = bot.get_move(game)
+        print(f'{str(game.current_player)} plays {move}: {bot.statistics}')
+        game.play_move(move)
+    bot.close()
+
+    print(f'The game is won by {game.winner}')
+    print(game)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+import argparse
+import asyncio
+import constants as ct
+import itertools
+import json
+import logging
+import random
+import statistics
+import time
+from conhex_server import DEFAULT_HOST, DEFAULT_PORT, POSITION_CHARS
+
+
+class Game_client:
+    """Client of a conhex_server.Game_server
+
+    Requests are sent over one connection; many coroutines can send
+    requests at the same time and every one gets its own response.
+    """
+
+    def __init__(self, reader: asyncio.StreamReader,
+                 writer: asyncio.StreamWriter) -> None:
+        """Initializes a client on an open connection; see connect
+
+        Args:
+            reader (asyncio.StreamReader): stream of the responses
+            writer (asyncio.StreamWriter): stream for the requests
+        """
+        self.logger = logging.getLogger(ct.LOGGER)
+        self._reader = reader
+        self._writer = writer
+        self._request_ids = itertools.count(1)
+        self._pending = {}  # request id -> future of the response
+        self._receiver = asyncio.create_task(self._receive())
+
+    @classmethod
+    async def connect(cls, host: str = DEFAULT_HOST,
+                      port: int = DEFAULT_PORT) -> 'Game_client':
+        """Connects to a server
+
+        Args:
+            host (str): address of the server
+            port (int): port of the server
+
+        Returns:
+            Game_client: the connected client
+        """
+        reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def _receive(self) -> None:
+        """Hands the responses to the requests that wait for them"""
+        try:
+            while line := await self._reader.readline():
+                response = json.loads(line)
+                future = self._pending.pop(response.get('id'), None)
+                if future is not None and not future.done():
+                    future.set_result(response)
+        finally:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(
+                        ConnectionError('The server closed the connection'))
+            self._pending.clear()
+
+    async def request(self, op: str, **fields) -> dict:
+        """Sends a request and waits for its response
+
+        Args:
+            op (str): operation, e.g. 'new' or 'move'
+            **fields: the other fields of the request
+
+        Returns:
+            dict: the response
+
+        Raises:
+            ValueError: if the server refused the request
+            ConnectionError: if the connection is closed
+        """
+        if self._receiver.done():
+            raise ConnectionError('The connection is closed')
+        request_id = next(self._request_ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        self._writer.write(json.dumps({'id': request_id, 'op': op,
+                                       **fields}).encode() + b'\n')
+        await self._writer.drain()
+        response = await future
+        if not response['ok']:
+            raise ValueError(response['error'])
+        return response
+
+    async def close(self) -> None:
+        """Closes the connection
+        """
+        self._writer.close()
+        await self._writer.wait_closed()
+        await asyncio.gather(self._receiver, return_exceptions=True)
+
+
+def latency_summary(latencies: list) -> dict:
+    """Summarizes latencies
+
+    Args:
+        latencies (list): latencies in seconds
+
+    Returns:
+        dict: count and the mean, 50th, 90th, 99th percentile and maximum
+              latency in milliseconds
+    """
+    if not latencies:
+        return {'count': 0}
+    if len(latencies) > 1:
+        percentiles = statistics.quantiles(latencies, n=100,
+                                           method='inclusive')
+    else:
+        percentiles = latencies * 99
+    return {'count': len(latencies),
+            'mean_ms': statistics.fmean(latencies) * 1000,
+            'p50_ms': percentiles[49] * 1000,
+            'p90_ms': percentiles[89] * 1000,
+            'p99_ms': percentiles[98] * 1000,
+            'max_ms': max(latencies) * 1000}
+
+
+async def play_random_game(client: Game_client, bot: str, rng: random.Random,
+                           latencies: dict) -> str:
+    """Plays a game with random moves against the bot, or against itself
+    if bot is None, and closes it
+
+    Args:
+        client (Game_client): connected client
+        bot (str): player the bot plays, e.g. 'PLAYER2'; None for no bot
+        rng (random.Random): random generator for the moves
+        latencies (dict): op -> list, the latencies of the requests are
+                          appended to
+
+    Returns:
+        str: name of the winner
+    """
+    async def timed(op: str, **fields) -> dict:
+        start = time.perf_counter()
+        response = await client.request(op, **fields)
+        latencies.setdefault(op, []).append(time.perf_counter() - start)
+        return response
+
+    empty = POSITION_CHARS[ct.BoardPosValue.EMPTY]
+    state = await timed('new', bot=bot)
+    game_id = state['game']
+    while state['winner'] == ct.BoardPosValue.EMPTY.name:
+        free = [pos for pos, char in zip(ct.POSITIONS, state['board'])
+                if char == empty]
+        if not free:
+            break
+        state = await timed('move', game=game_id, move=rng.choice(free))
+    await timed('close', game=game_id)
+    return state['winner']
+
+
+async def load_test(host: str, port: int, games: int, concurrency: int,
+                    connections: int, bot: str = None,
+                    seed: int = None) -> dict:
+    """Plays random games on a server, many at the same time, and measures
+    the latency of the requests
+
+    Args:
+        host (str): address of the server
+        port (int): port of the server
+        games (int): number of games to play
+        concurrency (int): number of games played at the same time
+        connections (int): number of connections the games are spread over
+        bot (str): player the bot plays, e.g. 'PLAYER2'; None for no bot
+        seed (int): random seed for the moves
+
+    Returns:
+        dict: games, errors, seconds, requests per second and the
+              latency_summary of each op
+    """
+    clients = [await Game_client.connect(host, port)
+               for _ in range(connections)]
+    rng = random.Random(seed)
+    latencies = {}
+    errors = 0
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def play(number: int) -> None:
+        nonlocal errors
+        async with semaphore:
+            try:
+                await play_random_game(clients[number % connections], bot,
+                                       random.Random(rng.getrandbits(32)),
+                                       latencies)
+            except (ValueError, ConnectionError) as error:
+                logging.getLogger(ct.LOGGER).warning(f'Game {number}: {error}')
+                errors += 1
+
+    start = time.perf_counter()
+    try:
+        await asyncio.gather(*(play(number) for number in range(games)))
+    finally:
+        for client in clients:
+            await client.close()
+    elapsed = time.perf_counter() - start
+
+    return {'games': games,
+            'errors': errors,
+            'seconds': elapsed,
+            'requests_per_second': (sum(map(len, latencies.values()))
+                                    / elapsed),
+            'latency': {op: latency_summary(op_latencies)
+                        for op, op_latencies in latencies.items()}}
+
+
+def main():
+    """Load-tests a game server with many concurrent random games and
+    prints the latency percentiles of the requests
+    """
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('--host', default=DEFAULT_HOST,
+                        help='address of the server')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT,
+                        help='port of the server')
+    parser.add_argument('--games', type=int, default=1000,
+                        help='number of games to play')
+    parser.add_argument('--concurrency', type=int, default=100,
+                        help='number of games played at the same time')
+    parser.add_argument('--connections', type=int, default=10,
+                        help='number of connections to the server')
+    parser.add_argument('--bot', choices=('PLAYER1', 'PLAYER2'),
+                        help='let the bot play this player')
+    parser.add_argument('--seed', type=int, default=None,
+                        help='random seed for the moves')
+    args = parser.parse_args()
+    ct.configure_logging()
+
+    result = asyncio.run(load_test(args.host, args.port, args.games,
+                                   args.concurrency, args.connections,
+                                   args.bot, args.seed))
+    print(f"{result['games']} games ({result['errors']} failed) in "
+          f"{result['seconds']:.1f} s, "
+          f"{result['requests_per_second']:.0f} requests/s")
+    for op, summary in result['latency'].items():
+        if summary['count']:
+            print(f"{op:6s} {summary['count']:8d} requests  "
+                  f"p50 {summary['p50_ms']:7.2f} ms  "
+                  f"p90 {summary['p90_ms']:7.2f} ms  "
+                  f"p99 {summary['p99_ms']:7.2f} ms  "
+                  f"max {summary['max_ms']:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,329 @@
+import argparse
+import constants as ct
+import glob
+import itertools
+import logging
+import multiprocessing
+import numpy as np
+import os
+import sys
+import time
+import typing
+from conhex_bitboard import Conhex_bitboard
+from conhex_book import iter_sources
+from conhex_features import (CELL_COUNT, FEATURE_SIZE, PLAYER1_CELLS,
+                             PLAYER1_POSITIONS, PLAYER2_CELLS,
+                             PLAYER2_POSITIONS, POSITION_COUNT, SIDE_TO_MOVE,
+                             Position_masks, encode_masks)
+from conhex_symmetry import SYMMETRIES, Symmetry
+
+
+#
+# Training data: every position of a game, before each move, as an example
+# of the features of the position (see conhex_features), the move played
+# (index in ct.POSITIONS, the policy target) and the result for the player
+# to move (1 won, -1 lost, 0 no winner; the value target).
+#
+# Examples are written to a directory as shards of three .npy files each:
+#   shard-00000.features.npy    (n, FEATURE_SIZE) uint8
+#   shard-00000.moves.npy       (n, ) int16
+#   shard-00000.values.npy      (n, ) int8
+# so they can be memory-mapped when they are read.
+#
+SHARD_PATTERN = 'shard-{:05d}.{}.npy'
+SHARD_ARRAYS = ('features', 'moves', 'values')
+
+
+class Examples(typing.NamedTuple):
+    """Training examples as arrays"""
+    features: np.ndarray    # (n, FEATURE_SIZE) features
+    moves: np.ndarray       # (n, ) index in ct.POSITIONS of the move played
+    values: np.ndarray      # (n, ) result for the player to move
+
+
+def encode_examples(games: typing.Iterable) -> Examples:
+    """Replays games and encodes all their positions in one batch
+
+    Args:
+        games (typing.Iterable): winner (ct.BoardPosValue) and list of moves
+                                 of each game
+
+    Returns:
+        Examples: the examples, with uint8 features, int16 moves and int8
+                  values
+    """
+    player1, player2 = ct.BoardPosValue.PLAYER1, ct.BoardPosValue.PLAYER2
+    masks = []
+    moves = []
+    values = []
+    for winner, game_moves in games:
+        board = Conhex_bitboard()
+        for move in game_moves:
+            masks.append(Position_masks(
+                board._positions[player1], board._positions[player2],
+                board._cells[player1], board._cells[player2],
+                board.current_player is player2))
+            moves.append(ct.POSITION_INDEX[move])
+            values.append(0 if winner is ct.BoardPosValue.EMPTY
+                          else 1 if winner is board.current_player else -1)
+            board.play_move(move)
+
+    features = np.empty((len(masks), FEATURE_SIZE), dtype=np.uint8)
+    return Examples(encode_masks(masks, features),
+                    np.array(moves, dtype=np.int16),
+                    np.array(values, dtype=np.int8))
+
+
+def _encode_task(games: list) -> Examples:
+    """Encodes a chunk of games in a worker process (see encode_examples)
+    """
+    return encode_examples(games)
+
+
+class Symmetry_permutation(typing.NamedTuple):
+    """A board symmetry as permutations of the features and moves. Column
+    j of the features of an image is column columns[j] of the original."""
+    columns: np.ndarray     # (FEATURE_SIZE, ) column of the original
+    moves: np.ndarray       # move i maps to move moves[i]
+    swaps_colours: bool     # the side to move flips
+
+
+def symmetry_permutation(symmetry: Symmetry) -> Symmetry_permutation:
+    """Gives the permutations of the features and moves of a symmetry
+
+    Args:
+        symmetry (Symmetry): a board symmetry of conhex_symmetry
+
+    Returns:
+        Symmetry_permutation: the permutations
+    """
+    positions = np.array([ct.POSITION_INDEX[symmetry.positions[pos]]
+                          for pos in ct.POSITIONS])
+    cell_index = {cell: idx for idx, cell in enumerate(ct.CELLS)}
+    cells = np.array([cell_index[symmetry.cells[cell]] for cell in ct.CELLS])
+
+    # Players' planes of the image come from the (swapped) original planes
+    position_planes = (PLAYER1_POSITIONS, PLAYER2_POSITIONS)
+    cell_planes = (PLAYER1_CELLS, PLAYER2_CELLS)
+    if symmetry.swaps_colours:
+        position_planes = position_planes[::-1]
+        cell_planes = cell_planes[::-1]
+
+    columns = np.arange(FEATURE_SIZE)
+    for image, original in zip((PLAYER1_POSITIONS, PLAYER2_POSITIONS),
+                               position_planes):
+        columns[image.start + positions] = original.start + np.arange(
+            POSITION_COUNT)
+    for image, original in zip((PLAYER1_CELLS, PLAYER2_CELLS), cell_planes):
+        columns[image.start + cells] = original.start + np.arange(CELL_COUNT)
+    return Symmetry_permutation(columns, positions, symmetry.swaps_colours)
+
+
+SYMMETRY_PERMUTATIONS = [symmetry_permutation(symmetry)
+                         for symmetry in SYMMETRIES]
+
+
+def augment(examples: Examples,
+            permutation: Symmetry_permutation) -> Examples:
+    """Gives the images of examples under a board symmetry. The values are
+    for the player to move, so they don't change.
+
+    Args:
+        examples (Examples): the examples
+        permutation (Symmetry_permutation): the symmetry
+
+    Returns:
+        Examples: the transformed examples, with the same dtypes
+    """
+    features = examples.features[:, permutation.columns]
+    if permutation.swaps_colours:
+        features[:, SIDE_TO_MOVE] = 1 - features[:, SIDE_TO_MOVE]
+    return Examples(features,
+                    permutation.moves[examples.moves].astype(
+                        examples.moves.dtype),
+                    examples.values)
+
+
+def write_shards(games: typing.Iterable, directory: str,
+                 shard_size: int = 1 << 20, symmetries: bool = False,
+                 workers: int = None, chunk_size: int = 256) -> int:
+    """Encodes the positions of games and writes them as shards of
+    training examples
+
+    Args:
+        games (typing.Iterable): winner (ct.BoardPosValue) and list of moves
+                                 of each game
+        directory (str): directory to write the shards to
+        shard_size (int): number of examples per shard (the last shard
+                          can be smaller)
+        symmetries (bool): True to also write the images of every example
+                           under all board symmetries
+        workers (int): number of worker processes; None for all cores
+        chunk_size (int): number of games encoded per task
+
+    Returns:
+        int: number of examples written
+
+    Raises:
+        ValueError: if the directory already has shards
+    """
+    logger = logging.getLogger(ct.LOGGER)
+    os.makedirs(directory, exist_ok=True)
+    if glob.glob(os.path.join(directory, 'shard-*.npy')):
+        raise ValueError(f'{directory} already has shards')
+    pending = []
+    pending_size = 0
+    shards = 0
+    total = 0
+
+    def write(examples: Examples) -> None:
+        nonlocal shards, total
+        for name, array in zip(SHARD_ARRAYS, examples):
+            np.save(os.path.join(directory,
+                                 SHARD_PATTERN.format(shards, name)), array)
+        logger.info(f'Wrote shard {shards} of {len(examples.moves)} examples')
+        shards += 1
+        total += len(examples.moves)
+
+    games = iter(games)
+    chunks = iter(lambda: list(itertools.islice(games, chunk_size)), [])
+    with multiprocessing.Pool(workers) as pool:
+        for examples in pool.imap(_encode_task, chunks):
+            if symmetries:
+                images = [augment(examples, permutation)
+                          for permutation in SYMMETRY_PERMUTATIONS]
+                examples = Examples(*(np.concatenate(arrays)
+                                      for arrays in zip(*images)))
+            pending.append(examples)
+            pending_size += len(examples.moves)
+            while pending_size >= shard_size:
+                merged = Examples(*(np.concatenate(arrays)
+                                    for arrays in zip(*pending)))
+                write(Examples(*(array[:shard_size] for array in merged)))
+                pending = [Examples(*(array[shard_size:]
+                                      for array in merged))]
+                pending_size -= shard_size
+
+    if pending_size:
+        write(Examples(*(np.concatenate(arrays) for arrays in zip(*pending))))
+    return total
+
+
+class Training_data:
+    """Shards of training examples, memory-mapped
+    """
+
+    def __init__(self, directory: str) -> None:
+        """Opens the shards of a directory written by write_shards
+
+        Args:
+            directory (str): the directory
+
+        Raises:
+            ValueError: if the directory has no shards
+        """
+        self.logger = logging.getLogger(ct.LOGGER)
+        count = len(glob.glob(os.path.join(directory,
+                                           'shard-*.features.npy')))
+        if not count:
+            raise ValueError(f'No shards of training examples in {directory}')
+        self.shards = [
+            Examples(*(np.load(os.path.join(directory,
+                                            SHARD_PATTERN.format(idx, name)),
+                               mmap_mode='r')
+                       for name in SHARD_ARRAYS))
+            for idx in range(count)]
+        self.logger.info(f'Opened {count} shards of {len(self)} examples')
+
+    def __len__(self) -> int:
+        return sum(len(shard.moves) for shard in self.shards)
+
+    def batches(self, batch_size: int = 1024, shuffle: bool = True,
+                symmetries: bool = False, seed: int = None) -> Examples:
+        """Reads the examples in batches, once each
+
+        With shuffle, the shards are read in random order and the examples
+        of each shard in random order, so only one shard at a time needs to
+        be in memory.
+
+        Args:
+            batch_size (int): number of examples per batch
+            shuffle (bool): True to read the examples in random order
+            symmetries (bool): True to map every batch by a random board
+                               symmetry (data augmentation)
+            seed (int): random seed
+
+        Yields:
+            Examples: batches with float32 features, int64 moves and
+                      float32 values
+        """
+        rng = np.random.default_rng(seed)
+        order = (rng.permutation(len(self.shards)) if shuffle
+                 else range(len(self.shards)))
+        for shard_idx in order:
+            shard = self.shards[shard_idx]
+            size = len(shard.moves)
+            indices = rng.permutation(size) if shuffle else None
+            for start in range(0, size, batch_size):
+                if shuffle:
+                    # Sorted indices read the memory map front to back
+                    idx = np.sort(indices[start:start + batch_size])
+                    batch = Examples(*(array[idx] for array in shard))
+                else:
+                    batch = Examples(*(np.asarray(array[start:start +
+                                                        batch_size])
+                                       for array in shard))
+                if symmetries:
+                    batch = augment(batch, SYMMETRY_PERMUTATIONS[
+                        rng.integers(len(SYMMETRY_PERMUTATIONS))])
+                yield Examples(batch.features.astype(np.float32),
+                               batch.moves.astype(np.int64),
+                               batch.values.astype(np.float32))
+
+
+def main():
+    """Encodes the positions of imported and self-play games into shards
+    of training examples, or measures how fast the shards are read
+    """
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('directory', help='directory of the shards')
+    parser.add_argument('--store', nargs='+', default=[],
+                        help='game stores of imported games')
+    parser.add_argument('--selfplay', nargs='+', default=[],
+                        help='results files of conhex_selfplay.py')
+    parser.add_argument('--shard-size', type=int, default=1 << 20,
+                        help='number of examples per shard')
+    parser.add_argument('--symmetries', action='store_true',
+                        help='also write the images of every example '
+                             'under all board symmetries')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='number of worker processes (default: all cores)')
+    parser.add_argument('--benchmark', action='store_true',
+                        help='read the shards once in shuffled, augmented '
+                             'batches and print the examples per second')
+    parser.add_argument('--batch-size', type=int, default=1024,
+                        help='batch size of --benchmark')
+    args = parser.parse_args()
+    ct.configure_logging()
+
+    if args.store or args.selfplay:
+        start = time.perf_counter()
+        total = write_shards(iter_sources(args.store, args.selfplay),
+                             args.directory, args.shard_size,
+                             args.symmetries, args.workers)
+        elapsed = time.perf_counter() - start
+        print(f'Wrote {total} examples in {elapsed:.1f} s '
+              f'({total / elapsed:.0f} examples/s)', file=sys.stderr)
+
+    if args.benchmark:
+        data = Training_data(args.directory)
+        start = time.perf_counter()
+        total = sum(len(batch.moves) for batch in data.batches(
+            args.batch_size, symmetries=True))
+        elapsed = time.perf_counter() - start
+        print(f'Read {total} examples in {elapsed:.2f} s '
+              f'({total / elapsed:.0f} examples/s)')
+
+
+if __name__ == "__main__":
+    main()
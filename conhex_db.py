@@ -0,0 +1,291 @@
+import argparse
+import constants as ct
+import logging
+import sqlite3
+import sys
+import time
+import typing
+from conhex_bitboard import Conhex_bitboard
+from conhex_board import Conhex_game, bytes_to_moves, moves_to_bytes
+from conhex_store import read_game_store
+
+
+#
+# Game database: an SQLite file with every game and, for every position
+# reached in a game, a row keyed by the Zobrist hash of the position. The
+# positions table is clustered on the hash, so all games that reached a
+# position are read with one index range scan. Games are indexed on their
+# moves (one byte per move, see moves_to_bytes), so the games that start
+# with a move prefix are a range scan as well.
+#
+# The moves played from a position are counted when games are added, one
+# row per position and next move, so next_moves reads a few rows however
+# many games reached the position. Games that end in a position count as
+# next move END_OF_GAME.
+#
+END_OF_GAME = -1
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    player1 TEXT NOT NULL,
+    player2 TEXT NOT NULL,
+    winner INTEGER NOT NULL,
+    moves BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS games_moves ON games (moves);
+CREATE TABLE IF NOT EXISTS positions (
+    hash INTEGER NOT NULL,
+    game INTEGER NOT NULL,
+    ply INTEGER NOT NULL,
+    next INTEGER,
+    winner INTEGER NOT NULL,
+    PRIMARY KEY (hash, game)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS next_moves (
+    hash INTEGER NOT NULL,
+    next INTEGER NOT NULL,
+    games INTEGER NOT NULL,
+    wins INTEGER NOT NULL,
+    PRIMARY KEY (hash, next)
+) WITHOUT ROWID;
+'''
+
+# Counts the next moves of the positions table, for databases made before
+# the next_moves table; PLAYER1 moves at even plies
+COUNT_NEXT_MOVES = f'''
+INSERT INTO next_moves
+SELECT hash, COALESCE(next, {END_OF_GAME}), COUNT(*),
+       SUM(winner = CASE ply % 2 WHEN 0 THEN ? ELSE ? END)
+FROM positions GROUP BY hash, next
+'''
+
+
+class Next_move(typing.NamedTuple):
+    """Statistics of a move played from a position in the database"""
+    move: str           # None for games that ended in the position
+    games: int          # number of games in which the move was played
+    wins: int           # number of those won by the player that moved
+    win_rate: float     # wins / games
+
+
+def sql_hash(key: int) -> int:
+    """Converts an unsigned 64 bit hash to the signed integers of SQLite
+
+    Args:
+        key (int): Zobrist hash
+
+    Returns:
+        int: key as signed 64 bit integer
+    """
+    return key - (1 << 64) if key >= 1 << 63 else key
+
+
+class Game_database:
+    """Database of games, indexed by position and by move prefix
+    """
+
+    def __init__(self, filename: str) -> None:
+        """Opens (or creates) a game database
+
+        Args:
+            filename (str): name of the SQLite file
+        """
+        self.logger = logging.getLogger(ct.LOGGER)
+        self.connection = sqlite3.connect(filename)
+        counted = self.connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'next_moves'").fetchone()
+        self.connection.executescript(SCHEMA)
+        if not counted:
+            with self.connection:
+                self.connection.execute(COUNT_NEXT_MOVES, (
+                    ct.WINNER_CODES[ct.BoardPosValue.PLAYER1],
+                    ct.WINNER_CODES[ct.BoardPosValue.PLAYER2]))
+
+    def add_games(self, games: typing.Iterable) -> int:
+        """Replays games and adds them and their positions to the database,
+        in one transaction
+
+        Args:
+            games (typing.Iterable): tuples of player names (2 str), winner
+                                     (ct.BoardPosValue) and moves (list, or
+                                     bytes as given by moves_to_bytes)
+
+        Returns:
+            int: number of games added
+        """
+        count = 0
+        with self.connection:
+            cursor = self.connection.cursor()
+            for player_names, winner, moves in games:
+                if isinstance(moves, bytes):
+                    moves = bytes_to_moves(moves)
+                code = ct.WINNER_CODES[winner]
+                cursor.execute('INSERT INTO games (player1, player2, winner, '
+                               'moves) VALUES (?, ?, ?, ?)',
+                               (*player_names, code, moves_to_bytes(moves)))
+                game_id = cursor.lastrowid
+
+                # One row per position, including the final one, and a count
+                # of its next move, won if the player to move won
+                game = Conhex_bitboard()
+                rows = []
+                next_moves = []
+                for ply, move in enumerate(moves):
+                    key = sql_hash(game.hash)
+                    rows.append((key, game_id, ply, ct.POSITION_INDEX[move],
+                                 code))
+                    next_moves.append((key, ct.POSITION_INDEX[move],
+                                       winner is game.current_player))
+                    game.play_move(move)
+                key = sql_hash(game.hash)
+                rows.append((key, game_id, len(moves), None, code))
+                next_moves.append((key, END_OF_GAME,
+                                   winner is game.current_player))
+                cursor.executemany('INSERT OR IGNORE INTO positions VALUES '
+                                   '(?, ?, ?, ?, ?)', rows)
+                cursor.executemany(
+                    'INSERT INTO next_moves VALUES (?, ?, 1, ?) '
+                    'ON CONFLICT (hash, next) DO UPDATE SET '
+                    'games = games + 1, wins = wins + excluded.wins',
+                    next_moves)
+                count += 1
+        return count
+
+    def import_store(self, filename: str) -> int:
+        """Adds the games of a game store (see conhex_store)
+
+        Args:
+            filename (str): name of the game store file
+
+        Returns:
+            int: number of games added
+        """
+        return self.add_games(read_game_store(filename))
+
+    def next_moves(self, game: Conhex_game) -> list:
+        """Gives the moves played from the position of game, with how often
+        they were played and how often the player that moved won
+
+        Args:
+            game (Conhex_game): position to look up
+
+        Returns:
+            list: Next_move of each move, most played first
+        """
+        rows = self.connection.execute(
+            'SELECT next, games, wins FROM next_moves WHERE hash = ? '
+            'ORDER BY games DESC, next', (sql_hash(game.hash), ))
+        return [Next_move(None if move == END_OF_GAME else ct.POSITIONS[move],
+                          games, wins, wins / games)
+                for move, games, wins in rows]
+
+    def games_at(self, game: Conhex_game) -> list:
+        """Gives the games that reached the position of game
+
+        Args:
+            game (Conhex_game): position to look up
+
+        Returns:
+            list: tuples of game id and the number of moves played before
+                  the position was reached
+        """
+        return self.connection.execute(
+            'SELECT game, ply FROM positions WHERE hash = ? ORDER BY game',
+            (sql_hash(game.hash), )).fetchall()
+
+    def games_with_prefix(self, moves: list) -> list:
+        """Gives the games that start with the moves
+
+        Args:
+            moves (list): first moves of the games
+
+        Returns:
+            list: ids of the games
+        """
+        if not moves:
+            return [row[0] for row in
+                    self.connection.execute('SELECT id FROM games')]
+
+        # All blobs that start with prefix sort before the prefix with its
+        # last byte incremented (position indices are below 255)
+        prefix = moves_to_bytes(moves)
+        upper = prefix[:-1] + bytes([prefix[-1] + 1])
+        return [row[0] for row in self.connection.execute(
+            'SELECT id FROM games WHERE moves >= ? AND moves < ? ORDER BY id',
+            (prefix, upper))]
+
+    def game(self, game_id: int) -> tuple:
+        """Gives a game of the database
+
+        Args:
+            game_id (int): id of the game
+
+        Returns:
+            tuple: player names (2 str), winner (ct.BoardPosValue) and list
+                   of moves
+
+        Raises:
+            ValueError: if there is no game with the id
+        """
+        row = self.connection.execute(
+            'SELECT player1, player2, winner, moves FROM games WHERE id = ?',
+            (game_id, )).fetchone()
+        if row is None:
+            raise ValueError(f'Game {game_id} is not in the database')
+        player1, player2, winner, moves = row
+        return (player1, player2), ct.WINNERS[winner], bytes_to_moves(moves)
+
+    def __len__(self) -> int:
+        return self.connection.execute(
+            'SELECT COUNT(*) FROM games').fetchone()[0]
+
+    def close(self) -> None:
+        """Closes the database
+        """
+        self.connection.close()
+
+    def __enter__(self) -> 'Game_database':
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+
+def main():
+    """Builds a game database from game stores and shows the moves played
+    from a position
+    """
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('database', help='SQLite game database')
+    parser.add_argument('--import', dest='stores', nargs='+', default=[],
+                        help='game stores to add to the database')
+    parser.add_argument('--moves', nargs='*',
+                        help='moves of the position to look up, e.g. H5 I7')
+    args = parser.parse_args()
+    ct.configure_logging()
+
+    with Game_database(args.database) as database:
+        for store in args.stores:
+            start = time.perf_counter()
+            count = database.import_store(store)
+            print(f'Added {count} games of {store} in '
+                  f'{time.perf_counter() - start:.1f} s', file=sys.stderr)
+
+        if args.moves is not None:
+            game = Conhex_bitboard()
+            for move in args.moves:
+                game.play_move(move)
+
+            start = time.perf_counter()
+            next_moves = database.next_moves(game)
+            elapsed = time.perf_counter() - start
+            print(f'{sum(move.games for move in next_moves)} of '
+                  f'{len(database)} games reached the position '
+                  f'({elapsed * 1000:.1f} ms)')
+            for move in next_moves:
+                print(f'{move.move or "end":4s} {move.games:8d} games '
+                      f'{move.win_rate:6.1%} won')
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+import constants as ct
+import numpy as np
+import typing
+from conhex_bitboard import CELL_BITS, POSITION_BITS, Conhex_bitboard
+from conhex_board import Conhex_game
+
+
+#
+# Feature vector of a position, the input of a policy/value network:
+#
+#   PLAYER1_POSITIONS   1 for every position of ct.POSITIONS of PLAYER1
+#   PLAYER2_POSITIONS   1 for every position of ct.POSITIONS of PLAYER2
+#   PLAYER1_CELLS       1 for every cell of ct.CELLS conquered by PLAYER1
+#   PLAYER2_CELLS       1 for every cell of ct.CELLS conquered by PLAYER2
+#   SIDE_TO_MOVE        1 if PLAYER2 is to move
+#
+# Positions are encoded a batch at a time from the bit masks of
+# Conhex_bitboard, so no Python loop runs over the positions or cells.
+#
+POSITION_COUNT = len(ct.POSITIONS)
+CELL_COUNT = len(ct.CELLS)
+PLAYER1_POSITIONS = slice(0, POSITION_COUNT)
+PLAYER2_POSITIONS = slice(POSITION_COUNT, 2 * POSITION_COUNT)
+PLAYER1_CELLS = slice(2 * POSITION_COUNT, 2 * POSITION_COUNT + CELL_COUNT)
+PLAYER2_CELLS = slice(2 * POSITION_COUNT + CELL_COUNT,
+                      2 * POSITION_COUNT + 2 * CELL_COUNT)
+SIDE_TO_MOVE = 2 * POSITION_COUNT + 2 * CELL_COUNT
+FEATURE_SIZE = SIDE_TO_MOVE + 1
+
+
+class Position_masks(typing.NamedTuple):
+    """Bit masks of a position, as in Conhex_bitboard: positions are bits
+    in ct.POSITIONS order and cells in ct.CELLS order"""
+    positions1: int         # positions of PLAYER1
+    positions2: int         # positions of PLAYER2
+    cells1: int             # cells of PLAYER1
+    cells2: int             # cells of PLAYER2
+    player2_to_move: bool
+
+
+def game_masks(game: Conhex_game) -> Position_masks:
+    """Gives the bit masks of the position of a game
+
+    Args:
+        game (Conhex_game): the game
+
+    Returns:
+        Position_masks: the masks
+    """
+    player1, player2 = ct.BoardPosValue.PLAYER1, ct.BoardPosValue.PLAYER2
+    to_move = game.current_player is player2
+    if isinstance(game, Conhex_bitboard):
+        return Position_masks(game._positions[player1],
+                              game._positions[player2],
+                              game._cells[player1], game._cells[player2],
+                              to_move)
+
+    board = game._board
+    positions = {player: sum(bit for pos, bit in POSITION_BITS.items()
+                             if board[pos] is player)
+                 for player in (player1, player2)}
+    cells = {player: sum(CELL_BITS[cell]
+                         for cell in game.cells_conquered[player])
+             for player in (player1, player2)}
+    return Position_masks(positions[player1], positions[player2],
+                          cells[player1], cells[player2], to_move)
+
+
+def mask_bits(masks: typing.Sequence, bits: int) -> np.ndarray:
+    """Unpacks int bit masks into an array of bits
+
+    Args:
+        masks (typing.Sequence): the masks (int)
+        bits (int): number of bits per mask
+
+    Returns:
+        np.ndarray: (len(masks), bits) uint8 array; bit i of mask j is
+                    [j, i]
+    """
+    size = (bits + 7) // 8
+    data = b''.join(mask.to_bytes(size, 'little') for mask in masks)
+    array = np.frombuffer(data, dtype=np.uint8).reshape(len(masks), size)
+    return np.unpackbits(array, axis=1, count=bits, bitorder='little')
+
+
+def encode_masks(masks: typing.Sequence,
+                 out: np.ndarray = None) -> np.ndarray:
+    """Encodes positions into feature vectors
+
+    Args:
+        masks (typing.Sequence): Position_masks of the positions
+        out (np.ndarray): (len(masks), FEATURE_SIZE) array to write the
+                          features to; None for a new float32 array
+
+    Returns:
+        np.ndarray: (len(masks), FEATURE_SIZE) array of features
+    """
+    if out is None:
+        out = np.empty((len(masks), FEATURE_SIZE), dtype=np.float32)
+    if not len(masks):
+        return out
+    positions1, positions2, cells1, cells2, to_move = zip(*masks)
+    out[:, PLAYER1_POSITIONS] = mask_bits(positions1, POSITION_COUNT)
+    out[:, PLAYER2_POSITIONS] = mask_bits(positions2, POSITION_COUNT)
+    out[:, PLAYER1_CELLS] = mask_bits(cells1, CELL_COUNT)
+    out[:, PLAYER2_CELLS] = mask_bits(cells2, CELL_COUNT)
+    out[:, SIDE_TO_MOVE] = to_move
+    return out
+
+
+def encode_games(games: typing.Iterable) -> np.ndarray:
+    """Encodes the positions of games into feature vectors
+
+    Args:
+        games (typing.Iterable): the games (Conhex_game)
+
+    Returns:
+        np.ndarray: (number of games, FEATURE_SIZE) float32 array
+    """
+    return encode_masks([game_masks(game) for game in games])
+
+
+def free_positions(features: np.ndarray) -> np.ndarray:
+    """Gives the free positions of encoded positions
+
+    Args:
+        features (np.ndarray): (n, FEATURE_SIZE) features
+
+    Returns:
+        np.ndarray: (n, POSITION_COUNT) bool array, True where the position
+                    of ct.POSITIONS is free
+    """
+    return (features[:, PLAYER1_POSITIONS] +
+            features[:, PLAYER2_POSITIONS]) == 0
@@ -0,0 +1,1705 @@
+# flake8: noqa
+#
+# Generated by generate_geometry.py from the board layout in constants.py.
+# Don't edit this file; change constants.py and run generate_geometry.py.
+#
+
+POSITIONS = ['A1',
+ 'K1',
+ 'C2',
+ 'D2',
+ 'E2',
+ 'F2',
+ 'G2',
+ 'H2',
+ 'I2',
+ 'B3',
+ 'D3',
+ 'E3',
+ 'F3',
+ 'G3',
+ 'H3',
+ 'J3',
+ 'B4',
+ 'C4',
+ 'E4',
+ 'F4',
+ 'G4',
+ 'I4',
+ 'J4',
+ 'B5',
+ 'C5',
+ 'D5',
+ 'F5',
+ 'H5',
+ 'I5',
+ 'J5',
+ 'B6',
+ 'C6',
+ 'D6',
+ 'E6',
+ 'F6',
+ 'G6',
+ 'H6',
+ 'I6',
+ 'J6',
+ 'B7',
+ 'C7',
+ 'D7',
+ 'F7',
+ 'H7',
+ 'I7',
+ 'J7',
+ 'B8',
+ 'C8',
+ 'E8',
+ 'F8',
+ 'G8',
+ 'I8',
+ 'J8',
+ 'B9',
+ 'D9',
+ 'E9',
+ 'F9',
+ 'G9',
+ 'H9',
+ 'J9',
+ 'C10',
+ 'D10',
+ 'E10',
+ 'F10',
+ 'G10',
+ 'H10',
+ 'I10',
+ 'A11',
+ 'K11']
+
+POSITION_INDEX = {'A1': 0,
+ 'K1': 1,
+ 'C2': 2,
+ 'D2': 3,
+ 'E2': 4,
+ 'F2': 5,
+ 'G2': 6,
+ 'H2': 7,
+ 'I2': 8,
+ 'B3': 9,
+ 'D3': 10,
+ 'E3': 11,
+ 'F3': 12,
+ 'G3': 13,
+ 'H3': 14,
+ 'J3': 15,
+ 'B4': 16,
+ 'C4': 17,
+ 'E4': 18,
+ 'F4': 19,
+ 'G4': 20,
+ 'I4': 21,
+ 'J4': 22,
+ 'B5': 23,
+ 'C5': 24,
+ 'D5': 25,
+ 'F5': 26,
+ 'H5': 27,
+ 'I5': 28,
+ 'J5': 29,
+ 'B6': 30,
+ 'C6': 31,
+ 'D6': 32,
+ 'E6': 33,
+ 'F6': 34,
+ 'G6': 35,
+ 'H6': 36,
+ 'I6': 37,
+ 'J6': 38,
+ 'B7': 39,
+ 'C7': 40,
+ 'D7': 41,
+ 'F7': 42,
+ 'H7': 43,
+ 'I7': 44,
+ 'J7': 45,
+ 'B8': 46,
+ 'C8': 47,
+ 'E8': 48,
+ 'F8': 49,
+ 'G8': 50,
+ 'I8': 51,
+ 'J8': 52,
+ 'B9': 53,
+ 'D9': 54,
+ 'E9': 55,
+ 'F9': 56,
+ 'G9': 57,
+ 'H9': 58,
+ 'J9': 59,
+ 'C10': 60,
+ 'D10': 61,
+ 'E10': 62,
+ 'F10': 63,
+ 'G10': 64,
+ 'H10': 65,
+ 'I10': 66,
+ 'A11': 67,
+ 'K11': 68}
+
+POSITION_CELLS = {'A1': ((1, 1),),
+ 'K1': ((9, 1),),
+ 'C2': ((1, 1), (2, 2), (3, 1)),
+ 'D2': ((2, 2), (3, 1), (4, 2)),
+ 'E2': ((3, 1), (4, 2), (5, 1)),
+ 'F2': ((4, 2), (5, 1), (6, 2)),
+ 'G2': ((5, 1), (6, 2), (7, 1)),
+ 'H2': ((6, 2), (7, 1), (8, 2)),
+ 'I2': ((7, 1), (8, 2), (9, 1)),
+ 'B3': ((1, 1), (1, 3), (2, 2)),
+ 'D3': ((2, 2), (3, 3), (4, 2)),
+ 'E3': ((3, 3), (4, 2), (5, 3)),
+ 'F3': ((4, 2), (5, 3), (6, 2)),
+ 'G3': ((5, 3), (6, 2), (7, 3)),
+ 'H3': ((6, 2), (7, 3), (8, 2)),
+ 'J3': ((8, 2), (9, 1), (9, 3)),
+ 'B4': ((1, 3), (2, 2), (2, 4)),
+ 'C4': ((2, 2), (2, 4), (3, 3)),
+ 'E4': ((3, 3), (4, 4), (5, 3)),
+ 'F4': ((4, 4), (4, 6), (5, 3)),
+ 'G4': ((4, 6), (5, 3), (7, 3)),
+ 'I4': ((7, 3), (8, 2), (8, 4)),
+ 'J4': ((8, 2), (8, 4), (9, 3)),
+ 'B5': ((1, 3), (1, 5), (2, 4)),
+ 'C5': ((2, 4), (3, 3), (3, 5)),
+ 'D5': ((3, 3), (3, 5), (4, 4)),
+ 'F5': ((4, 4), (4, 6), (5, 5)),
+ 'H5': ((4, 6), (7, 3), (7, 5)),
+ 'I5': ((7, 3), (7, 5), (8, 4)),
+ 'J5': ((8, 4), (9, 3), (9, 5)),
+ 'B6': ((1, 5), (2, 4), (2, 6)),
+ 'C6': ((2, 4), (2, 6), (3, 5)),
+ 'D6': ((3, 5), (4, 4), (6, 4)),
+ 'E6': ((4, 4), (5, 5), (6, 4)),
+ 'F6': ((5, 5),),
+ 'G6': ((4, 6), (5, 5), (6, 6)),
+ 'H6': ((4, 6), (6, 6), (7, 5)),
+ 'I6': ((7, 5), (8, 4), (8, 6)),
+ 'J6': ((8, 4), (8, 6), (9, 5)),
+ 'B7': ((1, 5), (1, 7), (2, 6)),
+ 'C7': ((2, 6), (3, 5), (3, 7)),
+ 'D7': ((3, 5), (3, 7), (6, 4)),
+ 'F7': ((5, 5), (6, 4), (6, 6)),
+ 'H7': ((6, 6), (7, 5), (7, 7)),
+ 'I7': ((7, 5), (7, 7), (8, 6)),
+ 'J7': ((8, 6), (9, 5), (9, 7)),
+ 'B8': ((1, 7), (2, 6), (2, 8)),
+ 'C8': ((2, 6), (2, 8), (3, 7)),
+ 'E8': ((3, 7), (5, 7), (6, 4)),
+ 'F8': ((5, 7), (6, 4), (6, 6)),
+ 'G8': ((5, 7), (6, 6), (7, 7)),
+ 'I8': ((7, 7), (8, 6), (8, 8)),
+ 'J8': ((8, 6), (8, 8), (9, 7)),
+ 'B9': ((1, 7), (1, 9), (2, 8)),
+ 'D9': ((2, 8), (3, 7), (4, 8)),
+ 'E9': ((3, 7), (4, 8), (5, 7)),
+ 'F9': ((4, 8), (5, 7), (6, 8)),
+ 'G9': ((5, 7), (6, 8), (7, 7)),
+ 'H9': ((6, 8), (7, 7), (8, 8)),
+ 'J9': ((8, 8), (9, 7), (9, 9)),
+ 'C10': ((1, 9), (2, 8), (3, 9)),
+ 'D10': ((2, 8), (3, 9), (4, 8)),
+ 'E10': ((3, 9), (4, 8), (5, 9)),
+ 'F10': ((4, 8), (5, 9), (6, 8)),
+ 'G10': ((5, 9), (6, 8), (7, 9)),
+ 'H10': ((6, 8), (7, 9), (8, 8)),
+ 'I10': ((7, 9), (8, 8), (9, 9)),
+ 'A11': ((1, 9),),
+ 'K11': ((9, 9),)}
+
+CELL_NEIGHBOURS = {(1, 1): ((1, 3), (2, 2), (3, 1)),
+ (1, 3): ((1, 1), (1, 5), (2, 2), (2, 4)),
+ (1, 5): ((1, 3), (1, 7), (2, 4), (2, 6)),
+ (1, 7): ((1, 5), (1, 9), (2, 6), (2, 8)),
+ (1, 9): ((1, 7), (2, 8), (3, 9)),
+ (2, 2): ((1, 1), (1, 3), (2, 4), (3, 1), (3, 3), (4, 2)),
+ (2, 4): ((1, 3), (1, 5), (2, 2), (2, 6), (3, 3), (3, 5)),
+ (2, 6): ((1, 5), (1, 7), (2, 4), (2, 8), (3, 5), (3, 7)),
+ (2, 8): ((1, 7), (1, 9), (2, 6), (3, 7), (3, 9), (4, 8)),
+ (3, 1): ((1, 1), (2, 2), (4, 2), (5, 1)),
+ (3, 3): ((2, 2), (2, 4), (3, 5), (4, 2), (4, 4), (5, 3)),
+ (3, 5): ((2, 4), (2, 6), (3, 3), (3, 7), (4, 4), (6, 4)),
+ (3, 7): ((2, 6), (2, 8), (3, 5), (4, 8), (5, 7), (6, 4)),
+ (3, 9): ((1, 9), (2, 8), (4, 8), (5, 9)),
+ (4, 2): ((2, 2), (3, 1), (3, 3), (5, 1), (5, 3), (6, 2)),
+ (4, 4): ((3, 3), (3, 5), (4, 6), (5, 3), (5, 5), (6, 4)),
+ (4, 6): ((4, 4), (5, 3), (5, 5), (6, 6), (7, 3), (7, 5)),
+ (4, 8): ((2, 8), (3, 7), (3, 9), (5, 7), (5, 9), (6, 8)),
+ (5, 1): ((3, 1), (4, 2), (6, 2), (7, 1)),
+ (5, 3): ((3, 3), (4, 2), (4, 4), (4, 6), (6, 2), (7, 3)),
+ (5, 5): ((4, 4), (4, 6), (6, 4), (6, 6)),
+ (5, 7): ((3, 7), (4, 8), (6, 4), (6, 6), (6, 8), (7, 7)),
+ (5, 9): ((3, 9), (4, 8), (6, 8), (7, 9)),
+ (6, 2): ((4, 2), (5, 1), (5, 3), (7, 1), (7, 3), (8, 2)),
+ (6, 4): ((3, 5), (3, 7), (4, 4), (5, 5), (5, 7), (6, 6)),
+ (6, 6): ((4, 6), (5, 5), (5, 7), (6, 4), (7, 5), (7, 7)),
+ (6, 8): ((4, 8), (5, 7), (5, 9), (7, 7), (7, 9), (8, 8)),
+ (7, 1): ((5, 1), (6, 2), (8, 2), (9, 1)),
+ (7, 3): ((4, 6), (5, 3), (6, 2), (7, 5), (8, 2), (8, 4)),
+ (7, 5): ((4, 6), (6, 6), (7, 3), (7, 7), (8, 4), (8, 6)),
+ (7, 7): ((5, 7), (6, 6), (6, 8), (7, 5), (8, 6), (8, 8)),
+ (7, 9): ((5, 9), (6, 8), (8, 8), (9, 9)),
+ (8, 2): ((6, 2), (7, 1), (7, 3), (8, 4), (9, 1), (9, 3)),
+ (8, 4): ((7, 3), (7, 5), (8, 2), (8, 6), (9, 3), (9, 5)),
+ (8, 6): ((7, 5), (7, 7), (8, 4), (8, 8), (9, 5), (9, 7)),
+ (8, 8): ((6, 8), (7, 7), (7, 9), (8, 6), (9, 7), (9, 9)),
+ (9, 1): ((7, 1), (8, 2), (9, 3)),
+ (9, 3): ((8, 2), (8, 4), (9, 1), (9, 5)),
+ (9, 5): ((8, 4), (8, 6), (9, 3), (9, 7)),
+ (9, 7): ((8, 6), (8, 8), (9, 5), (9, 9)),
+ (9, 9): ((7, 9), (8, 8), (9, 7))}
+
+CELL_QUOTAS = {(1, 1): 2,
+ (1, 3): 2,
+ (1, 5): 2,
+ (1, 7): 2,
+ (1, 9): 2,
+ (2, 2): 3,
+ (2, 4): 3,
+ (2, 6): 3,
+ (2, 8): 3,
+ (3, 1): 2,
+ (3, 3): 3,
+ (3, 5): 3,
+ (3, 7): 3,
+ (3, 9): 2,
+ (4, 2): 3,
+ (4, 4): 3,
+ (4, 6): 3,
+ (4, 8): 3,
+ (5, 1): 2,
+ (5, 3): 3,
+ (5, 5): 3,
+ (5, 7): 3,
+ (5, 9): 2,
+ (6, 2): 3,
+ (6, 4): 3,
+ (6, 6): 3,
+ (6, 8): 3,
+ (7, 1): 2,
+ (7, 3): 3,
+ (7, 5): 3,
+ (7, 7): 3,
+ (7, 9): 2,
+ (8, 2): 3,
+ (8, 4): 3,
+ (8, 6): 3,
+ (8, 8): 3,
+ (9, 1): 2,
+ (9, 3): 2,
+ (9, 5): 2,
+ (9, 7): 2,
+ (9, 9): 2}
+
+BORDER_CELLS = {0: (((1, 1), (1, 3), (1, 5), (1, 7), (1, 9), (2, 2), (2, 4), (2, 6), (2, 8)),
+     ((8, 2),
+      (8, 4),
+      (8, 6),
+      (8, 8),
+      (9, 1),
+      (9, 3),
+      (9, 5),
+      (9, 7),
+      (9, 9))),
+ 1: (((1, 1), (2, 2), (3, 1), (4, 2), (5, 1), (6, 2), (7, 1), (8, 2), (9, 1)),
+     ((1, 9),
+      (2, 8),
+      (3, 9),
+      (4, 8),
+      (5, 9),
+      (6, 8),
+      (7, 9),
+      (8, 8),
+      (9, 9)))}
+
+BOARD_ASCII_SEGMENTS = ['   A     B     C     D     E     F     G     H     I     J     K\n 1 ',
+ '-----------+-----------+-----------+-----------+-----------',
+ '\n'
+ '   |           |    3,1    |    5,1    |    7,1    |           |\n'
+ '   |           |           |           |           |           |\n'
+ ' 2 |   1,1     ',
+ '-----',
+ '-----',
+ '-----',
+ '-----',
+ '-----',
+ '-----',
+ '     9,1   |\n'
+ '   |         /       |    4,2    |    6,2    |       \\         |\n'
+ '   |       /         |           |           |         \\       |\n'
+ ' 3 +-----',
+ '    2,2    ',
+ '-----',
+ '-----',
+ '-----',
+ '-----',
+ '    8,2    ',
+ '-----+\n'
+ '   |     |         /       |    5,3    |       \\         |     |\n'
+ '   |     |       /         |           |         \\       |     |\n'
+ ' 4 | 1,3 ',
+ '-----',
+ '    3,3    ',
+ '-----',
+ '-----',
+ '    7,3    ',
+ '-----',
+ ' 9,3 |\n'
+ '   |     |     |         /       |       \\         |     |     |\n'
+ '   |     |     |       /         |         \\       |     |     |\n'
+ ' 5 +-----',
+ ' 2,4 ',
+ '-----',
+ '    4,4    ',
+ '    6,4   ',
+ '------',
+ ' 8,4 ',
+ '-----+\n'
+ '   |     |     |     |         /   \\        |      |     |     |\n'
+ '   |     |     |     |       /  5,5  \\      |      |     |     |\n'
+ ' 6 | 1,5 ',
+ '-----',
+ ' 3,5 ',
+ '------',
+ '    ',
+ '    ',
+ '-----',
+ ' 7,5  ',
+ '-----',
+ ' 9,5 |\n'
+ '   |     |     |     |       \\       /      |      |     |     |\n'
+ '   |     |     |     |         \\   /        |      |     |     |\n'
+ ' 7 +-----',
+ ' 2,6 ',
+ '-----',
+ '     4,6   ',
+ '    6,6   ',
+ '------',
+ ' 8,6 ',
+ '-----+\n'
+ '   |     |     |       \\         |         /       |     |     |\n'
+ '   |     |     |         \\       |       /         |     |     |\n'
+ ' 8 | 1,7 ',
+ '-----',
+ '    3,7    ',
+ '-----',
+ '-----',
+ '    7,7    ',
+ '-----',
+ ' 9,7 |\n'
+ '   |     |       \\         |           |         /       |     |\n'
+ '   |     |         \\       |    5,7    |       /         |     |\n'
+ ' 9 +-----',
+ '    2,8    ',
+ '-----',
+ '-----',
+ '-----',
+ '-----',
+ '    8,8    ',
+ '-----+\n'
+ '   |       \\         |           |           |         /       |\n'
+ '   |         \\       |    4,8    |    6,8    |       /         |\n'
+ '10 |   1,9     ',
+ '-----',
+ '-----',
+ '-----',
+ '-----',
+ '-----',
+ '-----',
+ '    9,9    |\n'
+ '   |           |           |           |           |           |\n'
+ '   |           |    3,9    |    5,9    |    7,9    |           |\n'
+ '11 ',
+ '-----------+-----------+-----------+-----------+-----------',
+ '']
+
+CELL_MASKS = [517,
+ 8454656,
+ 550837944320,
+ 9078117754732544,
+ 148735881293538000896,
+ 198156,
+ 3246587904,
+ 212758721200128,
+ 3485997217817296896,
+ 28,
+ 50727936,
+ 3305027665920,
+ 54468706528395264,
+ 8070450532247928832,
+ 7224,
+ 12986351616,
+ 103282114560,
+ 16267001854062231552,
+ 112,
+ 1849344,
+ 4458243162112,
+ 254171903969722368,
+ 32281802128991715328,
+ 28896,
+ 851034884800512,
+ 1702147079012352,
+ 65068007416248926208,
+ 448,
+ 405823488,
+ 26594840150016,
+ 435749652227162112,
+ 129127208515966861312,
+ 6340992,
+ 413128458240,
+ 6808588316049408,
+ 111551910970153500672,
+ 33026,
+ 541097984,
+ 35459786866688,
+ 580999536302882816,
+ 369511342226494455808]
+
+CELL_QUOTA = [2,
+ 2,
+ 2,
+ 2,
+ 2,
+ 3,
+ 3,
+ 3,
+ 3,
+ 2,
+ 3,
+ 3,
+ 3,
+ 2,
+ 3,
+ 3,
+ 3,
+ 3,
+ 2,
+ 3,
+ 3,
+ 3,
+ 2,
+ 3,
+ 3,
+ 3,
+ 3,
+ 2,
+ 3,
+ 3,
+ 3,
+ 2,
+ 3,
+ 3,
+ 3,
+ 3,
+ 2,
+ 2,
+ 2,
+ 2,
+ 2]
+
+POSITION_CELL_IDX = {'A1': (0,),
+ 'K1': (36,),
+ 'C2': (0, 5, 9),
+ 'D2': (5, 9, 14),
+ 'E2': (9, 14, 18),
+ 'F2': (14, 18, 23),
+ 'G2': (18, 23, 27),
+ 'H2': (23, 27, 32),
+ 'I2': (27, 32, 36),
+ 'B3': (0, 1, 5),
+ 'D3': (5, 10, 14),
+ 'E3': (10, 14, 19),
+ 'F3': (14, 19, 23),
+ 'G3': (19, 23, 28),
+ 'H3': (23, 28, 32),
+ 'J3': (32, 36, 37),
+ 'B4': (1, 5, 6),
+ 'C4': (5, 6, 10),
+ 'E4': (10, 15, 19),
+ 'F4': (15, 16, 19),
+ 'G4': (16, 19, 28),
+ 'I4': (28, 32, 33),
+ 'J4': (32, 33, 37),
+ 'B5': (1, 2, 6),
+ 'C5': (6, 10, 11),
+ 'D5': (10, 11, 15),
+ 'F5': (15, 16, 20),
+ 'H5': (16, 28, 29),
+ 'I5': (28, 29, 33),
+ 'J5': (33, 37, 38),
+ 'B6': (2, 6, 7),
+ 'C6': (6, 7, 11),
+ 'D6': (11, 15, 24),
+ 'E6': (15, 20, 24),
+ 'F6': (20,),
+ 'G6': (16, 20, 25),
+ 'H6': (16, 25, 29),
+ 'I6': (29, 33, 34),
+ 'J6': (33, 34, 38),
+ 'B7': (2, 3, 7),
+ 'C7': (7, 11, 12),
+ 'D7': (11, 12, 24),
+ 'F7': (20, 24, 25),
+ 'H7': (25, 29, 30),
+ 'I7': (29, 30, 34),
+ 'J7': (34, 38, 39),
+ 'B8': (3, 7, 8),
+ 'C8': (7, 8, 12),
+ 'E8': (12, 21, 24),
+ 'F8': (21, 24, 25),
+ 'G8': (21, 25, 30),
+ 'I8': (30, 34, 35),
+ 'J8': (34, 35, 39),
+ 'B9': (3, 4, 8),
+ 'D9': (8, 12, 17),
+ 'E9': (12, 17, 21),
+ 'F9': (17, 21, 26),
+ 'G9': (21, 26, 30),
+ 'H9': (26, 30, 35),
+ 'J9': (35, 39, 40),
+ 'C10': (4, 8, 13),
+ 'D10': (8, 13, 17),
+ 'E10': (13, 17, 22),
+ 'F10': (17, 22, 26),
+ 'G10': (22, 26, 31),
+ 'H10': (26, 31, 35),
+ 'I10': (31, 35, 40),
+ 'A11': (4,),
+ 'K11': (40,)}
+
+CELL_NEIGHBOUR_MASKS = [546,
+ 101,
+ 202,
+ 404,
+ 8456,
+ 17987,
+ 3238,
+ 6476,
+ 143512,
+ 278561,
+ 575584,
+ 16815296,
+ 19007872,
+ 4325648,
+ 9176608,
+ 18418688,
+ 840466432,
+ 73412864,
+ 142623232,
+ 276939776,
+ 50429952,
+ 1191317504,
+ 2214731776,
+ 4698423296,
+ 36739072,
+ 1630601216,
+ 37587386368,
+ 73023094784,
+ 13430751232,
+ 27145601024,
+ 52179238912,
+ 1133942669312,
+ 215159406592,
+ 434597003264,
+ 869194006528,
+ 1669735645184,
+ 141868138496,
+ 356482285568,
+ 712964571136,
+ 1425929142272,
+ 586263035904]
+
+BORDER_CELL_MASKS = {0: (511, 2194728288256), 1: (73157329441, 1136090292496)}
+
+POSITION_XY = {'A1': (10, -10),
+ 'K1': (110, -10),
+ 'C2': (30, -20),
+ 'D2': (40, -20),
+ 'E2': (50, -20),
+ 'F2': (60, -20),
+ 'G2': (70, -20),
+ 'H2': (80, -20),
+ 'I2': (90, -20),
+ 'B3': (20, -30),
+ 'D3': (40, -30),
+ 'E3': (50, -30),
+ 'F3': (60, -30),
+ 'G3': (70, -30),
+ 'H3': (80, -30),
+ 'J3': (100, -30),
+ 'B4': (20, -40),
+ 'C4': (30, -40),
+ 'E4': (50, -40),
+ 'F4': (60, -40),
+ 'G4': (70, -40),
+ 'I4': (90, -40),
+ 'J4': (100, -40),
+ 'B5': (20, -50),
+ 'C5': (30, -50),
+ 'D5': (40, -50),
+ 'F5': (60, -50),
+ 'H5': (80, -50),
+ 'I5': (90, -50),
+ 'J5': (100, -50),
+ 'B6': (20, -60),
+ 'C6': (30, -60),
+ 'D6': (40, -60),
+ 'E6': (50, -60),
+ 'F6': (60, -60),
+ 'G6': (70, -60),
+ 'H6': (80, -60),
+ 'I6': (90, -60),
+ 'J6': (100, -60),
+ 'B7': (20, -70),
+ 'C7': (30, -70),
+ 'D7': (40, -70),
+ 'F7': (60, -70),
+ 'H7': (80, -70),
+ 'I7': (90, -70),
+ 'J7': (100, -70),
+ 'B8': (20, -80),
+ 'C8': (30, -80),
+ 'E8': (50, -80),
+ 'F8': (60, -80),
+ 'G8': (70, -80),
+ 'I8': (90, -80),
+ 'J8': (100, -80),
+ 'B9': (20, -90),
+ 'D9': (40, -90),
+ 'E9': (50, -90),
+ 'F9': (60, -90),
+ 'G9': (70, -90),
+ 'H9': (80, -90),
+ 'J9': (100, -90),
+ 'C10': (30, -100),
+ 'D10': (40, -100),
+ 'E10': (50, -100),
+ 'F10': (60, -100),
+ 'G10': (70, -100),
+ 'H10': (80, -100),
+ 'I10': (90, -100),
+ 'A11': (10, -110),
+ 'K11': (110, -110)}
+
+SCALED_CELL_POLYS = {(1, 1): [(10, -10), (30, -10), (30, -20), (20, -30), (10, -30), (10, -10)],
+ (1, 3): [(10, -30), (20, -30), (20, -50), (10, -50), (10, -30)],
+ (1, 5): [(10, -50), (20, -50), (20, -70), (10, -70), (10, -50)],
+ (1, 7): [(10, -70), (20, -70), (20, -90), (10, -90), (10, -70)],
+ (1, 9): [(10, -90),
+          (20, -90),
+          (30, -100),
+          (30, -110),
+          (10, -110),
+          (10, -90)],
+ (2, 2): [(30, -20),
+          (40, -20),
+          (40, -30),
+          (30, -40),
+          (20, -40),
+          (20, -30),
+          (30, -20)],
+ (2, 4): [(20, -40), (30, -40), (30, -60), (20, -60), (20, -40)],
+ (2, 6): [(20, -60), (30, -60), (30, -80), (20, -80), (20, -60)],
+ (2, 8): [(20, -80),
+          (30, -80),
+          (40, -90),
+          (40, -100),
+          (30, -100),
+          (20, -90),
+          (20, -80)],
+ (3, 1): [(30, -10), (50, -10), (50, -20), (30, -20), (30, -10)],
+ (3, 3): [(40, -30),
+          (50, -30),
+          (50, -40),
+          (40, -50),
+          (30, -50),
+          (30, -40),
+          (40, -30)],
+ (3, 5): [(30, -50), (40, -50), (40, -70), (30, -70), (30, -50)],
+ (3, 7): [(30, -70),
+          (40, -70),
+          (50, -80),
+          (50, -90),
+          (40, -90),
+          (30, -80),
+          (30, -70)],
+ (3, 9): [(30, -100), (50, -100), (50, -110), (30, -110), (30, -100)],
+ (4, 2): [(40, -20), (60, -20), (60, -30), (40, -30), (40, -20)],
+ (4, 4): [(50, -40),
+          (60, -40),
+          (60, -50),
+          (50, -60),
+          (40, -60),
+          (40, -50),
+          (50, -40)],
+ (4, 6): [(40, -60),
+          (50, -60),
+          (60, -70),
+          (60, -80),
+          (50, -80),
+          (40, -70),
+          (40, -60)],
+ (4, 8): [(40, -90), (60, -90), (60, -100), (40, -100), (40, -90)],
+ (5, 1): [(50, -10), (70, -10), (70, -20), (50, -20), (50, -10)],
+ (5, 3): [(50, -30), (70, -30), (70, -40), (50, -40), (50, -30)],
+ (5, 5): [(60, -50), (70, -60), (60, -70), (50, -60), (60, -50)],
+ (5, 7): [(50, -80), (70, -80), (70, -90), (50, -90), (50, -80)],
+ (5, 9): [(50, -100), (70, -100), (70, -110), (50, -110), (50, -100)],
+ (6, 2): [(60, -20), (80, -20), (80, -30), (60, -30), (60, -20)],
+ (6, 4): [(60, -40),
+          (70, -40),
+          (80, -50),
+          (80, -60),
+          (70, -60),
+          (60, -50),
+          (60, -40)],
+ (6, 6): [(70, -60),
+          (80, -60),
+          (80, -70),
+          (70, -80),
+          (60, -80),
+          (60, -70),
+          (70, -60)],
+ (6, 8): [(60, -90), (80, -90), (80, -100), (60, -100), (60, -90)],
+ (7, 1): [(70, -10), (90, -10), (90, -20), (70, -20), (70, -10)],
+ (7, 3): [(70, -30),
+          (80, -30),
+          (90, -40),
+          (90, -50),
+          (80, -50),
+          (70, -40),
+          (70, -30)],
+ (7, 5): [(80, -50), (90, -50), (90, -70), (80, -70), (80, -50)],
+ (7, 7): [(80, -70),
+          (90, -70),
+          (90, -80),
+          (80, -90),
+          (70, -90),
+          (70, -80),
+          (80, -70)],
+ (7, 9): [(70, -100), (90, -100), (90, -110), (70, -110), (70, -100)],
+ (8, 2): [(80, -20),
+          (90, -20),
+          (100, -30),
+          (100, -40),
+          (90, -40),
+          (80, -30),
+          (80, -20)],
+ (8, 4): [(90, -40), (100, -40), (100, -60), (90, -60), (90, -40)],
+ (8, 6): [(90, -60), (100, -60), (100, -80), (90, -80), (90, -60)],
+ (8, 8): [(90, -80),
+          (100, -80),
+          (100, -90),
+          (90, -100),
+          (80, -100),
+          (80, -90),
+          (90, -80)],
+ (9, 1): [(90, -10),
+          (110, -10),
+          (110, -30),
+          (100, -30),
+          (90, -20),
+          (90, -10)],
+ (9, 3): [(100, -30), (110, -30), (110, -50), (100, -50), (100, -30)],
+ (9, 5): [(100, -50), (110, -50), (110, -70), (100, -70), (100, -50)],
+ (9, 7): [(100, -70), (110, -70), (110, -90), (100, -90), (100, -70)],
+ (9, 9): [(100, -90),
+          (110, -90),
+          (110, -110),
+          (90, -110),
+          (90, -100),
+          (100, -90)]}
+
+SCALED_BORDER_POLYS = {'PLAYER1': [[(0, 0), (120, 0), (110, -10), (10, -10), (0, 0)],
+             [(10, -110), (110, -110), (120, -120), (0, -120), (10, -110)]],
+ 'PLAYER2': [[(0, 0), (10, -10), (10, -110), (0, -120), (0, 0)],
+             [(110, -10), (120, 0), (120, -120), (110, -110), (110, -10)]]}
+
+SYMMETRY_POSITIONS = {'identity': {'A1': 'A1',
+              'K1': 'K1',
+              'C2': 'C2',
+              'D2': 'D2',
+              'E2': 'E2',
+              'F2': 'F2',
+              'G2': 'G2',
+              'H2': 'H2',
+              'I2': 'I2',
+              'B3': 'B3',
+              'D3': 'D3',
+              'E3': 'E3',
+              'F3': 'F3',
+              'G3': 'G3',
+              'H3': 'H3',
+              'J3': 'J3',
+              'B4': 'B4',
+              'C4': 'C4',
+              'E4': 'E4',
+              'F4': 'F4',
+              'G4': 'G4',
+              'I4': 'I4',
+              'J4': 'J4',
+              'B5': 'B5',
+              'C5': 'C5',
+              'D5': 'D5',
+              'F5': 'F5',
+              'H5': 'H5',
+              'I5': 'I5',
+              'J5': 'J5',
+              'B6': 'B6',
+              'C6': 'C6',
+              'D6': 'D6',
+              'E6': 'E6',
+              'F6': 'F6',
+              'G6': 'G6',
+              'H6': 'H6',
+              'I6': 'I6',
+              'J6': 'J6',
+              'B7': 'B7',
+              'C7': 'C7',
+              'D7': 'D7',
+              'F7': 'F7',
+              'H7': 'H7',
+              'I7': 'I7',
+              'J7': 'J7',
+              'B8': 'B8',
+              'C8': 'C8',
+              'E8': 'E8',
+              'F8': 'F8',
+              'G8': 'G8',
+              'I8': 'I8',
+              'J8': 'J8',
+              'B9': 'B9',
+              'D9': 'D9',
+              'E9': 'E9',
+              'F9': 'F9',
+              'G9': 'G9',
+              'H9': 'H9',
+              'J9': 'J9',
+              'C10': 'C10',
+              'D10': 'D10',
+              'E10': 'E10',
+              'F10': 'F10',
+              'G10': 'G10',
+              'H10': 'H10',
+              'I10': 'I10',
+              'A11': 'A11',
+              'K11': 'K11'},
+ 'flip_columns': {'A1': 'K1',
+                  'K1': 'A1',
+                  'C2': 'I2',
+                  'D2': 'H2',
+                  'E2': 'G2',
+                  'F2': 'F2',
+                  'G2': 'E2',
+                  'H2': 'D2',
+                  'I2': 'C2',
+                  'B3': 'J3',
+                  'D3': 'H3',
+                  'E3': 'G3',
+                  'F3': 'F3',
+                  'G3': 'E3',
+                  'H3': 'D3',
+                  'J3': 'B3',
+                  'B4': 'J4',
+                  'C4': 'I4',
+                  'E4': 'G4',
+                  'F4': 'F4',
+                  'G4': 'E4',
+                  'I4': 'C4',
+                  'J4': 'B4',
+                  'B5': 'J5',
+                  'C5': 'I5',
+                  'D5': 'H5',
+                  'F5': 'F5',
+                  'H5': 'D5',
+                  'I5': 'C5',
+                  'J5': 'B5',
+                  'B6': 'J6',
+                  'C6': 'I6',
+                  'D6': 'H6',
+                  'E6': 'G6',
+                  'F6': 'F6',
+                  'G6': 'E6',
+                  'H6': 'D6',
+                  'I6': 'C6',
+                  'J6': 'B6',
+                  'B7': 'J7',
+                  'C7': 'I7',
+                  'D7': 'H7',
+                  'F7': 'F7',
+                  'H7': 'D7',
+                  'I7': 'C7',
+                  'J7': 'B7',
+                  'B8': 'J8',
+                  'C8': 'I8',
+                  'E8': 'G8',
+                  'F8': 'F8',
+                  'G8': 'E8',
+                  'I8': 'C8',
+                  'J8': 'B8',
+                  'B9': 'J9',
+                  'D9': 'H9',
+                  'E9': 'G9',
+                  'F9': 'F9',
+                  'G9': 'E9',
+                  'H9': 'D9',
+                  'J9': 'B9',
+                  'C10': 'I10',
+                  'D10': 'H10',
+                  'E10': 'G10',
+                  'F10': 'F10',
+                  'G10': 'E10',
+                  'H10': 'D10',
+                  'I10': 'C10',
+                  'A11': 'K11',
+                  'K11': 'A11'},
+ 'flip_rows': {'A1': 'A11',
+               'K1': 'K11',
+               'C2': 'C10',
+               'D2': 'D10',
+               'E2': 'E10',
+               'F2': 'F10',
+               'G2': 'G10',
+               'H2': 'H10',
+               'I2': 'I10',
+               'B3': 'B9',
+               'D3': 'D9',
+               'E3': 'E9',
+               'F3': 'F9',
+               'G3': 'G9',
+               'H3': 'H9',
+               'J3': 'J9',
+               'B4': 'B8',
+               'C4': 'C8',
+               'E4': 'E8',
+               'F4': 'F8',
+               'G4': 'G8',
+               'I4': 'I8',
+               'J4': 'J8',
+               'B5': 'B7',
+               'C5': 'C7',
+               'D5': 'D7',
+               'F5': 'F7',
+               'H5': 'H7',
+               'I5': 'I7',
+               'J5': 'J7',
+               'B6': 'B6',
+               'C6': 'C6',
+               'D6': 'D6',
+               'E6': 'E6',
+               'F6': 'F6',
+               'G6': 'G6',
+               'H6': 'H6',
+               'I6': 'I6',
+               'J6': 'J6',
+               'B7': 'B5',
+               'C7': 'C5',
+               'D7': 'D5',
+               'F7': 'F5',
+               'H7': 'H5',
+               'I7': 'I5',
+               'J7': 'J5',
+               'B8': 'B4',
+               'C8': 'C4',
+               'E8': 'E4',
+               'F8': 'F4',
+               'G8': 'G4',
+               'I8': 'I4',
+               'J8': 'J4',
+               'B9': 'B3',
+               'D9': 'D3',
+               'E9': 'E3',
+               'F9': 'F3',
+               'G9': 'G3',
+               'H9': 'H3',
+               'J9': 'J3',
+               'C10': 'C2',
+               'D10': 'D2',
+               'E10': 'E2',
+               'F10': 'F2',
+               'G10': 'G2',
+               'H10': 'H2',
+               'I10': 'I2',
+               'A11': 'A1',
+               'K11': 'K1'},
+ 'rotate_180': {'A1': 'K11',
+                'K1': 'A11',
+                'C2': 'I10',
+                'D2': 'H10',
+                'E2': 'G10',
+                'F2': 'F10',
+                'G2': 'E10',
+                'H2': 'D10',
+                'I2': 'C10',
+                'B3': 'J9',
+                'D3': 'H9',
+                'E3': 'G9',
+                'F3': 'F9',
+                'G3': 'E9',
+                'H3': 'D9',
+                'J3': 'B9',
+                'B4': 'J8',
+                'C4': 'I8',
+                'E4': 'G8',
+                'F4': 'F8',
+                'G4': 'E8',
+                'I4': 'C8',
+                'J4': 'B8',
+                'B5': 'J7',
+                'C5': 'I7',
+                'D5': 'H7',
+                'F5': 'F7',
+                'H5': 'D7',
+                'I5': 'C7',
+                'J5': 'B7',
+                'B6': 'J6',
+                'C6': 'I6',
+                'D6': 'H6',
+                'E6': 'G6',
+                'F6': 'F6',
+                'G6': 'E6',
+                'H6': 'D6',
+                'I6': 'C6',
+                'J6': 'B6',
+                'B7': 'J5',
+                'C7': 'I5',
+                'D7': 'H5',
+                'F7': 'F5',
+                'H7': 'D5',
+                'I7': 'C5',
+                'J7': 'B5',
+                'B8': 'J4',
+                'C8': 'I4',
+                'E8': 'G4',
+                'F8': 'F4',
+                'G8': 'E4',
+                'I8': 'C4',
+                'J8': 'B4',
+                'B9': 'J3',
+                'D9': 'H3',
+                'E9': 'G3',
+                'F9': 'F3',
+                'G9': 'E3',
+                'H9': 'D3',
+                'J9': 'B3',
+                'C10': 'I2',
+                'D10': 'H2',
+                'E10': 'G2',
+                'F10': 'F2',
+                'G10': 'E2',
+                'H10': 'D2',
+                'I10': 'C2',
+                'A11': 'K1',
+                'K11': 'A1'},
+ 'transpose': {'A1': 'A1',
+               'K1': 'A11',
+               'C2': 'B3',
+               'D2': 'B4',
+               'E2': 'B5',
+               'F2': 'B6',
+               'G2': 'B7',
+               'H2': 'B8',
+               'I2': 'B9',
+               'B3': 'C2',
+               'D3': 'C4',
+               'E3': 'C5',
+               'F3': 'C6',
+               'G3': 'C7',
+               'H3': 'C8',
+               'J3': 'C10',
+               'B4': 'D2',
+               'C4': 'D3',
+               'E4': 'D5',
+               'F4': 'D6',
+               'G4': 'D7',
+               'I4': 'D9',
+               'J4': 'D10',
+               'B5': 'E2',
+               'C5': 'E3',
+               'D5': 'E4',
+               'F5': 'E6',
+               'H5': 'E8',
+               'I5': 'E9',
+               'J5': 'E10',
+               'B6': 'F2',
+               'C6': 'F3',
+               'D6': 'F4',
+               'E6': 'F5',
+               'F6': 'F6',
+               'G6': 'F7',
+               'H6': 'F8',
+               'I6': 'F9',
+               'J6': 'F10',
+               'B7': 'G2',
+               'C7': 'G3',
+               'D7': 'G4',
+               'F7': 'G6',
+               'H7': 'G8',
+               'I7': 'G9',
+               'J7': 'G10',
+               'B8': 'H2',
+               'C8': 'H3',
+               'E8': 'H5',
+               'F8': 'H6',
+               'G8': 'H7',
+               'I8': 'H9',
+               'J8': 'H10',
+               'B9': 'I2',
+               'D9': 'I4',
+               'E9': 'I5',
+               'F9': 'I6',
+               'G9': 'I7',
+               'H9': 'I8',
+               'J9': 'I10',
+               'C10': 'J3',
+               'D10': 'J4',
+               'E10': 'J5',
+               'F10': 'J6',
+               'G10': 'J7',
+               'H10': 'J8',
+               'I10': 'J9',
+               'A11': 'K1',
+               'K11': 'K11'},
+ 'anti_transpose': {'A1': 'K11',
+                    'K1': 'K1',
+                    'C2': 'J9',
+                    'D2': 'J8',
+                    'E2': 'J7',
+                    'F2': 'J6',
+                    'G2': 'J5',
+                    'H2': 'J4',
+                    'I2': 'J3',
+                    'B3': 'I10',
+                    'D3': 'I8',
+                    'E3': 'I7',
+                    'F3': 'I6',
+                    'G3': 'I5',
+                    'H3': 'I4',
+                    'J3': 'I2',
+                    'B4': 'H10',
+                    'C4': 'H9',
+                    'E4': 'H7',
+                    'F4': 'H6',
+                    'G4': 'H5',
+                    'I4': 'H3',
+                    'J4': 'H2',
+                    'B5': 'G10',
+                    'C5': 'G9',
+                    'D5': 'G8',
+                    'F5': 'G6',
+                    'H5': 'G4',
+                    'I5': 'G3',
+                    'J5': 'G2',
+                    'B6': 'F10',
+                    'C6': 'F9',
+                    'D6': 'F8',
+                    'E6': 'F7',
+                    'F6': 'F6',
+                    'G6': 'F5',
+                    'H6': 'F4',
+                    'I6': 'F3',
+                    'J6': 'F2',
+                    'B7': 'E10',
+                    'C7': 'E9',
+                    'D7': 'E8',
+                    'F7': 'E6',
+                    'H7': 'E4',
+                    'I7': 'E3',
+                    'J7': 'E2',
+                    'B8': 'D10',
+                    'C8': 'D9',
+                    'E8': 'D7',
+                    'F8': 'D6',
+                    'G8': 'D5',
+                    'I8': 'D3',
+                    'J8': 'D2',
+                    'B9': 'C10',
+                    'D9': 'C8',
+                    'E9': 'C7',
+                    'F9': 'C6',
+                    'G9': 'C5',
+                    'H9': 'C4',
+                    'J9': 'C2',
+                    'C10': 'B9',
+                    'D10': 'B8',
+                    'E10': 'B7',
+                    'F10': 'B6',
+                    'G10': 'B5',
+                    'H10': 'B4',
+                    'I10': 'B3',
+                    'A11': 'A11',
+                    'K11': 'A1'},
+ 'rotate_90': {'A1': 'K1',
+               'K1': 'K11',
+               'C2': 'J3',
+               'D2': 'J4',
+               'E2': 'J5',
+               'F2': 'J6',
+               'G2': 'J7',
+               'H2': 'J8',
+               'I2': 'J9',
+               'B3': 'I2',
+               'D3': 'I4',
+               'E3': 'I5',
+               'F3': 'I6',
+               'G3': 'I7',
+               'H3': 'I8',
+               'J3': 'I10',
+               'B4': 'H2',
+               'C4': 'H3',
+               'E4': 'H5',
+               'F4': 'H6',
+               'G4': 'H7',
+               'I4': 'H9',
+               'J4': 'H10',
+               'B5': 'G2',
+               'C5': 'G3',
+               'D5': 'G4',
+               'F5': 'G6',
+               'H5': 'G8',
+               'I5': 'G9',
+               'J5': 'G10',
+               'B6': 'F2',
+               'C6': 'F3',
+               'D6': 'F4',
+               'E6': 'F5',
+               'F6': 'F6',
+               'G6': 'F7',
+               'H6': 'F8',
+               'I6': 'F9',
+               'J6': 'F10',
+               'B7': 'E2',
+               'C7': 'E3',
+               'D7': 'E4',
+               'F7': 'E6',
+               'H7': 'E8',
+               'I7': 'E9',
+               'J7': 'E10',
+               'B8': 'D2',
+               'C8': 'D3',
+               'E8': 'D5',
+               'F8': 'D6',
+               'G8': 'D7',
+               'I8': 'D9',
+               'J8': 'D10',
+               'B9': 'C2',
+               'D9': 'C4',
+               'E9': 'C5',
+               'F9': 'C6',
+               'G9': 'C7',
+               'H9': 'C8',
+               'J9': 'C10',
+               'C10': 'B3',
+               'D10': 'B4',
+               'E10': 'B5',
+               'F10': 'B6',
+               'G10': 'B7',
+               'H10': 'B8',
+               'I10': 'B9',
+               'A11': 'A1',
+               'K11': 'A11'},
+ 'rotate_270': {'A1': 'A11',
+                'K1': 'A1',
+                'C2': 'B9',
+                'D2': 'B8',
+                'E2': 'B7',
+                'F2': 'B6',
+                'G2': 'B5',
+                'H2': 'B4',
+                'I2': 'B3',
+                'B3': 'C10',
+                'D3': 'C8',
+                'E3': 'C7',
+                'F3': 'C6',
+                'G3': 'C5',
+                'H3': 'C4',
+                'J3': 'C2',
+                'B4': 'D10',
+                'C4': 'D9',
+                'E4': 'D7',
+                'F4': 'D6',
+                'G4': 'D5',
+                'I4': 'D3',
+                'J4': 'D2',
+                'B5': 'E10',
+                'C5': 'E9',
+                'D5': 'E8',
+                'F5': 'E6',
+                'H5': 'E4',
+                'I5': 'E3',
+                'J5': 'E2',
+                'B6': 'F10',
+                'C6': 'F9',
+                'D6': 'F8',
+                'E6': 'F7',
+                'F6': 'F6',
+                'G6': 'F5',
+                'H6': 'F4',
+                'I6': 'F3',
+                'J6': 'F2',
+                'B7': 'G10',
+                'C7': 'G9',
+                'D7': 'G8',
+                'F7': 'G6',
+                'H7': 'G4',
+                'I7': 'G3',
+                'J7': 'G2',
+                'B8': 'H10',
+                'C8': 'H9',
+                'E8': 'H7',
+                'F8': 'H6',
+                'G8': 'H5',
+                'I8': 'H3',
+                'J8': 'H2',
+                'B9': 'I10',
+                'D9': 'I8',
+                'E9': 'I7',
+                'F9': 'I6',
+                'G9': 'I5',
+                'H9': 'I4',
+                'J9': 'I2',
+                'C10': 'J9',
+                'D10': 'J8',
+                'E10': 'J7',
+                'F10': 'J6',
+                'G10': 'J5',
+                'H10': 'J4',
+                'I10': 'J3',
+                'A11': 'K11',
+                'K11': 'K1'}}
+
+SYMMETRY_CELLS = {'identity': {(1, 1): (1, 1),
+              (1, 3): (1, 3),
+              (1, 5): (1, 5),
+              (1, 7): (1, 7),
+              (1, 9): (1, 9),
+              (2, 2): (2, 2),
+              (2, 4): (2, 4),
+              (2, 6): (2, 6),
+              (2, 8): (2, 8),
+              (3, 1): (3, 1),
+              (3, 3): (3, 3),
+              (3, 5): (3, 5),
+              (3, 7): (3, 7),
+              (3, 9): (3, 9),
+              (4, 2): (4, 2),
+              (4, 4): (4, 4),
+              (4, 6): (4, 6),
+              (4, 8): (4, 8),
+              (5, 1): (5, 1),
+              (5, 3): (5, 3),
+              (5, 5): (5, 5),
+              (5, 7): (5, 7),
+              (5, 9): (5, 9),
+              (6, 2): (6, 2),
+              (6, 4): (6, 4),
+              (6, 6): (6, 6),
+              (6, 8): (6, 8),
+              (7, 1): (7, 1),
+              (7, 3): (7, 3),
+              (7, 5): (7, 5),
+              (7, 7): (7, 7),
+              (7, 9): (7, 9),
+              (8, 2): (8, 2),
+              (8, 4): (8, 4),
+              (8, 6): (8, 6),
+              (8, 8): (8, 8),
+              (9, 1): (9, 1),
+              (9, 3): (9, 3),
+              (9, 5): (9, 5),
+              (9, 7): (9, 7),
+              (9, 9): (9, 9)},
+ 'flip_columns': {(1, 1): (9, 1),
+                  (1, 3): (9, 3),
+                  (1, 5): (9, 5),
+                  (1, 7): (9, 7),
+                  (1, 9): (9, 9),
+                  (2, 2): (8, 2),
+                  (2, 4): (8, 4),
+                  (2, 6): (8, 6),
+                  (2, 8): (8, 8),
+                  (3, 1): (7, 1),
+                  (3, 3): (7, 3),
+                  (3, 5): (7, 5),
+                  (3, 7): (7, 7),
+                  (3, 9): (7, 9),
+                  (4, 2): (6, 2),
+                  (4, 4): (4, 6),
+                  (4, 6): (4, 4),
+                  (4, 8): (6, 8),
+                  (5, 1): (5, 1),
+                  (5, 3): (5, 3),
+                  (5, 5): (5, 5),
+                  (5, 7): (5, 7),
+                  (5, 9): (5, 9),
+                  (6, 2): (4, 2),
+                  (6, 4): (6, 6),
+                  (6, 6): (6, 4),
+                  (6, 8): (4, 8),
+                  (7, 1): (3, 1),
+                  (7, 3): (3, 3),
+                  (7, 5): (3, 5),
+                  (7, 7): (3, 7),
+                  (7, 9): (3, 9),
+                  (8, 2): (2, 2),
+                  (8, 4): (2, 4),
+                  (8, 6): (2, 6),
+                  (8, 8): (2, 8),
+                  (9, 1): (1, 1),
+                  (9, 3): (1, 3),
+                  (9, 5): (1, 5),
+                  (9, 7): (1, 7),
+                  (9, 9): (1, 9)},
+ 'flip_rows': {(1, 1): (1, 9),
+               (1, 3): (1, 7),
+               (1, 5): (1, 5),
+               (1, 7): (1, 3),
+               (1, 9): (1, 1),
+               (2, 2): (2, 8),
+               (2, 4): (2, 6),
+               (2, 6): (2, 4),
+               (2, 8): (2, 2),
+               (3, 1): (3, 9),
+               (3, 3): (3, 7),
+               (3, 5): (3, 5),
+               (3, 7): (3, 3),
+               (3, 9): (3, 1),
+               (4, 2): (4, 8),
+               (4, 4): (6, 4),
+               (4, 6): (6, 6),
+               (4, 8): (4, 2),
+               (5, 1): (5, 9),
+               (5, 3): (5, 7),
+               (5, 5): (5, 5),
+               (5, 7): (5, 3),
+               (5, 9): (5, 1),
+               (6, 2): (6, 8),
+               (6, 4): (4, 4),
+               (6, 6): (4, 6),
+               (6, 8): (6, 2),
+               (7, 1): (7, 9),
+               (7, 3): (7, 7),
+               (7, 5): (7, 5),
+               (7, 7): (7, 3),
+               (7, 9): (7, 1),
+               (8, 2): (8, 8),
+               (8, 4): (8, 6),
+               (8, 6): (8, 4),
+               (8, 8): (8, 2),
+               (9, 1): (9, 9),
+               (9, 3): (9, 7),
+               (9, 5): (9, 5),
+               (9, 7): (9, 3),
+               (9, 9): (9, 1)},
+ 'rotate_180': {(1, 1): (9, 9),
+                (1, 3): (9, 7),
+                (1, 5): (9, 5),
+                (1, 7): (9, 3),
+                (1, 9): (9, 1),
+                (2, 2): (8, 8),
+                (2, 4): (8, 6),
+                (2, 6): (8, 4),
+                (2, 8): (8, 2),
+                (3, 1): (7, 9),
+                (3, 3): (7, 7),
+                (3, 5): (7, 5),
+                (3, 7): (7, 3),
+                (3, 9): (7, 1),
+                (4, 2): (6, 8),
+                (4, 4): (6, 6),
+                (4, 6): (6, 4),
+                (4, 8): (6, 2),
+                (5, 1): (5, 9),
+                (5, 3): (5, 7),
+                (5, 5): (5, 5),
+                (5, 7): (5, 3),
+                (5, 9): (5, 1),
+                (6, 2): (4, 8),
+                (6, 4): (4, 6),
+                (6, 6): (4, 4),
+                (6, 8): (4, 2),
+                (7, 1): (3, 9),
+                (7, 3): (3, 7),
+                (7, 5): (3, 5),
+                (7, 7): (3, 3),
+                (7, 9): (3, 1),
+                (8, 2): (2, 8),
+                (8, 4): (2, 6),
+                (8, 6): (2, 4),
+                (8, 8): (2, 2),
+                (9, 1): (1, 9),
+                (9, 3): (1, 7),
+                (9, 5): (1, 5),
+                (9, 7): (1, 3),
+                (9, 9): (1, 1)},
+ 'transpose': {(1, 1): (1, 1),
+               (1, 3): (3, 1),
+               (1, 5): (5, 1),
+               (1, 7): (7, 1),
+               (1, 9): (9, 1),
+               (2, 2): (2, 2),
+               (2, 4): (4, 2),
+               (2, 6): (6, 2),
+               (2, 8): (8, 2),
+               (3, 1): (1, 3),
+               (3, 3): (3, 3),
+               (3, 5): (5, 3),
+               (3, 7): (7, 3),
+               (3, 9): (9, 3),
+               (4, 2): (2, 4),
+               (4, 4): (4, 4),
+               (4, 6): (6, 4),
+               (4, 8): (8, 4),
+               (5, 1): (1, 5),
+               (5, 3): (3, 5),
+               (5, 5): (5, 5),
+               (5, 7): (7, 5),
+               (5, 9): (9, 5),
+               (6, 2): (2, 6),
+               (6, 4): (4, 6),
+               (6, 6): (6, 6),
+               (6, 8): (8, 6),
+               (7, 1): (1, 7),
+               (7, 3): (3, 7),
+               (7, 5): (5, 7),
+               (7, 7): (7, 7),
+               (7, 9): (9, 7),
+               (8, 2): (2, 8),
+               (8, 4): (4, 8),
+               (8, 6): (6, 8),
+               (8, 8): (8, 8),
+               (9, 1): (1, 9),
+               (9, 3): (3, 9),
+               (9, 5): (5, 9),
+               (9, 7): (7, 9),
+               (9, 9): (9, 9)},
+ 'anti_transpose': {(1, 1): (9, 9),
+                    (1, 3): (7, 9),
+                    (1, 5): (5, 9),
+                    (1, 7): (3, 9),
+                    (1, 9): (1, 9),
+                    (2, 2): (8, 8),
+                    (2, 4): (6, 8),
+                    (2, 6): (4, 8),
+                    (2, 8): (2, 8),
+                    (3, 1): (9, 7),
+                    (3, 3): (7, 7),
+                    (3, 5): (5, 7),
+                    (3, 7): (3, 7),
+                    (3, 9): (1, 7),
+                    (4, 2): (8, 6),
+                    (4, 4): (6, 6),
+                    (4, 6): (4, 6),
+                    (4, 8): (2, 6),
+                    (5, 1): (9, 5),
+                    (5, 3): (7, 5),
+                    (5, 5): (5, 5),
+                    (5, 7): (3, 5),
+                    (5, 9): (1, 5),
+                    (6, 2): (8, 4),
+                    (6, 4): (6, 4),
+                    (6, 6): (4, 4),
+                    (6, 8): (2, 4),
+                    (7, 1): (9, 3),
+                    (7, 3): (7, 3),
+                    (7, 5): (5, 3),
+                    (7, 7): (3, 3),
+                    (7, 9): (1, 3),
+                    (8, 2): (8, 2),
+                    (8, 4): (6, 2),
+                    (8, 6): (4, 2),
+                    (8, 8): (2, 2),
+                    (9, 1): (9, 1),
+                    (9, 3): (7, 1),
+                    (9, 5): (5, 1),
+                    (9, 7): (3, 1),
+                    (9, 9): (1, 1)},
+ 'rotate_90': {(1, 1): (9, 1),
+               (1, 3): (7, 1),
+               (1, 5): (5, 1),
+               (1, 7): (3, 1),
+               (1, 9): (1, 1),
+               (2, 2): (8, 2),
+               (2, 4): (6, 2),
+               (2, 6): (4, 2),
+               (2, 8): (2, 2),
+               (3, 1): (9, 3),
+               (3, 3): (7, 3),
+               (3, 5): (5, 3),
+               (3, 7): (3, 3),
+               (3, 9): (1, 3),
+               (4, 2): (8, 4),
+               (4, 4): (4, 6),
+               (4, 6): (6, 6),
+               (4, 8): (2, 4),
+               (5, 1): (9, 5),
+               (5, 3): (7, 5),
+               (5, 5): (5, 5),
+               (5, 7): (3, 5),
+               (5, 9): (1, 5),
+               (6, 2): (8, 6),
+               (6, 4): (4, 4),
+               (6, 6): (6, 4),
+               (6, 8): (2, 6),
+               (7, 1): (9, 7),
+               (7, 3): (7, 7),
+               (7, 5): (5, 7),
+               (7, 7): (3, 7),
+               (7, 9): (1, 7),
+               (8, 2): (8, 8),
+               (8, 4): (6, 8),
+               (8, 6): (4, 8),
+               (8, 8): (2, 8),
+               (9, 1): (9, 9),
+               (9, 3): (7, 9),
+               (9, 5): (5, 9),
+               (9, 7): (3, 9),
+               (9, 9): (1, 9)},
+ 'rotate_270': {(1, 1): (1, 9),
+                (1, 3): (3, 9),
+                (1, 5): (5, 9),
+                (1, 7): (7, 9),
+                (1, 9): (9, 9),
+                (2, 2): (2, 8),
+                (2, 4): (4, 8),
+                (2, 6): (6, 8),
+                (2, 8): (8, 8),
+                (3, 1): (1, 7),
+                (3, 3): (3, 7),
+                (3, 5): (5, 7),
+                (3, 7): (7, 7),
+                (3, 9): (9, 7),
+                (4, 2): (2, 6),
+                (4, 4): (6, 4),
+                (4, 6): (4, 4),
+                (4, 8): (8, 6),
+                (5, 1): (1, 5),
+                (5, 3): (3, 5),
+                (5, 5): (5, 5),
+                (5, 7): (7, 5),
+                (5, 9): (9, 5),
+                (6, 2): (2, 4),
+                (6, 4): (6, 6),
+                (6, 6): (4, 6),
+                (6, 8): (8, 4),
+                (7, 1): (1, 3),
+                (7, 3): (3, 3),
+                (7, 5): (5, 3),
+                (7, 7): (7, 3),
+                (7, 9): (9, 3),
+                (8, 2): (2, 2),
+                (8, 4): (4, 2),
+                (8, 6): (6, 2),
+                (8, 8): (8, 2),
+                (9, 1): (1, 1),
+                (9, 3): (3, 1),
+                (9, 5): (5, 1),
+                (9, 7): (7, 1),
+                (9, 9): (9, 1)}}
@@ -1,26 +1,45 @@
+import importlib
 import logging
-import PySimpleGUI as sg
+import os
 import conhex_board
 import constants as ct
+from conhex_geometry import SCALED_BORDER_POLYS, SCALED_CELL_POLYS
+
+
+def load_toolkit() -> object:
+    """Imports PySimpleGUI. It's only imported when a GUI is created, so
+    importing this module (or the game modules) doesn't need it.
+
+    Returns:
+        object: the PySimpleGUI module
+    """
+    return importlib.import_module('PySimpleGUI')
 
 
 class ConHex_GUI:
     """GUI for the game ConHex
     """
 
-    def __init__(self, board: conhex_board.Conhex_game) -> None:
+    def __init__(self, board: conhex_board.Conhex_game,
+                 book: object = None) -> None:
         """Initializes the GUI. Needs an Conhex_game instance to display
 
         Args:
             board (conhex_board.Conhex_game): initialized game to display
+            book (object): conhex_book.Opening_book for the book move
+                           button; None to disable the button
         """
         self.logger = logging.getLogger(ct.LOGGER)
         self.logger.info(f'Started logger for {self.__class__.__name__}')
 
         self.board = board
+        self.book = book
+        self.sg = sg = load_toolkit()
 
         menu = sg.Menu([[ct.MENU_EXIT]])
-        buttons = [[sg.Button(ct.BUTTON_RESET,  ct.BUTTON_SIZE)]]
+        buttons = [[sg.Button(ct.BUTTON_RESET,  ct.BUTTON_SIZE),
+                    sg.Button(ct.BUTTON_UNDO, ct.BUTTON_SIZE),
+                    sg.Button(ct.BUTTON_BOOK, disabled=book is None)]]
         self.graph = sg.Graph(canvas_size=(ct.CANVAS_SIZE, ct.CANVAS_SIZE),
                               graph_bottom_left=ct.GRAPH_BOTTOM_LEFT,
                               graph_top_right=ct.GRAPH_TOP_RIGHT,
@@ -35,35 +54,43 @@ class ConHex_GUI:
         ]
 
         self.window = sg.Window(ct.MAIN_WINDOW_TITLE, layout, finalize=True)
-        self.draw_board()
+        self._draw_figures()
 
-    def draw_board(self):
-        """Redraw the game board
+    def _draw_figures(self) -> None:
+        """Draws all figures of the board once, in the colours of the
+        current game, and keeps the ids of the cell and position figures
+        so draw_board can recolour them
         """
-        logging.debug('Redrawing board...')
+        self.logger.debug('Drawing board figures...')
         # Draw the borders
-        for player, poly_list in ct.BORDER_POLYS.items():
-            for poly in poly_list:
-                self.graph.draw_polygon(ct.scale_poly(poly),
+        for player in ct.BORDER_POLYS:
+            for poly in SCALED_BORDER_POLYS[player.name]:
+                self.graph.draw_polygon(poly,
                                         fill_color=ct.CELL_FILL_COLORS[player],
                                         line_color=ct.LINE_COLOR,
                                         line_width=ct.LINE_WIDTH)
 
         # Draw cells
+        self._cell_figures = {}
+        self._cell_colours = {}
         for player, cells in self.board.cells_conquered.items():
             for cell in cells:
-                self.graph.draw_polygon(ct.scale_poly(ct.CELL_POLYS[cell]),
-                                        fill_color=ct.CELL_FILL_COLORS[player],
-                                        line_color=ct.LINE_COLOR,
-                                        line_width=ct.LINE_WIDTH)
+                colour = ct.CELL_FILL_COLORS[player]
+                self._cell_figures[cell] = self.graph.draw_polygon(
+                    SCALED_CELL_POLYS[cell], fill_color=colour,
+                    line_color=ct.LINE_COLOR, line_width=ct.LINE_WIDTH)
+                self._cell_colours[cell] = colour
 
         # draw positions
+        self._position_figures = {}
+        self._position_colours = {}
         for pos, player in self.board._board.items():
-            self.graph.draw_circle(center_location=ct.position_to_xy(pos),
-                                   radius=ct.POSITION_RADIUS,
-                                   fill_color=ct.POSITION_FILL_COLORS[player],
-                                   line_color=ct.LINE_COLOR,
-                                   line_width=ct.LINE_WIDTH)
+            colour = ct.POSITION_FILL_COLORS[player]
+            self._position_figures[pos] = self.graph.draw_circle(
+                center_location=ct.position_to_xy(pos),
+                radius=ct.POSITION_RADIUS, fill_color=colour,
+                line_color=ct.LINE_COLOR, line_width=ct.LINE_WIDTH)
+            self._position_colours[pos] = colour
 
         # draw labels
         for value in range(1, 12):
@@ -72,9 +99,44 @@ class ConHex_GUI:
             self.graph.draw_text(str(value), location=loc1)
             self.graph.draw_text(chr(value + 64), location=loc2)
 
+    def draw_board(self, positions: list = None) -> None:
+        """Updates the board to the game by recolouring the figures of
+        positions and their cells. No figures are added to the canvas.
+
+        Args:
+            positions (list): positions that changed, e.g. the last move;
+                              None to update the whole board
+        """
+        if positions is None:
+            positions = ct.POSITIONS
+            cells = ct.CELLS
+        else:
+            cells = {cell for pos in positions
+                     for cell in ct.POSITION_CELLS[pos]}
+        self.logger.debug(f'Redrawing {len(positions)} positions and '
+                          f'{len(cells)} cells...')
+
+        canvas = self.graph.TKCanvas
+        board = self.board._board
+        owners = {cell: owner
+                  for owner, owned in self.board.cells_conquered.items()
+                  for cell in owned}
+        for cell in cells:
+            colour = ct.CELL_FILL_COLORS[owners[cell]]
+            if self._cell_colours[cell] != colour:
+                canvas.itemconfig(self._cell_figures[cell], fill=colour)
+                self._cell_colours[cell] = colour
+
+        for pos in positions:
+            colour = ct.POSITION_FILL_COLORS[board[pos]]
+            if self._position_colours[pos] != colour:
+                canvas.itemconfig(self._position_figures[pos], fill=colour)
+                self._position_colours[pos] = colour
+
     def run_eventloop(self) -> None:
         """Event loop of the GUI
         """
+        sg = self.sg
         while True:
             event, values = self.window.read()
             self.logger.debug(f'Received {event=} with {values=}')
@@ -86,18 +148,38 @@ class ConHex_GUI:
                 self.board.reset()
                 self.draw_board()
 
+            elif event == ct.BUTTON_UNDO:
+                if self.board.moves:
+                    move = self.board.moves[-1]
+                    self.board.undo_move()
+                    self.draw_board([move])
+
+            elif event == ct.BUTTON_BOOK:
+                book_move = (None if self.board.game_won()
+                             else self.book.lookup(self.board))
+                if book_move:
+                    self.board.play_move(book_move.move)
+                    self.draw_board([book_move.move])
+                else:
+                    sg.popup_quick_message('No book move for this position')
+
             elif event == ct.BOARDNAME:
                 move = ct.xy_to_position(values[ct.BOARDNAME])
-                if move in self.board.free_positions():
+                if move in self.board.free_positions_view():
                     self.board.play_move(move)
-                    self.draw_board()
+                    self.draw_board([move])
 
 
 def main():
     """Mail programm. Creates a game, GUI and runs the GUI's event loop
     """
+    ct.configure_logging()
     game = conhex_board.Conhex_game()
-    GUI = ConHex_GUI(game)
+    book = None
+    if os.path.exists(ct.BOOK_FILE):
+        from conhex_book import Opening_book
+        book = Opening_book(ct.BOOK_FILE)
+    GUI = ConHex_GUI(game, book)
     GUI.run_eventloop()
 
 
@@ -0,0 +1,94 @@
+import constants as ct
+import random
+
+
+#
+# Zobrist keys: one random 64 bit key per player and position, one per
+# player and cell and one for the side to move. Cells need their own keys,
+# because who owns a cell can depend on the move order. The seed is fixed
+# so hashes are equal between runs and processes.
+#
+ZOBRIST_SEED = 0xC0C4E8
+__random__ = random.Random(ZOBRIST_SEED)
+
+ZOBRIST_KEYS = {
+    player: {pos: __random__.getrandbits(64) for pos in ct.POSITIONS}
+    for player in (ct.BoardPosValue.PLAYER1, ct.BoardPosValue.PLAYER2)
+}
+
+ZOBRIST_CELL_KEYS = {
+    player: {cell: __random__.getrandbits(64) for cell in ct.CELLS}
+    for player in (ct.BoardPosValue.PLAYER1, ct.BoardPosValue.PLAYER2)
+}
+
+# XOR-ed into the hash when PLAYER2 is to move
+ZOBRIST_SIDE = __random__.getrandbits(64)
+
+
+class Transposition_table:
+    """Bounded table of search results, keyed by Zobrist hash
+
+    The table has a fixed number of slots; a hash maps to a single slot. An
+    entry is replaced by a different position if the new entry has at least
+    the same depth, or if the stored entry was made in an earlier search
+    (see new_search). This keeps deep (expensive) results of the current
+    search and lets stale ones be overwritten.
+    """
+
+    def __init__(self, size: int = 1 << 20) -> None:
+        """Initializes an empty table
+
+        Args:
+            size (int): number of slots
+        """
+        self.size = size
+        self._slots = [None] * size
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def new_search(self) -> None:
+        """Marks all stored entries as made by an earlier search
+        """
+        self.generation += 1
+
+    def store(self, key: int, value: object, depth: int = 0) -> None:
+        """Stores a value for a position
+
+        Args:
+            key (int): Zobrist hash of the position
+            value (object): value to store
+            depth (int): search depth (or other cost) of the value
+        """
+        idx = key % self.size
+        entry = self._slots[idx]
+        if (entry is None or entry[0] == key or depth >= entry[1] or
+                entry[2] != self.generation):
+            self._slots[idx] = (key, depth, self.generation, value)
+
+    def lookup(self, key: int) -> object:
+        """Gives the stored value of a position
+
+        Args:
+            key (int): Zobrist hash of the position
+
+        Returns:
+            object: the stored value; None if the position isn't stored
+        """
+        entry = self._slots[key % self.size]
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            return entry[3]
+
+        self.misses += 1
+        return None
+
+    def clear(self) -> None:
+        """Removes all entries
+        """
+        self._slots = [None] * self.size
+        self.hits = self.misses = 0
+
+    def __len__(self) -> int:
+        """Gives the number of used slots"""
+        return sum(entry is not None for entry in self._slots)
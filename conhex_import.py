@@ -0,0 +1,215 @@
+import argparse
+import constants as ct
+import logging
+import multiprocessing
+import os
+import re
+import sys
+import time
+from conhex_bitboard import Conhex_bitboard
+from conhex_board import moves_to_bytes, parse_littlegolem
+from conhex_store import Game_store_writer
+
+
+# Property values, e.g. [Player 1]; parentheses inside them aren't structure
+PROPERTY_VALUE = re.compile(r'\[[^\]]*\]')
+
+
+def iter_files(paths: list) -> str:
+    """Gives the files of paths, walking directories recursively in sorted
+    order
+
+    Args:
+        paths (list): file and directory names
+
+    Yields:
+        str: file name
+    """
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    yield os.path.join(root, name)
+        else:
+            yield path
+
+
+def iter_records(paths: list) -> tuple:
+    """Streams the LittleGolem game records of files and directories. A
+    file may hold any number of concatenated records, on one or more lines.
+    Records that share a line are yielded together; see split_records.
+
+    Args:
+        paths (list): file and directory names
+
+    Yields:
+        tuple: file name, index of the chunk in the file and the text of
+               one or more whole records
+    """
+    for filename in iter_files(paths):
+        with open(filename, 'r', encoding='utf-8', errors='replace') as file:
+            index = 0
+            depth = 0
+            parts = []
+            for line in file:
+                structure = PROPERTY_VALUE.sub('', line)
+                if depth == 0 and '(' not in structure:
+                    continue  # text between records
+
+                parts.append(line)
+                depth += structure.count('(') - structure.count(')')
+                if depth <= 0:
+                    yield filename, index, ''.join(parts).strip()
+                    index += 1
+                    depth = 0
+                    parts = []
+
+            if parts:
+                # Unterminated record at the end of the file
+                yield filename, index, ''.join(parts).strip()
+
+
+def split_records(text: str) -> list:
+    """Splits the text of one or more concatenated records into records
+
+    Args:
+        text (str): one or more concatenated records
+
+    Returns:
+        list: the records
+    """
+    records = []
+    start = depth = 0
+    in_value = False
+    for idx, char in enumerate(text):
+        if char == '[':
+            in_value = True
+        elif char == ']':
+            in_value = False
+        elif not in_value and char == '(':
+            if depth == 0:
+                start = idx
+            depth += 1
+        elif not in_value and char == ')':
+            depth -= 1
+            if depth == 0:
+                records.append(text[start:idx + 1])
+    return records or [text]
+
+
+def replay_record(record: str, source: str = 'record') -> tuple:
+    """Parses and replays one record, validating every move
+
+    Args:
+        record (str): game record in LittleGolem format
+        source (str): name of the record, for error messages
+
+    Returns:
+        tuple: player names, winner (ct.BoardPosValue) and moves (bytes)
+
+    Raises:
+        ValueError: if the record can't be parsed or has an illegal move
+    """
+    player_names, moves = parse_littlegolem(record, source)
+    game = Conhex_bitboard()
+    for number, move in enumerate(moves, 1):
+        if game.game_won():
+            raise ValueError(f'Move {number} ({move}) in {source} is played '
+                             f'after the game was won')
+        try:
+            game.play_move(move)
+        except ValueError as error:
+            raise ValueError(f'Move {number} in {source}: {error}')
+    return tuple(player_names), game.winner, moves_to_bytes(game.moves)
+
+
+def _replay_task(task: tuple) -> tuple:
+    """Replays the records of one input record in a worker process
+
+    Args:
+        task (tuple): file name, chunk index and text, see iter_records
+
+    Returns:
+        tuple: file name, chunk index and a list with per game either
+               (player names, winner code, moves) or an error message
+    """
+    filename, index, text = task
+    results = []
+    for number, record in enumerate(split_records(text)):
+        source = f'{filename} record {index}.{number}'
+        try:
+            player_names, winner, moves = replay_record(record, source)
+            results.append((player_names, ct.WINNER_CODES[winner], moves))
+        except ValueError as error:
+            results.append(str(error))
+    return filename, index, results
+
+
+def import_games(paths: list, store: str, workers: int = None,
+                 errors: str = None, block_size: int = 4096) -> dict:
+    """Imports LittleGolem records into a game store, replaying them
+    across worker processes. Malformed records are skipped and reported.
+
+    Args:
+        paths (list): file and directory names to import
+        store (str): name of the game store file to write
+        workers (int): number of worker processes; None for all cores
+        errors (str): name of a file to write the skipped records to;
+                      None to only log them
+        block_size (int): number of games per block of the store
+
+    Returns:
+        dict: numbers of imported and skipped games, and games per second
+    """
+    logger = logging.getLogger(ct.LOGGER)
+    imported = skipped = 0
+    start = time.perf_counter()
+    error_file = open(errors, 'w') if errors else None
+    try:
+        with multiprocessing.Pool(workers) as pool, \
+                Game_store_writer(store, block_size) as writer:
+            for filename, index, results in pool.imap(
+                    _replay_task, iter_records(paths), chunksize=64):
+                for result in results:
+                    if isinstance(result, str):
+                        skipped += 1
+                        logger.warning(f'Skipped: {result}')
+                        if error_file:
+                            error_file.write(result + '\n')
+                    else:
+                        player_names, winner, moves = result
+                        writer.add(player_names, ct.WINNERS[winner], moves)
+                        imported += 1
+    finally:
+        if error_file:
+            error_file.close()
+
+    elapsed = time.perf_counter() - start
+    return {'imported': imported,
+            'skipped': skipped,
+            'games_per_second': ((imported + skipped) / elapsed
+                                 if elapsed else 0.0)}
+
+
+def main():
+    """Imports LittleGolem game records into a compact game store
+    """
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('store', help='game store file to write')
+    parser.add_argument('paths', nargs='+',
+                        help='record files and/or directories to import')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='number of worker processes (default: all cores)')
+    parser.add_argument('--errors', help='file to list skipped records in')
+    args = parser.parse_args()
+    ct.configure_logging()
+
+    result = import_games(args.paths, args.store, args.workers, args.errors)
+    print(f'Imported {result["imported"]} games, skipped '
+          f'{result["skipped"]} ({result["games_per_second"]:.0f} games/s)',
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
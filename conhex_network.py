@@ -0,0 +1,106 @@
+import constants as ct
+import logging
+import numpy as np
+from conhex_features import FEATURE_SIZE, POSITION_COUNT, free_positions
+
+
+class Policy_value_network:
+    """Policy/value network that runs on the CPU with NumPy
+
+    A multilayer perceptron with ReLU hidden layers over the features of
+    conhex_features, and two heads: the policy, a probability for every
+    free position of ct.POSITIONS, and the value, the expected result for
+    the player to move between -1 (loss) and 1 (win).
+
+    The weights are float32 arrays in an .npz file (see save and load).
+    predict works on a batch of positions; a batch costs about as much as
+    a single position up to tens of positions, so callers should evaluate
+    positions in batches.
+    """
+
+    def __init__(self, hidden: tuple = (128, 128), seed: int = 0,
+                 weights: dict = None) -> None:
+        """Initializes a network with random weights, or with given weights
+
+        Args:
+            hidden (tuple): number of units of each hidden layer
+            seed (int): random seed for the weights
+            weights (dict): name -> array of all weights, as written by
+                            save; None for random weights
+        """
+        self.logger = logging.getLogger(ct.LOGGER)
+        if weights is None:
+            rng = np.random.default_rng(seed)
+            sizes = (FEATURE_SIZE, *hidden)
+            weights = {}
+            for layer, (inputs, outputs) in enumerate(zip(sizes, sizes[1:])):
+                weights[f'hidden{layer}_w'] = rng.normal(
+                    0.0, np.sqrt(2.0 / inputs), (inputs, outputs))
+                weights[f'hidden{layer}_b'] = np.zeros(outputs)
+            weights['policy_w'] = rng.normal(
+                0.0, np.sqrt(1.0 / sizes[-1]), (sizes[-1], POSITION_COUNT))
+            weights['policy_b'] = np.zeros(POSITION_COUNT)
+            weights['value_w'] = rng.normal(
+                0.0, np.sqrt(1.0 / sizes[-1]), (sizes[-1], 1))
+            weights['value_b'] = np.zeros(1)
+
+        self.weights = {name: np.asarray(array, dtype=np.float32)
+                        for name, array in weights.items()}
+        self._hidden = [(self.weights[f'hidden{layer}_w'],
+                         self.weights[f'hidden{layer}_b'])
+                        for layer in range(len(self.weights))
+                        if f'hidden{layer}_w' in self.weights]
+        if self._hidden[0][0].shape[0] != FEATURE_SIZE:
+            raise ValueError(f'The network takes {self._hidden[0][0].shape[0]}'
+                             f' features instead of {FEATURE_SIZE}')
+
+    @classmethod
+    def load(cls, filename: str) -> 'Policy_value_network':
+        """Loads a network saved by save
+
+        Args:
+            filename (str): name of the .npz file
+
+        Returns:
+            Policy_value_network: the network
+
+        Raises:
+            ValueError: if the network doesn't fit the features
+        """
+        with np.load(filename) as weights:
+            return cls(weights=dict(weights))
+
+    def save(self, filename: str) -> None:
+        """Saves the weights to an .npz file
+
+        Args:
+            filename (str): name of the file
+        """
+        np.savez(filename, **self.weights)
+
+    def predict(self, features: np.ndarray) -> tuple:
+        """Evaluates a batch of positions
+
+        Args:
+            features (np.ndarray): (n, FEATURE_SIZE) features of the
+                                   positions (see conhex_features)
+
+        Returns:
+            tuple: (n, POSITION_COUNT) policies, which are 0 for taken
+                   positions and sum to 1 if any position is free, and (n)
+                   values for the players to move
+        """
+        x = features
+        for weight, bias in self._hidden:
+            x = np.maximum(x @ weight + bias, 0.0)
+
+        free = free_positions(features)
+        logits = np.where(free, x @ self.weights['policy_w'] +
+                          self.weights['policy_b'], -np.inf)
+        logits -= logits.max(axis=1, keepdims=True, initial=-1e30)
+        policy = np.exp(logits)
+        policy /= np.maximum(policy.sum(axis=1, keepdims=True), 1e-30)
+
+        value = np.tanh(x @ self.weights['value_w'] +
+                        self.weights['value_b'])[:, 0]
+        return policy, value
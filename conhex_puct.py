@@ -0,0 +1,360 @@
+import argparse
+import constants as ct
+import logging
+import math
+import numpy as np
+import time
+from conhex_bitboard import Conhex_bitboard
+from conhex_board import Conhex_game
+from conhex_features import Position_masks, encode_masks
+from conhex_hash import Transposition_table
+from conhex_network import Policy_value_network
+
+
+class Puct_node:
+    """Node of the PUCT search tree. The statistics of the moves of the
+    position are kept in arrays, indexed like moves, so a child is
+    selected with a few vectorised operations.
+    """
+    __slots__ = ('moves', 'priors', 'visits', 'values', 'children', 'total',
+                 'terminal')
+
+    def __init__(self, moves: list, priors: np.ndarray,
+                 terminal: bool = False) -> None:
+        """Initializes a node without statistics
+
+        Args:
+            moves (list): the free positions
+            priors (np.ndarray): policy probability of every move
+            terminal (bool): True if the game is won in this position
+        """
+        self.moves = moves
+        self.priors = priors
+        self.visits = np.zeros(len(moves))
+        self.values = np.zeros(len(moves))  # summed, for the player to move
+        self.children = [None] * len(moves)
+        self.total = 0
+        self.terminal = terminal
+
+    def select(self, exploration: float) -> int:
+        """Gives the index of the move with the highest PUCT score
+
+        Args:
+            exploration (float): PUCT exploration constant
+
+        Returns:
+            int: index in moves
+        """
+        visits = self.visits
+        scores = (self.values / np.maximum(visits, 1.0) +
+                  (exploration * math.sqrt(max(self.total, 1))) *
+                  self.priors / (1.0 + visits))
+        return int(scores.argmax())
+
+
+class ConHex_PUCT_Bot:
+    """Policy/value network guided search (PUCT, as in AlphaZero) for ConHex
+
+    The bot has the same interface as conhex_bot.ConHex_Bot. Instead of
+    random playouts, a position is evaluated by a Policy_value_network:
+    its policy gives the prior of every move and its value replaces the
+    playout result.
+
+    The simulations run in batches: every simulation descends the tree to
+    an unevaluated position and leaves a virtual loss on its path, so the
+    next simulations of the batch take other paths. The positions of the
+    batch are then evaluated by one call of the network, and the values
+    are backed up. Evaluations are cached by Zobrist hash, so positions
+    reached again (in this search, in an earlier move or by transposition)
+    aren't evaluated twice.
+    """
+
+    def __init__(self, time_limit: float = 1.0, simulations: int = None,
+                 network: object = None, batch_size: int = 32,
+                 exploration: float = 1.5, virtual_loss: float = 1.0,
+                 cache_size: int = 1 << 16) -> None:
+        """Initializes the bot
+
+        Args:
+            time_limit (float): maximum search time per move in seconds;
+                                None for no time limit
+            simulations (int): maximum number of simulations per move;
+                               None for no simulation limit
+            network (object): Policy_value_network, or any object with its
+                              predict method; None for an untrained network
+            batch_size (int): number of positions evaluated per network
+                              call
+            exploration (float): PUCT exploration constant
+            virtual_loss (float): value subtracted from a move for every
+                                  simulation of the batch that selected it
+            cache_size (int): number of slots of the evaluation cache
+
+        Raises:
+            ValueError: if neither time_limit nor simulations is given
+        """
+        if time_limit is None and simulations is None:
+            raise ValueError('Give a time_limit and/or a simulations budget.')
+
+        self.logger = logging.getLogger(ct.LOGGER)
+        self.logger.info(f'Started logger for {self.__class__.__name__}')
+        self.time_limit = time_limit
+        self.simulations = simulations
+        self.network = network or Policy_value_network()
+        self.batch_size = batch_size
+        self.exploration = exploration
+        self.virtual_loss = virtual_loss
+        self.cache = Transposition_table(cache_size)
+        self.statistics = {}
+        self._root = None
+
+    def get_move(self, game: Conhex_game) -> str:
+        """Searches the best move for the current player of game
+
+        Args:
+            game (Conhex_game): game to find a move for; it is not changed
+
+        Returns:
+            str: the best move found
+
+        Raises:
+            ValueError: if the game is already won or the board is full
+        """
+        board = Conhex_bitboard()
+        for move in game.moves:
+            board.play_move(move)
+
+        if board.game_won() or not board.free_positions_view():
+            raise ValueError('There are no moves to play in this game.')
+
+        hits, misses = self.cache.hits, self.cache.misses
+        evaluation = (self.cache.lookup(board.hash) or
+                      self._evaluate([board])[0])
+        self._root = root = self._expand(board, *evaluation)
+        deadline = (None if self.time_limit is None
+                    else time.perf_counter() + self.time_limit)
+        start = time.perf_counter()
+        simulations = batches = evaluated = 0
+        while ((self.simulations is None or simulations < self.simulations)
+               and (deadline is None or time.perf_counter() < deadline)):
+            size = self.batch_size
+            if self.simulations is not None:
+                size = min(size, self.simulations - simulations)
+            evaluated += self._run_batch(root, board, size)
+            simulations += size
+            batches += 1
+
+        elapsed = time.perf_counter() - start
+        lookups = self.cache.hits - hits + self.cache.misses - misses
+        best = int(root.visits.argmax())
+        self.statistics = {
+            'simulations': simulations,
+            'simulations_per_second': (simulations / elapsed if elapsed
+                                       else 0.0),
+            'network_batches': batches,
+            'mean_batch_size': evaluated / batches if batches else 0.0,
+            'cache_hit_rate': ((self.cache.hits - hits) / lookups if lookups
+                               else 0.0),
+            'value': float(root.values[best] / max(root.visits[best], 1.0)),
+            'principal_variation': self.principal_variation(),
+        }
+        self.logger.info(f'Search statistics: {self.statistics}')
+        return root.moves[best]
+
+    def principal_variation(self) -> list:
+        """Gives the most visited line of play of the current search tree
+
+        Returns:
+            list: moves of the principal variation
+        """
+        result = []
+        node = self._root
+        while node is not None and not node.terminal and node.total:
+            best = int(node.visits.argmax())
+            result.append(node.moves[best])
+            node = node.children[best]
+        return result
+
+    def _evaluate(self, boards: list) -> list:
+        """Evaluates positions with the network, in one batch
+
+        Args:
+            boards (list): Conhex_bitboard of the positions
+
+        Returns:
+            list: policy over ct.POSITIONS and value for the player to move
+                  of every position
+        """
+        player1, player2 = ct.BoardPosValue.PLAYER1, ct.BoardPosValue.PLAYER2
+        features = encode_masks([
+            Position_masks(board._positions[player1],
+                           board._positions[player2], board._cells[player1],
+                           board._cells[player2],
+                           board.current_player is player2)
+            for board in boards])
+        policies, values = self.network.predict(features)
+        results = []
+        for board, policy, value in zip(boards, policies, values):
+            result = (policy, float(value))
+            self.cache.store(board.hash, result)
+            results.append(result)
+        return results
+
+    def _expand(self, board: Conhex_bitboard, policy: np.ndarray,
+                value: float = None) -> Puct_node:
+        """Makes the node of a position from its evaluation
+
+        Args:
+            board (Conhex_bitboard): the position
+            policy (np.ndarray): network policy over ct.POSITIONS
+            value (float): network value; not used
+
+        Returns:
+            Puct_node: the node
+        """
+        moves = board.free_positions()
+        priors = policy[[ct.POSITION_INDEX[move] for move in moves]]
+        total = priors.sum()
+        priors = priors / total if total > 0 else np.full(len(moves),
+                                                          1 / len(moves))
+        return Puct_node(moves, priors)
+
+    def _backup(self, path: list, value: float) -> None:
+        """Backs up the value of a position along the path to it and takes
+        the virtual losses of the path back
+
+        Args:
+            path (list): (node, move index) of the moves to the position
+            value (float): value for the player to move in the position
+        """
+        virtual_loss = self.virtual_loss
+        for node, idx in reversed(path):
+            value = -value
+            node.values[idx] += value + virtual_loss
+
+    def _run_batch(self, root: Puct_node, board: Conhex_bitboard,
+                   size: int) -> int:
+        """Runs a batch of simulations and evaluates their new positions
+        with one network call
+
+        Args:
+            root (Puct_node): root of the tree
+            board (Conhex_bitboard): position of root; it is restored
+            size (int): number of simulations
+
+        Returns:
+            int: number of positions evaluated by the network
+        """
+        exploration = self.exploration
+        virtual_loss = self.virtual_loss
+        pending = {}  # hash -> (copy of the board, paths to the position)
+        for _ in range(size):
+            # Selection, with a virtual loss on every move of the path
+            node = root
+            path = []
+            while True:
+                idx = node.select(exploration)
+                node.visits[idx] += 1
+                node.values[idx] -= virtual_loss
+                node.total += 1
+                path.append((node, idx))
+                board.play_move(node.moves[idx])
+                child = node.children[idx]
+                if child is None or child.terminal:
+                    break
+                node = child
+
+            # The player that moved last won; the player to move lost
+            if child is not None or board.game_won():
+                if child is None:
+                    node.children[idx] = Puct_node([], None, terminal=True)
+                self._backup(path, -1.0)
+            else:
+                evaluation = self.cache.lookup(board.hash)
+                if evaluation is not None:
+                    node.children[idx] = self._expand(board, *evaluation)
+                    self._backup(path, evaluation[1])
+                elif board.hash in pending:
+                    pending[board.hash][1].append(path)
+                else:
+                    pending[board.hash] = (board.clone(), [path])
+
+            for _ in path:
+                board.undo_move()
+
+        if pending:
+            boards = [position for position, _ in pending.values()]
+            for (position, paths), evaluation in zip(
+                    pending.values(), self._evaluate(boards)):
+                for path in paths:
+                    node, idx = path[-1]
+                    if node.children[idx] is None:
+                        node.children[idx] = self._expand(position,
+                                                          *evaluation)
+                    self._backup(path, evaluation[1])
+        return len(pending)
+
+
+def benchmark_batch_sizes(batch_sizes: list, time_limit: float,
+                          network: object = None) -> dict:
+    """Measures the simulations per second of the first move for each
+    batch size
+
+    Args:
+        batch_sizes (list): the batch sizes
+        time_limit (float): search time per batch size in seconds
+        network (object): the network; None for an untrained network
+
+    Returns:
+        dict: batch size -> simulations per second
+    """
+    results = {}
+    for batch_size in batch_sizes:
+        bot = ConHex_PUCT_Bot(time_limit, network=network,
+                              batch_size=batch_size)
+        bot.get_move(Conhex_bitboard())
+        results[batch_size] = bot.statistics['simulations_per_second']
+        speedup = results[batch_size] / results[batch_sizes[0]]
+        print(f'Batch size {batch_size:3d}: {results[batch_size]:8.0f} '
+              f'simulations/s ({speedup:.2f}x)')
+    return results
+
+
+def main():
+    """Plays the network bot against itself and prints the search
+    statistics, or compares batch sizes with --benchmark
+    """
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('--network',
+                        help='network weights (.npz); default: untrained')
+    parser.add_argument('--time', type=float, default=1.0,
+                        help='search time per move in seconds')
+    parser.add_argument('--batch-size', type=int, default=32,
+                        help='positions per network evaluation')
+    parser.add_argument('--benchmark', action='store_true',
+                        help='measure simulations/s for batch sizes 1, 2, '
+                             '4, ... up to --batch-size')
+    args = parser.parse_args()
+    ct.configure_logging()
+
+    network = (Policy_value_network.load(args.network) if args.network
+               else None)
+    if args.benchmark:
+        benchmark_batch_sizes([2 ** i for i in
+                               range(args.batch_size.bit_length())],
+                              args.time, network)
+        return
+
+    game = Conhex_game()
+    bot = ConHex_PUCT_Bot(time_limit=args.time, network=network,
+                          batch_size=args.batch_size)
+    while not game.game_won() and game.free_positions_view():
+        move = bot.get_move(game)
+        print(f'{str(game.current_player)} plays {move}: {bot.statistics}')
+        game.play_move(move)
+
+    print(f'The game is won by {game.winner}')
+    print(game)
+
+
+if __name__ == "__main__":
+    main()
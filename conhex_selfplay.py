@@ -0,0 +1,160 @@
+import argparse
+import constants as ct
+import logging
+import multiprocessing
+import random
+import sys
+import time
+from conhex_bitboard import Conhex_bitboard
+from conhex_board import bytes_to_moves, moves_to_bytes
+from conhex_bot import ConHex_Bot
+
+
+PLAYER_TYPES = ('random', 'bot', 'puct')
+
+
+def play_game(player_types: tuple, seed: int, playouts: int = None,
+              time_limit: float = None, network_file: str = None) -> tuple:
+    """Plays one game between two players
+
+    Args:
+        player_types (tuple): type (one of PLAYER_TYPES) of player 1 and 2
+        seed (int): seed for the random players and bots
+        playouts (int): playout (or simulation) budget per move of a bot
+        time_limit (float): time budget per move of a bot in seconds
+        network_file (str): network weights of the 'puct' bots; None for
+                            an untrained network
+
+    Returns:
+        tuple: the winner (ct.BoardPosValue) and the list of moves
+    """
+    rng = random.Random(seed)
+    players = {}
+    for player, player_type in zip((ct.BoardPosValue.PLAYER1,
+                                    ct.BoardPosValue.PLAYER2), player_types):
+        if player_type == 'bot':
+            players[player] = ConHex_Bot(time_limit, playouts,
+                                         seed=rng.getrandbits(32))
+        elif player_type == 'puct':
+            from conhex_network import Policy_value_network
+            from conhex_puct import ConHex_PUCT_Bot
+            network = (Policy_value_network.load(network_file)
+                       if network_file else None)
+            players[player] = ConHex_PUCT_Bot(time_limit, playouts, network)
+        else:
+            players[player] = None
+
+    game = Conhex_bitboard()
+    while not game.game_won() and game.free_positions_view():
+        bot = players[game.current_player]
+        if bot is None:
+            game.play_move(game.random_free_position(rng))
+        else:
+            game.play_move(bot.get_move(game))
+
+    return game.winner, game.moves
+
+
+def _play_game_task(task: tuple) -> tuple:
+    """Plays a game in a worker process
+
+    Args:
+        task (tuple): game number followed by the arguments of play_game
+
+    Returns:
+        tuple: game number, winner code and moves encoded by moves_to_bytes
+    """
+    number, *args = task
+    winner, moves = play_game(*args)
+    return number, ct.WINNER_CODES[winner], moves_to_bytes(moves)
+
+
+def read_results(filename: str) -> tuple:
+    """Reads the games of a results file written by run_selfplay, one game
+    at a time
+
+    Args:
+        filename (str): name of the results file
+
+    Yields:
+        tuple: game number, winner (ct.BoardPosValue) and list of moves
+    """
+    with open(filename, 'r') as file:
+        for line in file:
+            number, winner, length, moves = line.split()
+            yield (int(number), ct.WINNERS[int(winner)],
+                   bytes_to_moves(bytes.fromhex(moves)))
+
+
+def run_selfplay(filename: str, games: int, player_types: tuple,
+                 workers: int = None, seed: int = 0, playouts: int = None,
+                 time_limit: float = None, network_file: str = None) -> dict:
+    """Plays games across worker processes and writes every finished game
+    as a line '<number> <winner> <length> <moves>' to a results file, where
+    winner is a code of ct.WINNER_CODES and moves is the hexadecimal
+    moves_to_bytes encoding
+
+    Args:
+        filename (str): name of the results file
+        games (int): number of games to play
+        player_types (tuple): type (one of PLAYER_TYPES) of player 1 and 2
+        workers (int): number of worker processes; None for all cores
+        seed (int): seed of the first game; game i uses seed + i
+        playouts (int): playout budget per move of a bot
+        time_limit (float): time budget per move of a bot in seconds
+        network_file (str): network weights of the 'puct' bots
+
+    Returns:
+        dict: number of games won per winner code and games per second
+    """
+    logger = logging.getLogger(ct.LOGGER)
+    tasks = ((number, player_types, seed + number, playouts, time_limit,
+              network_file)
+             for number in range(games))
+    wins = dict.fromkeys(ct.WINNER_CODES.values(), 0)
+    start = time.perf_counter()
+    with multiprocessing.Pool(workers) as pool, open(filename, 'w') as file:
+        for count, (number, winner, moves) in enumerate(
+                pool.imap_unordered(_play_game_task, tasks), 1):
+            file.write(f'{number} {winner} {len(moves)} {moves.hex()}\n')
+            file.flush()
+            wins[winner] += 1
+            logger.info(f'Game {number} won by {winner} in {len(moves)} '
+                        f'moves; {count / (time.perf_counter() - start):.2f}'
+                        f' games/s')
+
+    elapsed = time.perf_counter() - start
+    return {'wins': wins,
+            'games_per_second': games / elapsed if elapsed else 0.0}
+
+
+def main():
+    """Plays self-play games and streams the results to a file
+    """
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('output', help='results file to write')
+    parser.add_argument('--games', type=int, default=100,
+                        help='number of games to play')
+    parser.add_argument('--player1', choices=PLAYER_TYPES, default='random')
+    parser.add_argument('--player2', choices=PLAYER_TYPES, default='random')
+    parser.add_argument('--playouts', type=int, default=1000,
+                        help='playout (or simulation) budget per bot move')
+    parser.add_argument('--time', type=float, default=None,
+                        help='time budget per bot move in seconds')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='number of worker processes (default: all cores)')
+    parser.add_argument('--network',
+                        help="network weights (.npz) of the 'puct' bots")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    ct.configure_logging()
+
+    result = run_selfplay(args.output, args.games,
+                          (args.player1, args.player2), args.workers,
+                          args.seed, args.playouts, args.time, args.network)
+    print(f'Wins: {result["wins"]}', file=sys.stderr)
+    print(f'{result["games_per_second"]:.2f} games/s', file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,404 @@
+import argparse
+import asyncio
+import concurrent.futures
+import constants as ct
+import itertools
+import json
+import logging
+import os
+from conhex_bitboard import Conhex_bitboard
+from conhex_board import (Conhex_game, bytes_to_moves, moves_to_bytes,
+                          parse_littlegolem)
+from conhex_bot import ConHex_Bot
+
+
+#
+# Game server: hosts many games in one process. Clients connect over TCP
+# and send one JSON object per line; every request gets one JSON line back
+# with the same "id". Requests of one connection are handled concurrently,
+# so responses can come back in another order than the requests.
+#
+#   {"id": 1, "op": "new", "bot": "PLAYER2"}          start a game; "bot"
+#                                                     (optional) is the
+#                                                     side the bot plays,
+#                                                     "names" (optional)
+#                                                     the player names and
+#                                                     "record" (optional) a
+#                                                     LittleGolem record to
+#                                                     start from
+#   {"id": 2, "op": "move", "game": 1, "move": "F6"}  play a move; the bot
+#                                                     answers it if it is
+#                                                     the bot's turn
+#   {"id": 3, "op": "state", "game": 1}               give the game state
+#   {"id": 4, "op": "close", "game": 1}               end the game
+#
+# Games belong to the connection that started them and are ended when it
+# closes.
+#
+# Every response has "ok"; if it is false, "error" says why. Otherwise it
+# has the state of the game (see Game_server.state).
+#
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+POSITION_CHARS = {
+    ct.BoardPosValue.EMPTY: '.',
+    ct.BoardPosValue.PLAYER1: '1',
+    ct.BoardPosValue.PLAYER2: '2',
+}
+
+# Bot of a worker process, made by _init_worker
+_worker_bot = None
+
+
+def _init_worker(time_limit: float, playouts: int, book_file: str) -> None:
+    """Creates the bot of a worker process
+
+    Args:
+        time_limit (float): search time per move in seconds
+        playouts (int): playout budget per move
+        book_file (str): opening book file; None for no book
+    """
+    global _worker_bot
+    book = None
+    if book_file:
+        from conhex_book import Opening_book
+        book = Opening_book(book_file)
+    _worker_bot = ConHex_Bot(time_limit, playouts, book=book)
+
+
+def _bot_move(data: bytes) -> str:
+    """Searches a move with the bot of the worker process
+
+    Args:
+        data (bytes): moves of the game, encoded by moves_to_bytes
+
+    Returns:
+        str: the bot's move
+    """
+    board = Conhex_bitboard()
+    for move in bytes_to_moves(data):
+        board.play_move(move)
+    return _worker_bot.get_move(board)
+
+
+class Game_session:
+    """A game hosted by the server"""
+
+    def __init__(self, game: Conhex_game, bot: ct.BoardPosValue) -> None:
+        """Initializes a session
+
+        Args:
+            game (Conhex_game): the game
+            bot (ct.BoardPosValue): player the bot plays; EMPTY for none
+        """
+        self.game = game
+        self.bot = bot
+        self.lock = asyncio.Lock()  # held while the game is changed
+
+
+class Game_server:
+    """Hosts games for clients that connect over TCP
+
+    Games are kept in memory, one Game_session per game. Moves of the
+    clients are played on the event loop, which takes microseconds; the
+    bot searches in a pool of worker processes, so the event loop keeps
+    serving the other games while a bot thinks.
+    """
+
+    def __init__(self, time_limit: float = 1.0, playouts: int = None,
+                 workers: int = None, book_file: str = None,
+                 max_games: int = 10000) -> None:
+        """Initializes the server
+
+        Args:
+            time_limit (float): search time per bot move in seconds
+            playouts (int): playout budget per bot move
+            workers (int): number of bot processes; None for all cores
+            book_file (str): opening book file for the bot
+            max_games (int): maximum number of games hosted at once
+
+        Raises:
+            ValueError: if neither time_limit nor playouts is given
+        """
+        if time_limit is None and playouts is None:
+            raise ValueError('Give a time_limit and/or a playouts budget.')
+
+        self.logger = logging.getLogger(ct.LOGGER)
+        self.logger.info(f'Started logger for {self.__class__.__name__}')
+        self.max_games = max_games
+        self.sessions = {}
+        self._game_ids = itertools.count(1)
+        self._executor = concurrent.futures.ProcessPoolExecutor(
+            workers or os.cpu_count() or 1, initializer=_init_worker,
+            initargs=(time_limit, playouts, book_file))
+        self._operations = {
+            'new': self._new_game,
+            'move': self._move,
+            'state': self._state,
+            'close': self._close_game,
+        }
+
+    async def start(self, host: str = DEFAULT_HOST,
+                    port: int = DEFAULT_PORT) -> asyncio.AbstractServer:
+        """Starts listening for clients
+
+        Args:
+            host (str): address to listen on
+            port (int): port to listen on; 0 for any free port
+
+        Returns:
+            asyncio.AbstractServer: the listening server
+        """
+        server = await asyncio.start_server(self.handle_connection, host,
+                                            port)
+        self.logger.info(f'Listening on {server.sockets[0].getsockname()}')
+        return server
+
+    def close(self) -> None:
+        """Stops the bot processes
+        """
+        self._executor.shutdown(cancel_futures=True)
+
+    async def handle_connection(self, reader: asyncio.StreamReader,
+                                writer: asyncio.StreamWriter) -> None:
+        """Serves the requests of one client until it disconnects
+
+        Args:
+            reader (asyncio.StreamReader): stream of the client's requests
+            writer (asyncio.StreamWriter): stream for the responses
+        """
+        peer = writer.get_extra_info('peername')
+        self.logger.info(f'Client {peer} connected')
+        write_lock = asyncio.Lock()
+        tasks = set()
+        games = set()  # ids of the games started by this client
+
+        async def respond(line: bytes) -> None:
+            response = await self.handle_request(line, games)
+            async with write_lock:
+                writer.write(json.dumps(response).encode() + b'\n')
+                try:
+                    await writer.drain()
+                except ConnectionError:
+                    pass  # the client is gone; the reader loop ends
+
+        try:
+            while line := await reader.readline():
+                task = asyncio.create_task(respond(line))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.wait(tasks)
+        except (ConnectionError, ValueError) as error:  # incl. long lines
+            self.logger.info(f'Client {peer}: {error}')
+        except asyncio.CancelledError:
+            # The server shuts down; end the connection without a traceback
+            self.logger.info(f'Client {peer}: server shut down')
+        finally:
+            for task in list(tasks):
+                task.cancel()
+            writer.close()
+            for game_id in games:
+                self.sessions.pop(game_id, None)
+        self.logger.info(f'Client {peer} disconnected; ended {len(games)} '
+                         f'games')
+
+    async def handle_request(self, line: bytes, games: set) -> dict:
+        """Handles one request
+
+        Args:
+            line (bytes): the request, a JSON object
+            games (set): ids of the games started on the connection; new
+                         and close update it
+
+        Returns:
+            dict: the response
+        """
+        request_id = None
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError('A request must be a JSON object')
+            request_id = request.get('id')
+            operation = self._operations.get(request.get('op'))
+            if operation is None:
+                raise ValueError(f"Unknown op {request.get('op')!r}; use one "
+                                 f"of {', '.join(self._operations)}")
+            response = await operation(request, games)
+        except ValueError as error:  # includes JSON errors
+            response = {'ok': False, 'error': str(error)}
+        except Exception:
+            self.logger.exception(f'Request {line!r} failed')
+            response = {'ok': False, 'error': 'Internal server error'}
+        return {'id': request_id, **response}
+
+    def _session(self, request: dict, games: set) -> Game_session:
+        """Gives the session of the game of a request
+
+        Args:
+            request (dict): the request
+            games (set): ids of the games of the requesting connection
+
+        Raises:
+            ValueError: if the request has no game, an unknown one or one
+                        of another connection
+        """
+        game_id = request.get('game')
+        session = (self.sessions.get(game_id)
+                   if isinstance(game_id, int) and game_id in games
+                   else None)
+        if session is None:
+            raise ValueError(f"Unknown game {request.get('game')!r}")
+        return session
+
+    @staticmethod
+    def state(game_id: int, session: Game_session) -> dict:
+        """Gives the state of a game as sent to the clients
+
+        Args:
+            game_id (int): id of the game
+            session (Game_session): the game's session
+
+        Returns:
+            dict: ok, game id, player names, moves, player to move, winner,
+                  the position of every ct.POSITIONS and the owner of every
+                  ct.CELLS ('.' for none, '1' or '2' for the players)
+        """
+        game = session.game
+        board = game._board
+        owners = {cell: owner for owner, cells in game.cells_conquered.items()
+                  for cell in cells}
+        return {
+            'ok': True,
+            'game': game_id,
+            'names': [game.player_names[ct.BoardPosValue.PLAYER1],
+                      game.player_names[ct.BoardPosValue.PLAYER2]],
+            'moves': list(game.moves),
+            'to_move': game.current_player.name,
+            'winner': game.winner.name,
+            'board': ''.join(POSITION_CHARS[board[pos]]
+                             for pos in ct.POSITIONS),
+            'cells': ''.join(POSITION_CHARS[owners[cell]]
+                             for cell in ct.CELLS),
+        }
+
+    async def _bot_reply(self, session: Game_session) -> str:
+        """Lets the bot play a move if it is its turn; the session's lock
+        must be held
+
+        Returns:
+            str: the bot's move; None if it isn't the bot's turn
+        """
+        game = session.game
+        if (game.current_player is not session.bot or game.game_won() or
+                not game.free_positions_view()):
+            return None
+        loop = asyncio.get_running_loop()
+        move = await loop.run_in_executor(self._executor, _bot_move,
+                                          moves_to_bytes(game.moves))
+        game.play_move(move)
+        return move
+
+    async def _new_game(self, request: dict, games: set) -> dict:
+        if len(self.sessions) >= self.max_games:
+            raise ValueError(f'The server hosts the maximum of '
+                             f'{self.max_games} games')
+        bot = request.get('bot') or ct.BoardPosValue.EMPTY.name
+        if bot not in ct.BoardPosValue.__members__:
+            raise ValueError(f'Unknown bot player {bot!r}')
+
+        game = Conhex_bitboard()
+        if request.get('record'):
+            player_names, moves = parse_littlegolem(request['record'])
+            game.set_player_names(*player_names)
+            for move in moves:
+                game.play_move(move)
+        names = request.get('names')
+        if names:
+            if (not isinstance(names, list) or len(names) != 2 or
+                    not all(isinstance(name, str) for name in names)):
+                raise ValueError('names must be a list of two names')
+            game.set_player_names(*names)
+
+        game_id = next(self._game_ids)
+        session = Game_session(game, ct.BoardPosValue[bot])
+        self.sessions[game_id] = session
+        games.add(game_id)
+        self.logger.debug(f'New game {game_id}, bot plays {bot}')
+        async with session.lock:
+            bot_move = await self._bot_reply(session)
+            return {**self.state(game_id, session), 'bot_move': bot_move}
+
+    async def _move(self, request: dict, games: set) -> dict:
+        session = self._session(request, games)
+        async with session.lock:
+            game = session.game
+            if game.game_won():
+                raise ValueError('The game is already won')
+            if game.current_player is session.bot:
+                raise ValueError("It is the bot's turn")
+            move = request.get('move')
+            if not isinstance(move, str):
+                raise ValueError(f'{move!r} is not a valid position.')
+            game.play_move(move)
+            bot_move = await self._bot_reply(session)
+            return {**self.state(request.get('game'), session),
+                    'bot_move': bot_move}
+
+    async def _state(self, request: dict, games: set) -> dict:
+        session = self._session(request, games)
+        return self.state(request.get('game'), session)
+
+    async def _close_game(self, request: dict, games: set) -> dict:
+        session = self._session(request, games)
+        game_id = request.get('game')
+        del self.sessions[game_id]
+        games.discard(game_id)
+        return self.state(game_id, session)
+
+
+async def serve(server: Game_server, host: str, port: int) -> None:
+    """Runs a game server until it is cancelled
+
+    Args:
+        server (Game_server): the server
+        host (str): address to listen on
+        port (int): port to listen on
+    """
+    listener = await server.start(host, port)
+    async with listener:
+        await listener.serve_forever()
+
+
+def main():
+    """Hosts ConHex games, with or without bot, for clients on TCP
+    """
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('--host', default=DEFAULT_HOST,
+                        help='address to listen on')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT,
+                        help='port to listen on')
+    parser.add_argument('--time', type=float, default=1.0,
+                        help='search time per bot move in seconds')
+    parser.add_argument('--playouts', type=int, default=None,
+                        help='playout budget per bot move')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='number of bot processes (default: all cores)')
+    parser.add_argument('--book', help='opening book file for the bot')
+    parser.add_argument('--max-games', type=int, default=10000,
+                        help='maximum number of games hosted at once')
+    args = parser.parse_args()
+    ct.configure_logging()
+
+    server = Game_server(args.time, args.playouts, args.workers, args.book,
+                         args.max_games)
+    try:
+        asyncio.run(serve(server, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+
+
+if __name__ == "__main__":
+    main()
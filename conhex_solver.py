@@ -0,0 +1,263 @@
+import argparse
+import constants as ct
+import logging
+import time
+import typing
+from conhex_bitboard import (CELL_BITS, POSITION_BITS, POSITION_CELL_IDX,
+                             Conhex_bitboard)
+from conhex_board import Conhex_game
+from conhex_hash import Transposition_table
+
+
+INFINITY = 1 << 40  # proof or disproof number of a solved position
+
+# Mask of the cells of each position; a position whose cells are all
+# conquered can't change the game anymore
+POSITION_CELLS_MASK = {pos: sum(1 << idx for idx in cell_idxs)
+                       for pos, cell_idxs in POSITION_CELL_IDX.items()}
+ALL_CELLS = sum(CELL_BITS.values())
+
+
+class Solver_result(typing.NamedTuple):
+    """Result of a proof-number search. move is None if the player to move
+    doesn't win or if the position wasn't solved."""
+    winner: ct.BoardPosValue    # EMPTY if the position wasn't solved
+    move: str                   # winning move of the player to move
+    proof_size: int             # number of positions in the proof tree
+    nodes: int                  # number of positions searched
+    seconds: float              # search time
+
+
+class Proof_number_solver:
+    """Exact solver for ConHex positions, using depth-first proof-number
+    search (df-pn) with a transposition table
+
+    The search proves whether the player to move wins. Both players'
+    proof and disproof numbers are stored from the point of view of the
+    player to move (phi: proof, delta: disproof), so a move's child has
+    phi and delta swapped. A full board always has a winner, so a position
+    that is not a win for one player is a win for the other.
+
+    Moves to positions whose cells are all conquered are never searched:
+    they can't conquer a cell and an extra stone can't hurt, so another
+    move is always at least as good.
+    """
+
+    def __init__(self, table_size: int = 1 << 20) -> None:
+        """Initializes the solver
+
+        Args:
+            table_size (int): number of slots of the transposition table
+        """
+        self.logger = logging.getLogger(ct.LOGGER)
+        self.table = Transposition_table(table_size)
+        self.nodes = 0
+        self._max_nodes = None
+        self._deadline = None
+        self._stopped = False
+
+    def solve(self, game: Conhex_game, max_nodes: int = None,
+              time_limit: float = None) -> Solver_result:
+        """Solves the position of game within a node and/or time budget
+
+        Args:
+            game (Conhex_game): position to solve; it is not changed
+            max_nodes (int): maximum number of positions to search;
+                             None for no limit
+            time_limit (float): maximum search time in seconds;
+                                None for no limit
+
+        Returns:
+            Solver_result: the result; winner is EMPTY if the budget ran
+                           out before the position was solved
+        """
+        board = Conhex_bitboard()
+        for move in game.moves:
+            board.play_move(move)
+
+        start = time.perf_counter()
+        self.nodes = 0
+        self._max_nodes = max_nodes
+        self._deadline = None if time_limit is None else start + time_limit
+        self._stopped = False
+        self.table.new_search()
+
+        phi, delta, proof_size = self._search(board, INFINITY, INFINITY)
+        mover = board.current_player
+        opponent = (ct.BoardPosValue.PLAYER2
+                    if mover is ct.BoardPosValue.PLAYER1
+                    else ct.BoardPosValue.PLAYER1)
+        if board.game_won():
+            winner, move = board.winner, None
+        elif phi == 0:
+            winner, move = mover, self._winning_move(board)
+        elif delta == 0:
+            winner, move = opponent, None
+        else:
+            winner, move, proof_size = ct.BoardPosValue.EMPTY, None, 0
+
+        result = Solver_result(winner, move, proof_size, self.nodes,
+                               time.perf_counter() - start)
+        self.logger.info(f'Solver result: {result}')
+        return result
+
+    def _winning_move(self, board: Conhex_bitboard) -> str:
+        """Gives the move to a child that is a loss for its player to move
+
+        Args:
+            board (Conhex_bitboard): position proven to be a win
+
+        Returns:
+            str: the winning move
+        """
+        for move in self._moves(board):
+            board.play_move(move)
+            entry = self.table.lookup(board.hash)
+            won = board.game_won()
+            board.undo_move()
+            if won or (entry is not None and entry[1] == 0):
+                return move
+        return None
+
+    @staticmethod
+    def _moves(board: Conhex_bitboard) -> list:
+        """Gives the free positions that can still conquer a cell
+
+        Args:
+            board (Conhex_bitboard): position
+
+        Returns:
+            list: the moves to search
+        """
+        taken = (board._positions[ct.BoardPosValue.PLAYER1] |
+                 board._positions[ct.BoardPosValue.PLAYER2])
+        open_cells = ALL_CELLS & ~(board._cells[ct.BoardPosValue.PLAYER1] |
+                                   board._cells[ct.BoardPosValue.PLAYER2])
+        return [pos for pos, bit in POSITION_BITS.items()
+                if not bit & taken and POSITION_CELLS_MASK[pos] & open_cells]
+
+    def _out_of_budget(self) -> bool:
+        """Checks (and remembers) if the node or time budget is used up.
+        A node costs far more than reading the clock, so the clock is read
+        at every check."""
+        if not self._stopped:
+            self._stopped = (
+                (self._max_nodes is not None and
+                 self.nodes >= self._max_nodes) or
+                (self._deadline is not None and
+                 time.perf_counter() >= self._deadline))
+        return self._stopped
+
+    def _search(self, board: Conhex_bitboard, phi_threshold: int,
+                delta_threshold: int) -> tuple:
+        """Searches the position of board until its proof or disproof
+        number reaches its threshold (multiple iterative deepening, MID)
+
+        Args:
+            board (Conhex_bitboard): position to search; it is restored
+            phi_threshold (int): threshold of the proof number
+            delta_threshold (int): threshold of the disproof number
+
+        Returns:
+            tuple: proof number, disproof number and proof size (the number
+                   of positions in the proof tree if solved)
+        """
+        self.nodes += 1
+        nodes = self.nodes
+
+        # The previous move won: the player to move has lost
+        if board.game_won():
+            return INFINITY, 0, 1
+
+        # Children as (move, hash); a winning move proves the position
+        children = []
+        for move in self._moves(board):
+            board.play_move(move)
+            won = board.game_won()
+            children.append((move, board.hash))
+            board.undo_move()
+            if won:
+                self.table.store(board.hash, (0, INFINITY, 2), INFINITY)
+                return 0, INFINITY, 2
+
+        if not children:
+            return INFINITY, 0, 1  # can't happen: a full board is won
+
+        while True:
+            # phi is the smallest delta of the children and delta the sum
+            # of their phis; find the child with the smallest delta and the
+            # second smallest delta
+            phi = second = INFINITY
+            delta = 0
+            best = None
+            sizes = []
+            for move, key in children:
+                entry = self.table.lookup(key)
+                child_phi, child_delta, size = entry or (1, 1, 0)
+                delta = min(delta + child_phi, INFINITY)
+                sizes.append(size)
+                if child_delta < phi:
+                    second = phi
+                    phi = child_delta
+                    best = (move, key, child_phi, size)
+                elif child_delta < second:
+                    second = child_delta
+
+            # A win needs the proof of one losing child, a loss the proofs
+            # of all children
+            solved = phi == 0 or delta == 0
+            proof_size = (1 + best[3] if phi == 0 else
+                          1 + sum(sizes) if delta == 0 else 0)
+            if (solved or phi >= phi_threshold or
+                    delta >= delta_threshold or self._out_of_budget()):
+                self.table.store(board.hash, (phi, delta, proof_size),
+                                 INFINITY if solved else self.nodes - nodes)
+                return phi, delta, proof_size
+
+            # The child's thresholds are those of the parent, swapped
+            move, _, child_phi, _ = best
+            board.play_move(move)
+            self._search(board,
+                         min(delta_threshold + child_phi - delta, INFINITY),
+                         min(phi_threshold, second + 1))
+            board.undo_move()
+
+
+def main():
+    """Solves the last positions of a game, from the end backwards, until
+    a position can't be solved within the budget
+    """
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('file', nargs='?',
+                        help='LittleGolem game record (default: a random '
+                             'game)')
+    parser.add_argument('--nodes', type=int, default=100000,
+                        help='node budget per position')
+    parser.add_argument('--time', type=float, default=None,
+                        help='time budget per position in seconds')
+    args = parser.parse_args()
+    ct.configure_logging()
+
+    game = Conhex_bitboard()
+    if args.file:
+        game.load(args.file)
+    else:
+        while not game.game_won():
+            game.play_move(game.random_free_position())
+
+    solver = Proof_number_solver()
+    while game.moves:
+        game.undo_move()
+        result = solver.solve(game, args.nodes, args.time)
+        if result.winner is ct.BoardPosValue.EMPTY:
+            print(f'Move {len(game.moves) + 1}: not solved in '
+                  f'{result.nodes} nodes')
+            break
+        print(f'Move {len(game.moves) + 1}: {str(result.winner)} wins'
+              f'{f" with {result.move}" if result.move else ""}; proof of '
+              f'{result.proof_size} positions, {result.nodes} nodes in '
+              f'{result.seconds:.2f} s')
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+import constants as ct
+import numpy as np
+import struct
+import typing
+from conhex_board import bytes_to_moves, moves_to_bytes
+
+
+#
+# Game store: a compact, columnar binary file of finished or unfinished
+# games. The file starts with STORE_MAGIC, followed by blocks of up to
+# block_size games. Each block is BLOCK_HEADER (marker, number of games,
+# payload size) followed by a payload of columns:
+#   winner codes          n x uint8
+#   number of moves       n x uint8
+#   name lengths          2n x uint16 (PLAYER1, PLAYER2 of each game)
+#   names                 UTF-8, concatenated
+#   moves                 one byte per move (index in ct.POSITIONS)
+# All integers are little endian. Blocks are encoded and decoded with
+# NumPy, a whole block at a time.
+#
+STORE_MAGIC = b'CONHEX\x00\x01'
+BLOCK_HEADER = struct.Struct('<4sII')
+BLOCK_MARKER = b'BLK0'
+
+NO_MOVE = -1  # padding of the moves matrix of a Game_block
+
+
+class Game_block(typing.NamedTuple):
+    """Decoded block of games as arrays"""
+    player_names: list      # (name of PLAYER1, name of PLAYER2) per game
+    winners: np.ndarray     # (games, ) uint8 codes of ct.WINNER_CODES
+    lengths: np.ndarray     # (games, ) number of moves
+    moves: np.ndarray       # (games, longest game) int16, NO_MOVE padded
+
+
+def encode_games(player_names: list, winners: np.ndarray,
+                 moves: np.ndarray, lengths: np.ndarray = None) -> bytes:
+    """Encodes games as one block of the game store
+
+    Args:
+        player_names (list): (name of PLAYER1, name of PLAYER2) per game
+        winners (np.ndarray): (games, ) codes of ct.WINNER_CODES
+        moves (np.ndarray): (games, moves) position indices, padded with
+                            NO_MOVE after the end of each game
+        lengths (np.ndarray): (games, ) number of moves; None to count the
+                              moves that aren't NO_MOVE
+
+    Returns:
+        bytes: the block, including its header
+    """
+    moves = np.asarray(moves)
+    if lengths is None:
+        lengths = (moves != NO_MOVE).sum(axis=1)
+    played = np.arange(moves.shape[1]) < np.asarray(lengths)[:, None]
+    names = [name.encode('utf-8') for names in player_names
+             for name in names]
+    payload = b''.join([
+        np.asarray(winners, dtype=np.uint8).tobytes(),
+        np.asarray(lengths, dtype=np.uint8).tobytes(),
+        np.fromiter(map(len, names), dtype='<u2', count=len(names)).tobytes(),
+        b''.join(names),
+        moves[played].astype(np.uint8).tobytes(),
+    ])
+    return (BLOCK_HEADER.pack(BLOCK_MARKER, len(player_names), len(payload))
+            + payload)
+
+
+def decode_games(count: int, payload: bytes) -> Game_block:
+    """Decodes the payload of a block of the game store into arrays
+
+    Args:
+        count (int): number of games in the block
+        payload (bytes): payload of the block
+
+    Returns:
+        Game_block: the games of the block
+    """
+    data = np.frombuffer(payload, dtype=np.uint8)
+    winners = data[:count]
+    lengths = data[count:2 * count].astype(np.int64)
+    name_lengths = np.frombuffer(payload, dtype='<u2', count=2 * count,
+                                 offset=2 * count)
+
+    # Player names need Python strings; slice them at the cumulative offsets
+    name_ends = 6 * count + np.cumsum(name_lengths)
+    name_starts = name_ends - name_lengths
+    names = [payload[start:end].decode('utf-8')
+             for start, end in zip(name_starts.tolist(), name_ends.tolist())]
+
+    moves_start = int(name_ends[-1]) if count else 0
+    moves = np.full((count, int(lengths.max()) if count else 0), NO_MOVE,
+                    dtype=np.int16)
+    moves[np.arange(moves.shape[1]) < lengths[:, None]] = \
+        data[moves_start:moves_start + int(lengths.sum())]
+    return Game_block(list(zip(names[::2], names[1::2])), winners, lengths,
+                      moves)
+
+
+def encode_block(games: list) -> bytes:
+    """Encodes games as one block of the game store
+
+    Args:
+        games (list): tuples of player names (2 str), winner
+                      (ct.BoardPosValue) and moves (bytes, as given by
+                      moves_to_bytes)
+
+    Returns:
+        bytes: the block, including its header
+    """
+    longest = max((len(moves) for _, _, moves in games), default=0)
+    matrix = np.full((len(games), longest), NO_MOVE, dtype=np.int16)
+    lengths = np.array([len(moves) for _, _, moves in games], dtype=np.int64)
+    matrix[np.arange(longest) < lengths[:, None]] = np.frombuffer(
+        b''.join(moves for _, _, moves in games), dtype=np.uint8)
+    return encode_games([names for names, _, _ in games],
+                        [ct.WINNER_CODES[winner] for _, winner, _ in games],
+                        matrix, lengths)
+
+
+def decode_block(count: int, payload: bytes) -> list:
+    """Decodes the payload of a block of the game store
+
+    Args:
+        count (int): number of games in the block
+        payload (bytes): payload of the block
+
+    Returns:
+        list: tuples of player names, winner and moves (bytes)
+    """
+    block = decode_games(count, payload)
+    return [(names, ct.WINNERS[winner],
+             row[:length].astype(np.uint8).tobytes())
+            for names, winner, length, row in zip(
+                block.player_names, block.winners.tolist(),
+                block.lengths.tolist(), block.moves)]
+
+
+class Game_store_writer:
+    """Writes games to a game store, one block at a time
+
+    Games are buffered until a block is full, so memory use is bounded by
+    the block size. Use as a context manager or call close().
+    """
+
+    def __init__(self, filename: str, block_size: int = 4096) -> None:
+        """Creates (or overwrites) a game store
+
+        Args:
+            filename (str): name of the game store file
+            block_size (int): number of games per block
+        """
+        self.block_size = block_size
+        self.count = 0
+        self._games = []
+        self._file = open(filename, 'wb')
+        self._file.write(STORE_MAGIC)
+
+    def add(self, player_names: tuple, winner: ct.BoardPosValue,
+            moves: list) -> None:
+        """Adds a game to the store
+
+        Args:
+            player_names (tuple): names of PLAYER1 and PLAYER2
+            winner (ct.BoardPosValue): winner of the game; EMPTY if none
+            moves (list): moves of the game, as list or moves_to_bytes bytes
+        """
+        if not isinstance(moves, bytes):
+            moves = moves_to_bytes(moves)
+        self._games.append((tuple(player_names), winner, moves))
+        self.count += 1
+        if len(self._games) >= self.block_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Writes the buffered games as a block
+        """
+        if self._games:
+            self._file.write(encode_block(self._games))
+            self._games = []
+        self._file.flush()
+
+    def close(self) -> None:
+        """Writes the buffered games and closes the file
+        """
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self) -> 'Game_store_writer':
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+
+def read_blocks(filename: str) -> tuple:
+    """Reads the blocks of a game store, one at a time
+
+    Args:
+        filename (str): name of the game store file
+
+    Yields:
+        tuple: number of games and payload of each block
+
+    Raises:
+        ValueError: if the file is not a (complete) game store
+    """
+    with open(filename, 'rb') as file:
+        if file.read(len(STORE_MAGIC)) != STORE_MAGIC:
+            raise ValueError(f'{filename} is not a game store')
+
+        while True:
+            header = file.read(BLOCK_HEADER.size)
+            if not header:
+                return
+
+            marker, count, size = (BLOCK_HEADER.unpack(header)
+                                   if len(header) == BLOCK_HEADER.size
+                                   else (None, 0, 0))
+            payload = file.read(size)
+            if marker != BLOCK_MARKER or len(payload) != size:
+                raise ValueError(f'{filename} has a corrupt block')
+            yield count, payload
+
+
+def read_game_blocks(filename: str) -> Game_block:
+    """Reads the blocks of a game store as arrays, one block at a time
+
+    Args:
+        filename (str): name of the game store file
+
+    Yields:
+        Game_block: the games of each block
+    """
+    for count, payload in read_blocks(filename):
+        yield decode_games(count, payload)
+
+
+def read_game_store(filename: str) -> tuple:
+    """Reads the games of a game store, one at a time
+
+    Args:
+        filename (str): name of the game store file
+
+    Yields:
+        tuple: player names (2 str), winner (ct.BoardPosValue) and list of
+               moves of each game
+    """
+    for count, payload in read_blocks(filename):
+        for player_names, winner, moves in decode_block(count, payload):
+            yield player_names, winner, bytes_to_moves(moves)
@@ -0,0 +1,123 @@
+import constants as ct
+import conhex_geometry
+from conhex_board import Conhex_game
+
+
+#
+# The board symmetries and their coordinate maps are defined in constants
+# (ct.COORDINATE_MAPS); their position and cell permutations are generated
+# into conhex_geometry.
+#
+OTHER_PLAYER = {
+    ct.BoardPosValue.PLAYER1: ct.BoardPosValue.PLAYER2,
+    ct.BoardPosValue.PLAYER2: ct.BoardPosValue.PLAYER1,
+    ct.BoardPosValue.EMPTY: ct.BoardPosValue.EMPTY,
+}
+
+
+class Symmetry:
+    """A symmetry of the board: a permutation of the positions and cells,
+    possibly combined with a swap of the players' colours
+    """
+
+    def __init__(self, name: str, swaps_colours: bool) -> None:
+        """Initializes a symmetry from the position and cell permutations
+        of its coordinate map, which generate_geometry.py derives from
+        ct.COORDINATE_MAPS into conhex_geometry
+
+        Args:
+            name (str): name of the symmetry; a key of ct.COORDINATE_MAPS
+            swaps_colours (bool): True if the map swaps the players' goals
+        """
+        self.name = name
+        self.swaps_colours = swaps_colours
+        self.positions = conhex_geometry.SYMMETRY_POSITIONS[name]
+        self.cells = conhex_geometry.SYMMETRY_CELLS[name]
+        self.inverse_positions = {new: pos
+                                  for pos, new in self.positions.items()}
+
+        # Bit of the image of every position and cell, for canonical keys
+        self._position_bits = {pos: 1 << ct.POSITION_INDEX[new]
+                               for pos, new in self.positions.items()}
+        cell_index = {cell: idx for idx, cell in enumerate(ct.CELLS)}
+        self._cell_bits = {cell: 1 << cell_index[new]
+                           for cell, new in self.cells.items()}
+
+    def player(self, player: ct.BoardPosValue) -> ct.BoardPosValue:
+        """Gives the image of a player (or EMPTY) under this symmetry"""
+        return OTHER_PLAYER[player] if self.swaps_colours else player
+
+    def key(self, board: dict, cells_conquered: dict,
+            current_player: ct.BoardPosValue) -> int:
+        """Gives the key of the image of a game state under this symmetry
+
+        Args:
+            board (dict): position -> BoardPosValue
+            cells_conquered (dict): owner -> set of cells
+            current_player (ct.BoardPosValue): player to move
+
+        Returns:
+            int: key packing the side to move, the positions of both players
+                 and the cells of both players of the transformed state
+        """
+        positions = {ct.BoardPosValue.PLAYER1: 0,
+                     ct.BoardPosValue.PLAYER2: 0,
+                     ct.BoardPosValue.EMPTY: 0}
+        for pos, owner in board.items():
+            positions[owner] |= self._position_bits[pos]
+        cells = {player: sum(self._cell_bits[cell]
+                             for cell in cells_conquered[player])
+                 for player in (ct.BoardPosValue.PLAYER1,
+                                ct.BoardPosValue.PLAYER2)}
+
+        player1 = self.player(ct.BoardPosValue.PLAYER1)
+        player2 = self.player(ct.BoardPosValue.PLAYER2)
+        key = cells[player2]
+        key = (key << len(ct.CELLS)) | cells[player1]
+        key = (key << len(ct.POSITIONS)) | positions[player2]
+        key = (key << len(ct.POSITIONS)) | positions[player1]
+        return (key << 1) | (self.player(current_player)
+                             is ct.BoardPosValue.PLAYER2)
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({self.name!r})'
+
+
+SYMMETRIES = [Symmetry(name, swaps_colours)
+              for name, (_, swaps_colours) in ct.COORDINATE_MAPS.items()]
+
+
+def canonical_form(game: Conhex_game) -> tuple:
+    """Gives the canonical key of a game state and the symmetry that maps
+    the state to its canonical representative
+
+    All states that are equal up to a symmetry of the board (with a colour
+    swap for symmetries that swap the players' goals) have the same key.
+    Moves of the game map to moves of the representative with
+    symmetry.positions and back with symmetry.inverse_positions.
+
+    Args:
+        game (Conhex_game): game to give the key of
+
+    Returns:
+        tuple: the canonical key (int) and the Symmetry used
+    """
+    # Empty positions add nothing to a key; leave them out once
+    board = {pos: owner for pos, owner in game._board.items()
+             if owner is not ct.BoardPosValue.EMPTY}
+    cells_conquered = game.cells_conquered
+    return min(((symmetry.key(board, cells_conquered, game.current_player),
+                 symmetry) for symmetry in SYMMETRIES),
+               key=lambda key_symmetry: key_symmetry[0])
+
+
+def canonical_key(game: Conhex_game) -> int:
+    """Gives the canonical key of a game state (see canonical_form)
+
+    Args:
+        game (Conhex_game): game to give the key of
+
+    Returns:
+        int: the canonical key
+    """
+    return canonical_form(game)[0]
@@ -1,5 +1,8 @@
 import enum
 import logging
+from conhex_geometry import (BOARD_ASCII_SEGMENTS, BORDER_CELLS,  # noqa
+                             CELL_NEIGHBOURS, CELL_QUOTAS, POSITION_CELLS,
+                             POSITION_INDEX, POSITION_XY, POSITIONS)
 
 #
 # User adjustable configuration settings
@@ -13,7 +16,16 @@ LOG_LEVEL = logging.ERROR
 LOGGER = 'conhex'
 LOG_FORMAT = ('[%(levelname)s] [%(asctime)s] [%(filename)s:(%(lineno)d] '
               '%(message)s')
-logging.basicConfig(format=LOG_FORMAT, level=LOG_LEVEL)
+
+
+def configure_logging(level: int = LOG_LEVEL) -> None:
+    """Configures the root logger. Only call this from a program's main();
+    importing the library doesn't configure logging.
+
+    Args:
+        level (int): log level of the root logger
+    """
+    logging.basicConfig(format=LOG_FORMAT, level=level)
 
 
 #
@@ -63,13 +75,45 @@ CELLS = {
     (9, 9): ['I10', 'J9', 'K11']
 }
 
-POSITIONS = sorted({position for cell in CELLS.values() for position in cell},
-                   key=lambda p: (int(p[1:]), p[0]))
+# Tables derived from CELLS are generated into conhex_geometry.py by
+# generate_geometry.py and imported above:
+#   POSITIONS        all positions, sorted by row and column
+#   POSITION_INDEX   index of each position in POSITIONS; used to encode a
+#                    move in one byte
+#   POSITION_CELLS   the cells each position is part of (at most 3)
+#   CELL_NEIGHBOURS  cells that are adjacent, i.e. share at least one
+#                    position
+#   CELL_QUOTAS      number of positions needed to conquer each cell
+#   BORDER_CELLS     per cell dimension, the cells at the low and the high
+#                    border (see CELL_LOW_DIM, CELL_HIGH_DIM)
+# Run generate_geometry.py after changing CELLS.
 
 CELL_LOW_DIM = 2   # Row/column 1 *and* 2 lie at the border
 CELL_HIGH_DIM = 8  # Row/column 8 *and* 9 lie at the border
 
 
+#
+# Board symmetries. The board has the symmetries of a square: 4 rotations,
+# each with or without a reflection. Maps that swap rows and columns also
+# swap the goals of the players (PLAYER1 connects along cell dimension 1,
+# PLAYER2 along cell dimension 0), so they are combined with a colour swap.
+#
+BOARD_SIZE = 12  # columns A-K and rows 1-11 lie at coordinates 1..11
+
+COORDINATE_MAPS = {
+    'identity': (lambda col, row: (col, row), False),
+    'flip_columns': (lambda col, row: (BOARD_SIZE - col, row), False),
+    'flip_rows': (lambda col, row: (col, BOARD_SIZE - row), False),
+    'rotate_180': (lambda col, row: (BOARD_SIZE - col, BOARD_SIZE - row),
+                   False),
+    'transpose': (lambda col, row: (row, col), True),
+    'anti_transpose': (lambda col, row: (BOARD_SIZE - row, BOARD_SIZE - col),
+                       True),
+    'rotate_90': (lambda col, row: (BOARD_SIZE - row, col), True),
+    'rotate_270': (lambda col, row: (row, BOARD_SIZE - col), True),
+}
+
+
 #
 # Players, default player names and possible values of the board positions
 #
@@ -85,6 +129,20 @@ class BoardPosValue(enum.Enum):
     PLAYER2 = enum.auto()
 
 
+# Cell dimension along which each player has to connect the borders
+CELL_DIMS = {
+    BoardPosValue.PLAYER1: 1,
+    BoardPosValue.PLAYER2: 0,
+}
+
+# Codes of the winner of a game in game files; EMPTY if there's none
+WINNER_CODES = {
+    BoardPosValue.EMPTY: 0,
+    BoardPosValue.PLAYER1: 1,
+    BoardPosValue.PLAYER2: 2,
+}
+WINNERS = {code: winner for winner, code in WINNER_CODES.items()}
+
 DEFAULT_PLAYER_NAMES = {
     BoardPosValue.PLAYER1: 'Player 1',
     BoardPosValue.PLAYER2: 'Player 2',
@@ -129,7 +187,8 @@ __ASCII_BOARD__ = \
 11 #-----------+-----------+-----------+-----------+-----------#""" \
 # noqa: W605  - ignore escape sequence warming for the ascii board
 
-BOARD_ASCII_SEGMENTS = __ASCII_BOARD__.split('#')
+# BOARD_ASCII_SEGMENTS (the parts of the ASCII board between the positions)
+# is generated into conhex_geometry.py, like the tables derived from CELLS
 
 ASCII_CELL = {
     BoardPosValue.PLAYER1: '-1-',
@@ -235,8 +294,12 @@ BOARDNAME = 'ConHex board'
 
 MENU_EXIT = 'Exit'
 BUTTON_RESET = 'Reset'
+BUTTON_UNDO = 'Undo'
+BUTTON_BOOK = 'Book move'
 BUTTON_SIZE = (8, 1)
 
+BOOK_FILE = 'conhex.book'  # opening book the GUI loads, if it exists
+
 
 def scale_poly(poly: list) -> list:
     return [(x * GRAPH_SCALAR, y * GRAPH_SCALAR)
@@ -244,8 +307,7 @@ def scale_poly(poly: list) -> list:
 
 
 def position_to_xy(position: str) -> tuple:
-    return ((ord(position[0]) - 64) * GRAPH_SCALAR,
-            -int(position[1:]) * GRAPH_SCALAR)
+    return POSITION_XY[position]
 
 
 def xy_to_position(xy: tuple) -> str:
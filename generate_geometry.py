@@ -0,0 +1,172 @@
+import argparse
+import os
+import pprint
+import sys
+import types
+
+
+#
+# Generates conhex_geometry.py: every table that is derived from the board
+# layout in constants.py (CELLS, the ASCII board, the polygons) and from the
+# board symmetries, written out as literals. Importing the generated module
+# is a lot faster than deriving the tables at import time.
+#
+# Run this script after changing the board layout in constants.py; the
+# --check option fails if conhex_geometry.py is out of date.
+#
+GEOMETRY_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             'conhex_geometry.py')
+
+HEADER = '''# flake8: noqa
+#
+# Generated by generate_geometry.py from the board layout in constants.py.
+# Don't edit this file; change constants.py and run generate_geometry.py.
+#
+'''
+
+
+def derive_geometry() -> dict:
+    """Derives the geometry tables from the board layout
+
+    Returns:
+        dict: name -> value of each table, in the order to write them
+
+    Raises:
+        ValueError: if a coordinate map of ct.COORDINATE_MAPS is not a
+                    symmetry of the board
+    """
+    # constants imports the generated tables, which may be missing or out
+    # of date; the derivation only needs the board layout, so import
+    # constants against a stand-in that gives None for every table
+    generated = sys.modules.pop('conhex_geometry', None)
+    stand_in = types.ModuleType('conhex_geometry')
+    stand_in.__getattr__ = lambda name: None
+    sys.modules['conhex_geometry'] = stand_in
+    try:
+        import constants as ct
+    finally:
+        sys.modules.pop('conhex_geometry')
+        if generated is not None:
+            sys.modules['conhex_geometry'] = generated
+
+    cells = ct.CELLS
+    cell_list = list(cells)
+    positions = sorted({position for cell in cells.values()
+                        for position in cell},
+                       key=lambda p: (int(p[1:]), p[0]))
+    position_index = {position: idx for idx, position in enumerate(positions)}
+    cell_bits = {cell: 1 << idx for idx, cell in enumerate(cell_list)}
+    cell_neighbours = {
+        cell: tuple(other for other, other_poss in cells.items()
+                    if other != cell and set(cell_poss) & set(other_poss))
+        for cell, cell_poss in cells.items()}
+
+    # Position and cell permutations of the symmetries
+    cells_by_positions = {frozenset(cell_poss): cell
+                          for cell, cell_poss in cells.items()}
+    symmetry_positions = {}
+    symmetry_cells = {}
+    for name, (coordinate_map, _) in ct.COORDINATE_MAPS.items():
+        images = {}
+        for pos in positions:
+            col, row = coordinate_map(ord(pos[0]) - 64, int(pos[1:]))
+            images[pos] = chr(col + 64) + str(row)
+        try:
+            symmetry_cells[name] = {
+                cell: cells_by_positions[frozenset(images[pos]
+                                                   for pos in cell_poss)]
+                for cell, cell_poss in cells.items()}
+        except KeyError:
+            raise ValueError(f'{name} is not a symmetry of the board')
+        symmetry_positions[name] = images
+
+    return {
+        # Board layout (see constants.py)
+        'POSITIONS': positions,
+        'POSITION_INDEX': position_index,
+        'POSITION_CELLS': {position: tuple(cell for cell, cell_poss
+                                           in cells.items()
+                                           if position in cell_poss)
+                           for position in positions},
+        'CELL_NEIGHBOURS': cell_neighbours,
+        'CELL_QUOTAS': {cell: (len(cell_poss) + 1) // 2
+                        for cell, cell_poss in cells.items()},
+        'BORDER_CELLS': {
+            cell_dim: (tuple(cell for cell in cell_list
+                             if cell[cell_dim] <= ct.CELL_LOW_DIM),
+                       tuple(cell for cell in cell_list
+                             if cell[cell_dim] >= ct.CELL_HIGH_DIM))
+            for cell_dim in sorted(set(ct.CELL_DIMS.values()))},
+        'BOARD_ASCII_SEGMENTS': ct.__ASCII_BOARD__.split('#'),
+
+        # Bit masks (see conhex_bitboard.py); cells are indexed like CELLS
+        'CELL_MASKS': [sum(1 << position_index[pos] for pos in cells[cell])
+                       for cell in cell_list],
+        'CELL_QUOTA': [(len(cells[cell]) + 1) // 2 for cell in cell_list],
+        'POSITION_CELL_IDX': {
+            pos: tuple(idx for idx, cell in enumerate(cell_list)
+                       if pos in cells[cell])
+            for pos in positions},
+        'CELL_NEIGHBOUR_MASKS': [sum(cell_bits[other]
+                                     for other in cell_neighbours[cell])
+                                 for cell in cell_list],
+        'BORDER_CELL_MASKS': {
+            cell_dim: (sum(cell_bits[cell] for cell in cell_list
+                           if cell[cell_dim] <= ct.CELL_LOW_DIM),
+                       sum(cell_bits[cell] for cell in cell_list
+                           if cell[cell_dim] >= ct.CELL_HIGH_DIM))
+            for cell_dim in sorted(set(ct.CELL_DIMS.values()))},
+
+        # Graph coordinates of the GUI (see constants.py)
+        'POSITION_XY': {position: ((ord(position[0]) - 64) * ct.GRAPH_SCALAR,
+                                   -int(position[1:]) * ct.GRAPH_SCALAR)
+                        for position in positions},
+        'SCALED_CELL_POLYS': {cell: ct.scale_poly(poly)
+                              for cell, poly in ct.CELL_POLYS.items()},
+        'SCALED_BORDER_POLYS': {player.name: [ct.scale_poly(poly)
+                                              for poly in polys]
+                                for player, polys in ct.BORDER_POLYS.items()},
+
+        # Symmetries (see conhex_symmetry.py)
+        'SYMMETRY_POSITIONS': symmetry_positions,
+        'SYMMETRY_CELLS': symmetry_cells,
+    }
+
+
+def geometry_source() -> str:
+    """Gives the source code of conhex_geometry.py
+
+    Returns:
+        str: the source code
+    """
+    parts = [HEADER]
+    for name, value in derive_geometry().items():
+        value = pprint.pformat(value, width=78, sort_dicts=False)
+        parts.append(f'{name} = {value}\n')
+    return '\n'.join(parts)
+
+
+def main():
+    """Generates conhex_geometry.py from the board layout
+    """
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('--check', action='store_true',
+                        help="only check that conhex_geometry.py is up to "
+                             "date; don't write it")
+    args = parser.parse_args()
+
+    source = geometry_source()
+    if args.check:
+        with open(GEOMETRY_FILE, 'r') as file:
+            if file.read() != source:
+                sys.exit(f'{GEOMETRY_FILE} is out of date; run '
+                         f'{os.path.basename(__file__)}')
+        return
+
+    with open(GEOMETRY_FILE, 'w') as file:
+        file.write(source)
+    print(f'Wrote {GEOMETRY_FILE}', file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
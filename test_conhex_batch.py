@@ -0,0 +1,16 @@
+import unittest
+from conhex_batch import cross_check
+
+
+class Cross_check_test(unittest.TestCase):
+    """The vectorised playouts of conhex_batch must find the same winners
+    as Conhex_game
+    """
+
+    def test_cross_check(self):
+        for seed in range(3):
+            self.assertEqual(cross_check(200, seed), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
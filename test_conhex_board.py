@@ -0,0 +1,143 @@
+import random
+import unittest
+from conhex_bitboard import Conhex_bitboard
+from conhex_board import Conhex_game, littlegolem_record, parse_littlegolem
+
+
+def replay(engine: type, moves: list) -> Conhex_game:
+    """Plays moves on a new game of an engine
+
+    Args:
+        engine (type): Conhex_game or a subclass
+        moves (list): moves to play
+
+    Returns:
+        Conhex_game: the game
+    """
+    game = engine()
+    for move in moves:
+        game.play_move(move)
+    return game
+
+
+class Play_undo_test(unittest.TestCase):
+    """Random sequences of moves and undos must leave a game in the same
+    state as playing its remaining moves on a new game
+    """
+
+    GAMES = 100
+
+    def assert_same_state(self, game: Conhex_game,
+                          expected: Conhex_game) -> None:
+        self.assertEqual(game.moves, expected.moves)
+        self.assertEqual(game.cells_conquered, expected.cells_conquered)
+        self.assertIs(game.winner, expected.winner)
+        self.assertIs(game.current_player, expected.current_player)
+        self.assertEqual(game.hash, expected.hash)
+        self.assertEqual(set(game.free_positions()),
+                         set(expected.free_positions()))
+        self.assertEqual(len(game.free_positions()),
+                         len(expected.free_positions()))
+        self.assertEqual(set(game.free_positions_view()),
+                         set(expected.free_positions()))
+        self.assertEqual(game.connection_distances(),
+                         expected.connection_distances())
+
+    def check_engine(self, engine: type, seed: int) -> None:
+        rng = random.Random(seed)
+        for _ in range(self.GAMES):
+            game = engine()
+            while game.free_positions_view():
+                if game.moves and rng.random() < 0.3:
+                    for _ in range(rng.randint(1, 3)):
+                        game.undo_move()
+                else:
+                    game.play_move(game.random_free_position(rng))
+                self.assert_same_state(game, replay(engine, game.moves))
+
+    def test_conhex_game(self):
+        self.check_engine(Conhex_game, 1)
+
+    def test_conhex_bitboard(self):
+        self.check_engine(Conhex_bitboard, 2)
+
+    def test_snapshot_restore(self):
+        rng = random.Random(4)
+        for engine in (Conhex_game, Conhex_bitboard):
+            for _ in range(self.GAMES // 10):
+                game = engine()
+                snapshots = []
+                while not game.game_won():
+                    snapshots.append(game.snapshot())
+                    game.play_move(game.random_free_position(rng))
+                for snapshot in rng.sample(snapshots, 5):
+                    game.restore(snapshot)
+                    expected = replay(engine, game.moves)
+                    self.assert_same_state(game, expected)
+                    game.play_move(game.random_free_position(rng))
+                    expected.play_move(game.moves[-1])
+                    self.assert_same_state(game, expected)
+
+    def test_engines_agree(self):
+        rng = random.Random(3)
+        for _ in range(self.GAMES):
+            game = Conhex_bitboard()
+            while not game.game_won():
+                game.play_move(game.random_free_position(rng))
+            self.assert_same_state(game, replay(Conhex_game, game.moves))
+
+
+class Trace_test(unittest.TestCase):
+    """Both engines must trace the same events, and only for legal moves
+    """
+
+    def trace_game(self, engine: type, moves: list) -> list:
+        events = []
+        game = engine()
+        game.trace = lambda event, data: events.append((event, data))
+        for move in moves:
+            game.play_move(move)
+        for move in (moves[0], 'Z99'):
+            with self.assertRaises(ValueError):
+                game.play_move(move)
+        game.undo_move()
+        return events
+
+    def test_engines_agree(self):
+        rng = random.Random(5)
+        for _ in range(20):
+            game = Conhex_bitboard()
+            while not game.game_won():
+                game.play_move(game.random_free_position(rng))
+            events = self.trace_game(Conhex_game, game.moves)
+            self.assertEqual([data['position'] for event, data in events
+                              if event == 'move'], game.moves)
+            self.assertEqual(events[-1], ('undo',
+                                          {'position': game.moves[-1]}))
+            self.assertEqual(events,
+                             self.trace_game(Conhex_bitboard, game.moves))
+
+
+class Record_test(unittest.TestCase):
+    """Player names must survive a LittleGolem record, whatever their
+    characters
+    """
+
+    def test_round_trip(self):
+        names = ['plain', 'a]b', 'back\\slash\\', 'x\\]', 'PB[y]',
+                 'c;B[F6]', '']
+        moves = ['F6', 'A1', 'K11']
+        for name1 in names:
+            for name2 in names:
+                record = littlegolem_record((name1, name2), moves)
+                self.assertEqual(parse_littlegolem(record),
+                                 ([name1, name2], moves))
+
+    def test_cut_off(self):
+        record = littlegolem_record(('a', 'b'), ['F6', 'A1'])
+        with self.assertRaises(ValueError):
+            parse_littlegolem(record[:-4])
+
+
+if __name__ == "__main__":
+    unittest.main()